@@ -0,0 +1,520 @@
+"""Benchmark whole template flows end to end against local stand-ins for external services.
+
+Each LangFlow export (a JSON file with ``data.nodes`` and ``data.edges``) is loaded with
+LangFlow's own loader and run vertex by vertex. Outgoing HTTP to Notion, Slack, Perplexity,
+Composio and the OpenAI / Anthropic APIs is redirected, inside this process, to a local
+stand-in server that answers with canned payloads after a configurable delay. Every other
+host is refused, so a benchmark never reaches a real service or spends credits. The numbers
+cover LangFlow, the components and the HTTP stack, with the services' own latency replaced
+by the ``--latency`` you choose.
+
+Run from the repository root in an environment where LangFlow (and the flow's component
+dependencies) are installed:
+
+    python benchmarks/flow-latency-benchmark.py
+    python benchmarks/flow-latency-benchmark.py \\
+        templates/notion-slack-sprint-summary/artifacts/langflow-structure.json \\
+        --runs 50 --concurrency 8 --latency llm=600 notion=150 slack=80
+    python benchmarks/flow-latency-benchmark.py --json > after.json
+    python benchmarks/flow-latency-benchmark.py --baseline before.json
+"""
+
+import argparse
+import asyncio
+import copy
+import itertools
+import json
+import os
+import resource
+import statistics
+import sys
+import threading
+import time
+import tracemalloc
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import urlsplit, urlunsplit
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+STAND_IN_HEADER = "X-Stand-In-Host"
+
+# Hosts answered by the stand-in server, by the service whose latency they share.
+STAND_IN_HOSTS = {
+    "api.notion.com": "notion",
+    "slack.com": "slack",
+    "api.perplexity.ai": "perplexity",
+    "backend.composio.dev": "composio",
+    "api.openai.com": "llm",
+    "api.anthropic.com": "llm",
+}
+SERVICES = sorted(set(STAND_IN_HOSTS.values()))
+LOCAL_HOSTS = {"127.0.0.1", "localhost", "::1"}
+
+# Template fields that hold credentials or workspace IDs; filled with stand-in values so no
+# global variable or real secret is needed.
+STAND_IN_FIELDS = {
+    "api_key": "stand-in-key",
+    "notion_secret": "secret_stand-in",
+    "user_token": "xoxp-stand-in",
+    "channel": "C0STANDIN01",
+    "database_id": "00000000000000000000000000000000",
+}
+INPUT_NODE_TYPES = {"ChatInput", "TextInput"}
+
+NOTION_QUERY = {"filter": {"property": "Priority", "select": {"equals": "High"}}}
+STATUSES = ("Not started", "In progress", "Done")
+
+
+def notion_page(index: int) -> dict:
+    return {
+        "object": "page",
+        "id": f"00000000-0000-0000-0000-{index:012d}",
+        "last_edited_time": "2025-01-15T10:30:00.000Z",
+        "properties": {
+            "Name": {"id": "title", "type": "title", "title": [{"plain_text": f"Task {index}"}]},
+            "Status": {"id": "st", "type": "status", "status": {"name": STATUSES[index % 3]}},
+            "Priority": {"id": "pr", "type": "select", "select": {"name": "High" if index % 2 else "Medium"}},
+            "Assignee": {"id": "as", "type": "people", "people": [{"name": f"Student {index % 7}"}]},
+            "Due": {"id": "du", "type": "date", "date": {"start": f"2025-02-{index % 28 + 1:02d}"}},
+        },
+    }
+
+
+def summary_text(words: int) -> str:
+    lines = ["## Sprint summary", ""]
+    sentence = "Task progress is on track with two items blocked on review".split()
+    body = list(itertools.islice(itertools.cycle(sentence), words))
+    for start in range(0, len(body), 20):
+        lines.append("- " + " ".join(body[start : start + 20]))
+    return "\n".join(lines)
+
+
+class StandIns:
+    """One local HTTP server answering for every stand-in host, with per-service latency."""
+
+    def __init__(self, latency_ms: dict[str, float], notion_pages: int, llm_words: int):
+        self.latency = {service: latency_ms.get(service, 0.0) / 1000 for service in SERVICES}
+        self.pages = [notion_page(i) for i in range(notion_pages)]
+        self.summary = summary_text(llm_words)
+        self.requests = {service: 0 for service in SERVICES}
+        self._ts = itertools.count(1)
+        self._lock = threading.Lock()
+        stand_ins = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                self._answer()
+
+            def do_POST(self):
+                self._answer()
+
+            def _answer(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                body = self.rfile.read(length) if length else b""
+                host = self.headers.get(STAND_IN_HEADER, "")
+                status, payload = stand_ins.respond(host, self.command, urlsplit(self.path).path, body)
+                data = json.dumps(payload).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.server.daemon_threads = True
+        self.port = self.server.server_address[1]
+        threading.Thread(target=self.server.serve_forever, name="stand-ins", daemon=True).start()
+
+    def respond(self, host: str, method: str, path: str, body: bytes) -> tuple[int, dict]:
+        service = STAND_IN_HOSTS.get(host)
+        if service is None:
+            return 404, {"error": f"no stand-in for {host}"}
+        with self._lock:
+            self.requests[service] += 1
+        time.sleep(self.latency[service])
+        request = json.loads(body) if body.strip().startswith(b"{") else {}
+        return getattr(self, f"_{service}")(host, method, path, request)
+
+    def _notion(self, host, method, path, request):
+        if path.endswith("/query"):
+            return 200, {"object": "list", "results": self.pages, "has_more": False, "next_cursor": None}
+        schema = {name: {"id": prop["id"], "type": prop["type"]} for name, prop in self.pages[0]["properties"].items()}
+        return 200, {"object": "database", "id": path.rsplit("/", 1)[-1], "properties": schema}
+
+    def _slack(self, host, method, path, request):
+        if path.endswith("auth.test"):
+            return 200, {"ok": True, "user": "stand-in", "user_id": "U0STANDIN", "team_id": "T0STANDIN"}
+        if path.endswith("conversations.list"):
+            return 200, {"ok": True, "channels": [{"id": "C0STANDIN01", "name": "general"}], "response_metadata": {}}
+        ts = f"{int(time.time())}.{next(self._ts):06d}"
+        return 200, {"ok": True, "channel": request.get("channel", "C0STANDIN01"), "ts": ts}
+
+    def _llm_text(self, request: dict) -> str:
+        prompt = json.dumps(request.get("messages", [])) + json.dumps(request.get("system", ""))
+        # Flows that ask the model for a JSON query (e.g. the Notion query generator) get one.
+        return json.dumps(NOTION_QUERY) if "JSON" in prompt else self.summary
+
+    def _usage(self, request: dict, text: str) -> tuple[int, int]:
+        return len(json.dumps(request.get("messages", []))) // 4, len(text) // 4
+
+    def _llm(self, host, method, path, request):
+        text = self._llm_text(request)
+        prompt_tokens, completion_tokens = self._usage(request, text)
+        model = request.get("model", "stand-in")
+        if host == "api.anthropic.com":
+            return 200, {
+                "id": "msg_stand_in",
+                "type": "message",
+                "role": "assistant",
+                "model": model,
+                "content": [{"type": "text", "text": text}],
+                "stop_reason": "end_turn",
+                "usage": {"input_tokens": prompt_tokens, "output_tokens": completion_tokens},
+            }
+        return 200, {
+            "id": "chatcmpl-stand-in",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": model,
+            "choices": [{"index": 0, "message": {"role": "assistant", "content": text}, "finish_reason": "stop"}],
+            "usage": {
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens,
+                "total_tokens": prompt_tokens + completion_tokens,
+            },
+        }
+
+    def _perplexity(self, host, method, path, request):
+        status, payload = self._llm(host, method, path, request)
+        payload["citations"] = [f"https://arxiv.org/abs/2501.{i:05d}" for i in range(1, 6)]
+        return status, payload
+
+    def _composio(self, host, method, path, request):
+        # The Composio SDK's own bookkeeping calls get the same generic success payload.
+        sample = json.loads((REPO_ROOT / "templates/composio-connect/artifacts/sample-output.json").read_text())
+        return 200, {"successful": True, "data": sample.get("data", {}), "error": None}
+
+    def close(self) -> None:
+        self.server.shutdown()
+
+
+def redirect_http(port: int, allowed_hosts: set[str]) -> None:
+    """Send stand-in hosts to the local server and refuse everything else, for httpx and requests."""
+
+    def target(host: str) -> bool:
+        if host in STAND_IN_HOSTS:
+            return True
+        if host in LOCAL_HOSTS or host in allowed_hosts:
+            return False
+        raise ConnectionRefusedError(f"benchmark: no stand-in for {host}; pass --allow-host {host} to permit it")
+
+    try:
+        import httpx
+    except ImportError:
+        httpx = None
+    if httpx is not None:
+
+        def rewrite(request):
+            host = request.url.host
+            if target(host):
+                request.headers[STAND_IN_HEADER] = host
+                request.url = request.url.copy_with(scheme="http", host="127.0.0.1", port=port)
+
+        sync_send = httpx.HTTPTransport.handle_request
+        async_send = httpx.AsyncHTTPTransport.handle_async_request
+
+        def handle_request(self, request):
+            rewrite(request)
+            return sync_send(self, request)
+
+        async def handle_async_request(self, request):
+            rewrite(request)
+            return await async_send(self, request)
+
+        httpx.HTTPTransport.handle_request = handle_request
+        httpx.AsyncHTTPTransport.handle_async_request = handle_async_request
+
+    try:
+        import requests.adapters
+    except ImportError:
+        return
+    adapter_send = requests.adapters.HTTPAdapter.send
+
+    def send(self, request, **kwargs):
+        url = urlsplit(request.url)
+        if target(url.hostname or ""):
+            request.headers[STAND_IN_HEADER] = url.hostname
+            request.url = urlunsplit(("http", f"127.0.0.1:{port}", url.path, url.query, ""))
+        return adapter_send(self, request, **kwargs)
+
+    requests.adapters.HTTPAdapter.send = send
+
+
+def is_langflow_export(payload: dict) -> bool:
+    data = payload.get("data")
+    return isinstance(data, dict) and isinstance(data.get("nodes"), list) and isinstance(data.get("edges"), list)
+
+
+def discover_flows() -> list[Path]:
+    flows = []
+    for path in sorted(REPO_ROOT.glob("templates/*/artifacts/*.json")):
+        try:
+            payload = json.loads(path.read_text())
+        except json.JSONDecodeError:
+            continue
+        if isinstance(payload, dict) and is_langflow_export(payload):
+            flows.append(path)
+    return flows
+
+
+def prepare_payload(payload: dict, code_overrides: dict[str, str]) -> tuple[dict, dict[str, str]]:
+    """Fill credentials with stand-in values, stop chat inputs storing messages, swap in component code."""
+    payload = copy.deepcopy(payload)
+    names = {}
+    for node in payload["data"]["nodes"]:
+        data = node.get("data", {})
+        template = data.get("node", {}).get("template", {})
+        names[node["id"]] = data.get("node", {}).get("display_name") or data.get("type") or node["id"]
+        for field, value in STAND_IN_FIELDS.items():
+            if isinstance(template.get(field), dict):
+                template[field]["value"] = value
+                template[field]["load_from_db"] = False
+        if data.get("type") in INPUT_NODE_TYPES and isinstance(template.get("should_store_message"), dict):
+            template["should_store_message"]["value"] = False
+        source = code_overrides.get(node["id"]) or code_overrides.get(data.get("type", ""))
+        if source and isinstance(template.get("code"), dict):
+            template["code"]["value"] = source
+    return payload, names
+
+
+def set_input(payload: dict, text: str | None) -> dict:
+    if text is None:
+        return payload
+    payload = copy.deepcopy(payload)
+    for node in payload["data"]["nodes"]:
+        template = node.get("data", {}).get("node", {}).get("template", {})
+        if node.get("data", {}).get("type") in INPUT_NODE_TYPES and isinstance(template.get("input_value"), dict):
+            template["input_value"]["value"] = text
+    return payload
+
+
+def sample_inputs(flow: Path, inputs_file: Path | None, text: str | None) -> list[str | None]:
+    """Inputs to replay: --inputs-file, --input, the template's sample-input.json query, or the flow's own."""
+    if inputs_file:
+        values = json.loads(inputs_file.read_text())
+        return [v if isinstance(v, str) else json.dumps(v) for v in values] or [None]
+    if text is not None:
+        return [text]
+    sample = flow.parent / "sample-input.json"
+    if sample.exists():
+        query = json.loads(sample.read_text()).get("query")
+        if query:
+            return [query]
+    return [None]
+
+
+async def run_once(payload: dict) -> tuple[float, dict[str, float]]:
+    """Build and run one copy of the flow; returns end-to-end and per-vertex milliseconds."""
+    from langflow.load import aload_flow_from_json
+
+    started = time.perf_counter()
+    graph = await aload_flow_from_json(payload, disable_logs=True)
+    graph.prepare()
+    nodes = {}
+    last = time.perf_counter()
+    nodes["(load)"] = (last - started) * 1000
+    async for result in graph.async_start():
+        now = time.perf_counter()
+        vertex = getattr(result, "vertex", None)
+        if vertex is not None:
+            nodes[vertex.id] = (now - last) * 1000
+        last = now
+    return (time.perf_counter() - started) * 1000, nodes
+
+
+def summarize(samples: list[float]) -> dict:
+    ordered = sorted(samples)
+    return {
+        "median_ms": round(statistics.median(ordered), 2),
+        "p95_ms": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))], 2),
+        "max_ms": round(ordered[-1], 2),
+    }
+
+
+def peak_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+async def bench_flow(flow: Path, args, stand_ins: StandIns, overrides: dict[str, str]) -> dict:
+    raw = json.loads(flow.read_text())
+    if not is_langflow_export(raw):
+        return {"skipped": "not a LangFlow export (no data.nodes / data.edges)"}
+    payload, names = prepare_payload(raw, overrides)
+    inputs = sample_inputs(flow, args.inputs_file, args.input)
+    payloads = [set_input(payload, text) for text in inputs]
+
+    for payload_copy in payloads[: max(args.warmup, 0)]:
+        await run_once(copy.deepcopy(payload_copy))
+
+    requests_before = dict(stand_ins.requests)
+    semaphore = asyncio.Semaphore(max(1, args.concurrency))
+    totals: list[float] = []
+    per_node: dict[str, list[float]] = {}
+    errors: list[str] = []
+
+    async def one(index: int) -> None:
+        async with semaphore:
+            try:
+                total, nodes = await run_once(copy.deepcopy(payloads[index % len(payloads)]))
+            except Exception as e:  # one failing run is reported, not fatal
+                errors.append(f"{type(e).__name__}: {e}")
+                return
+        totals.append(total)
+        for node_id, ms in nodes.items():
+            per_node.setdefault(node_id, []).append(ms)
+
+    if args.tracemalloc:
+        tracemalloc.start()
+    started = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(args.runs)))
+    wall = time.perf_counter() - started
+    traced_peak = tracemalloc.get_traced_memory()[1] if args.tracemalloc else None
+    if args.tracemalloc:
+        tracemalloc.stop()
+
+    report = {
+        "runs": len(totals),
+        "errors": len(errors),
+        "concurrency": args.concurrency,
+        "end_to_end": summarize(totals) if totals else {},
+        "throughput_per_s": round(len(totals) / wall, 2) if wall else None,
+        "nodes": {
+            node_id: {"name": names.get(node_id, node_id), **summarize(samples)}
+            for node_id, samples in sorted(per_node.items(), key=lambda item: -statistics.median(item[1]))
+        },
+        "stand_in_requests": {s: stand_ins.requests[s] - requests_before[s] for s in SERVICES},
+        "peak_rss_mb": peak_rss_mb(),
+    }
+    if traced_peak is not None:
+        report["peak_python_heap_mb"] = round(traced_peak / (1024 * 1024), 1)
+    if errors:
+        report["first_error"] = errors[0]
+    return report
+
+
+def parse_pairs(values: list[str], option: str) -> dict[str, str]:
+    pairs = {}
+    for value in values or []:
+        key, sep, rest = value.partition("=")
+        if not sep:
+            raise SystemExit(f"{option} expects KEY=VALUE, got {value!r}")
+        pairs[key.strip()] = rest.strip()
+    return pairs
+
+
+def print_report(report: dict, baseline: dict | None) -> None:
+    print(f"Python {report['python']}, LangFlow {report['langflow']}; latency {report['latency_ms']}")
+    for flow, result in report["flows"].items():
+        print(f"\n{flow}")
+        if "skipped" in result:
+            print(f"  skipped: {result['skipped']}")
+            continue
+        before = (baseline or {}).get("flows", {}).get(flow, {})
+
+        def delta(current: dict, previous: dict) -> str:
+            if not previous or "median_ms" not in previous:
+                return ""
+            return f"  ({current['median_ms'] - previous['median_ms']:+.2f} ms vs baseline)"
+
+        e2e = result["end_to_end"]
+        print(
+            f"  end to end  median={e2e.get('median_ms')}  p95={e2e.get('p95_ms')}  max={e2e.get('max_ms')}  "
+            f"runs={result['runs']}  errors={result['errors']}  {result['throughput_per_s']}/s"
+            + (delta(e2e, before.get("end_to_end", {})) if e2e else "")
+        )
+        for node_id, stats in result["nodes"].items():
+            name = f"{stats['name']} [{node_id}]"
+            print(
+                f"  {name:<48} median={stats['median_ms']}  p95={stats['p95_ms']}"
+                + delta(stats, before.get("nodes", {}).get(node_id, {}))
+            )
+        print(f"  stand-in requests {result['stand_in_requests']}")
+        memory = f"peak RSS {result['peak_rss_mb']} MB"
+        if "peak_python_heap_mb" in result:
+            memory += f", peak Python heap {result['peak_python_heap_mb']} MB"
+        print(f"  {memory}")
+        if "first_error" in result:
+            print(f"  first error: {result['first_error']}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("flows", nargs="*", type=Path, help="flow JSON files (default: every LangFlow export)")
+    parser.add_argument("--runs", type=int, default=20, help="measured runs per flow")
+    parser.add_argument("--concurrency", type=int, default=1, help="runs in flight at once")
+    parser.add_argument("--warmup", type=int, default=1, help="unmeasured runs first (imports, caches)")
+    parser.add_argument("--input", help="chat input text for every run")
+    parser.add_argument("--inputs-file", type=Path, help="JSON list of inputs, replayed in turn")
+    parser.add_argument(
+        "--latency",
+        nargs="*",
+        default=[],
+        metavar="SERVICE=MS",
+        help=f"stand-in response delay per service ({', '.join(SERVICES)}); default 0",
+    )
+    parser.add_argument(
+        "--component-code",
+        nargs="*",
+        default=[],
+        metavar="NODE=FILE",
+        help="replace a node's embedded code (by node id or type), e.g. SlackUserSender=.../Slack-Sender.py",
+    )
+    parser.add_argument("--notion-pages", type=int, default=25, help="pages returned by the Notion stand-in")
+    parser.add_argument("--llm-words", type=int, default=200, help="length of stand-in LLM answers")
+    parser.add_argument("--allow-host", nargs="*", default=[], help="hosts the flow may reach for real")
+    parser.add_argument("--tracemalloc", action="store_true", help="also report peak Python heap (slower runs)")
+    parser.add_argument("--baseline", type=Path, help="earlier --json report to compare medians against")
+    parser.add_argument("--json", action="store_true", help="print machine-readable results")
+    args = parser.parse_args()
+
+    latency = {service: float(ms) for service, ms in parse_pairs(args.latency, "--latency").items()}
+    unknown = set(latency) - set(SERVICES)
+    if unknown:
+        raise SystemExit(f"Unknown services in --latency: {', '.join(sorted(unknown))}")
+    overrides = {
+        key: Path(path).read_text() for key, path in parse_pairs(args.component_code, "--component-code").items()
+    }
+
+    os.environ.setdefault("DO_NOT_TRACK", "true")
+    stand_ins = StandIns(latency, args.notion_pages, args.llm_words)
+    redirect_http(stand_ins.port, set(args.allow_host))
+    try:
+        import langflow
+
+        version = getattr(langflow, "__version__", "unknown")
+    except ImportError:
+        raise SystemExit("LangFlow is not installed in this environment") from None
+
+    flows = args.flows or discover_flows()
+    report = {"python": sys.version.split()[0], "langflow": version, "latency_ms": latency, "flows": {}}
+    try:
+        for flow in flows:
+            name = str(flow.resolve().relative_to(REPO_ROOT)) if flow.resolve().is_relative_to(REPO_ROOT) else str(flow)
+            report["flows"][name] = asyncio.run(bench_flow(flow, args, stand_ins, overrides))
+    finally:
+        stand_ins.close()
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+    print_report(report, json.loads(args.baseline.read_text()) if args.baseline else None)
+
+
+if __name__ == "__main__":
+    main()
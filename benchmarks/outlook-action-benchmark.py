@@ -0,0 +1,242 @@
+"""Benchmark the overhead ComposioOutlookAPIComponent adds around ``toolset.execute_action``.
+
+The real Composio toolset is swapped for an in-process fake that returns pre-built,
+Graph-shaped payloads, so the numbers only cover the component's own work: action
+map building, parameter mapping, error classification and result extraction.
+
+Run from the repository root in an environment where LangFlow and composio are installed:
+
+    python benchmarks/outlook-action-benchmark.py
+    python benchmarks/outlook-action-benchmark.py --json > bench.json
+"""
+
+import argparse
+import importlib.util
+import json
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Any
+
+COMPONENT_PATH = Path(__file__).resolve().parent.parent / "templates/composio-connect/composio-connect-component.py"
+DEFAULT_LIST_SIZES = (10, 1_000, 50_000)
+
+# Representative inputs for each action; values mirror what the LangFlow UI would hold.
+ACTION_INPUTS: dict[str, dict[str, Any]] = {
+    "Get Profile": {"OUTLOOK_OUTLOOK_GET_PROFILE_user_id": "me"},
+    "Send Email": {
+        "OUTLOOK_OUTLOOK_SEND_EMAIL_user_id": "me",
+        "OUTLOOK_OUTLOOK_SEND_EMAIL_subject": "Sprint review",
+        "OUTLOOK_OUTLOOK_SEND_EMAIL_body": "Agenda attached.",
+        "OUTLOOK_OUTLOOK_SEND_EMAIL_to_email": "team@university.edu",
+        "OUTLOOK_OUTLOOK_SEND_EMAIL_cc_emails": "a@university.edu, b@university.edu",
+        "OUTLOOK_OUTLOOK_SEND_EMAIL_is_html": False,
+    },
+    "Reply To Email": {
+        "OUTLOOK_OUTLOOK_REPLY_EMAIL_user_id": "me",
+        "OUTLOOK_OUTLOOK_REPLY_EMAIL_message_id": "AAMkAGI2",
+        "OUTLOOK_OUTLOOK_REPLY_EMAIL_comment": "Thanks!",
+    },
+    "List Messages": {
+        "OUTLOOK_OUTLOOK_LIST_MESSAGES_user_id": "me",
+        "OUTLOOK_OUTLOOK_LIST_MESSAGES_folder": "Inbox",
+        "OUTLOOK_OUTLOOK_LIST_MESSAGES_top": 10,
+        "OUTLOOK_OUTLOOK_LIST_MESSAGES_select": "subject, from, receivedDateTime",
+    },
+    "List Events": {
+        "OUTLOOK_OUTLOOK_LIST_EVENTS_user_id": "me",
+        "OUTLOOK_OUTLOOK_LIST_EVENTS_top": 10,
+    },
+    "Get Calendar Event": {
+        "OUTLOOK_OUTLOOK_GET_EVENT_user_id": "me",
+        "OUTLOOK_OUTLOOK_GET_EVENT_event_id": "AAMkAGI2",
+    },
+    "Create Calendar Event": {
+        "OUTLOOK_OUTLOOK_CALENDAR_CREATE_EVENT_user_id": "me",
+        "OUTLOOK_OUTLOOK_CALENDAR_CREATE_EVENT_subject": "Lab meeting",
+        "OUTLOOK_OUTLOOK_CALENDAR_CREATE_EVENT_start_datetime": "2025-01-15T10:00:00",
+        "OUTLOOK_OUTLOOK_CALENDAR_CREATE_EVENT_end_datetime": "2025-01-15T11:00:00",
+        "OUTLOOK_OUTLOOK_CALENDAR_CREATE_EVENT_attendees_info": "a@university.edu, b@university.edu",
+    },
+    "Create Email Draft": {
+        "OUTLOOK_OUTLOOK_CREATE_DRAFT_subject": "Draft",
+        "OUTLOOK_OUTLOOK_CREATE_DRAFT_body": "Body",
+        "OUTLOOK_OUTLOOK_CREATE_DRAFT_to_recipients": "a@university.edu",
+    },
+}
+
+LIST_ACTIONS = {"List Messages", "List Events"}
+
+
+def graph_message(index: int) -> dict:
+    return {
+        "@odata.etag": f'W/"CQAAABYAAAD{index:08d}"',
+        "id": f"AAMkAGI2{index:010d}",
+        "subject": f"Message {index}",
+        "bodyPreview": "Dear colleague, please find the weekly update below...",
+        "receivedDateTime": "2025-01-15T10:30:00Z",
+        "isRead": index % 2 == 0,
+        "importance": "normal",
+        "from": {"emailAddress": {"name": "Dr. Smith", "address": "dr.smith@university.edu"}},
+        "toRecipients": [{"emailAddress": {"name": "Research Team", "address": "team@university.edu"}}],
+    }
+
+
+def graph_event(index: int) -> dict:
+    return {
+        "id": f"AAMkAGI2{index:010d}",
+        "subject": f"Event {index}",
+        "start": {"dateTime": "2025-01-15T10:00:00.0000000", "timeZone": "UTC"},
+        "end": {"dateTime": "2025-01-15T11:00:00.0000000", "timeZone": "UTC"},
+        "location": {"displayName": "Room 101"},
+        "attendees": [{"emailAddress": {"address": "team@university.edu"}, "type": "required"}],
+    }
+
+
+class FakeComposioToolSet:
+    """Stands in for ComposioToolSet and returns canned Graph-shaped results.
+
+    Payloads are built once up front so generating them is not part of the measurement.
+    """
+
+    def __init__(self, list_size: int = 10):
+        single = {"id": "AAMkAGI2", "displayName": "Dr. Smith", "mail": "dr.smith@university.edu"}
+        self._results = {
+            "OUTLOOK_OUTLOOK_LIST_MESSAGES": self._list_result([graph_message(i) for i in range(list_size)]),
+            "OUTLOOK_OUTLOOK_LIST_EVENTS": self._list_result([graph_event(i) for i in range(list_size)]),
+        }
+        self._default = {"successful": True, "data": {"response_data": single, "status_code": 200}, "error": None}
+        self.calls = 0
+
+    @staticmethod
+    def _list_result(items: list[dict]) -> dict:
+        response = {"@odata.context": "https://graph.microsoft.com/v1.0/$metadata#users('me')/messages", "value": items}
+        return {"successful": True, "data": {"response_data": response, "status_code": 200}, "error": None}
+
+    def execute_action(self, action: Any, params: dict) -> dict:
+        self.calls += 1
+        key = getattr(action, "slug", None) or getattr(action, "name", None) or str(action)
+        return self._results.get(str(key).upper(), self._default)
+
+
+def load_component_class():
+    spec = importlib.util.spec_from_file_location("composio_connect_component", COMPONENT_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module.ComposioOutlookAPIComponent
+
+
+def build_component(component_class, display_name: str, toolset: FakeComposioToolSet):
+    component = component_class(
+        api_key="benchmark",
+        entity_id="benchmark",
+        action=[{"name": display_name}],
+        **ACTION_INPUTS[display_name],
+    )
+    component._build_wrapper = lambda: toolset
+    return component
+
+
+def time_calls(func, iterations: int) -> list[float]:
+    """Return per-call wall times in microseconds."""
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter_ns()
+        func()
+        samples.append((time.perf_counter_ns() - start) / 1_000)
+    return samples
+
+
+def summarize(samples: list[float]) -> dict:
+    ordered = sorted(samples)
+    return {
+        "median_us": round(statistics.median(ordered), 2),
+        "p95_us": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))], 2),
+        "min_us": round(ordered[0], 2),
+    }
+
+
+def bench_action_overhead(component_class, iterations: int) -> dict:
+    """Per-action cost of execute_action minus the cost of the bare toolset call."""
+    results = {}
+    for display_name in ACTION_INPUTS:
+        toolset = FakeComposioToolSet(list_size=10)
+        component = build_component(component_class, display_name, toolset)
+        component.execute_action()  # warm up lazily built maps and caches
+        baseline = summarize(time_calls(lambda: toolset.execute_action("noop", {}), iterations))
+        total = summarize(time_calls(component.execute_action, iterations))
+        results[display_name] = {
+            **total,
+            "overhead_median_us": round(total["median_us"] - baseline["median_us"], 2),
+        }
+    return results
+
+
+def bench_list_processing(component_class, sizes: list[int], iterations: int) -> dict:
+    results = {}
+    for display_name in sorted(LIST_ACTIONS):
+        for size in sizes:
+            component = build_component(component_class, display_name, FakeComposioToolSet(list_size=size))
+            runs = max(3, iterations // max(1, size // 100))
+            results[f"{display_name} [{size}]"] = summarize(time_calls(component.execute_action, runs))
+    return results
+
+
+def bench_import_time(runs: int) -> dict:
+    """Import cost of the component module, cold and with dependencies already imported."""
+    snippet = (
+        "import importlib.util, sys, time\n"
+        "warm = sys.argv[2] == 'warm'\n"
+        "if warm:\n"
+        "    import composio, langflow.base.composio.composio_base, langflow.inputs, langflow.logging\n"
+        "start = time.perf_counter()\n"
+        "spec = importlib.util.spec_from_file_location('m', sys.argv[1])\n"
+        "spec.loader.exec_module(importlib.util.module_from_spec(spec))\n"
+        "print((time.perf_counter() - start) * 1000)\n"
+    )
+    results = {}
+    for mode in ("cold", "warm"):
+        samples = []
+        for _ in range(runs):
+            out = subprocess.run(
+                [sys.executable, "-c", snippet, str(COMPONENT_PATH), mode],
+                capture_output=True,
+                text=True,
+                check=True,
+            )
+            samples.append(float(out.stdout.strip().splitlines()[-1]))
+        results[mode] = {"median_ms": round(statistics.median(samples), 2), "min_ms": round(min(samples), 2)}
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=2_000, help="calls per single-action measurement")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_LIST_SIZES), help="list result sizes")
+    parser.add_argument("--import-runs", type=int, default=5, help="fresh interpreters for the import benchmark")
+    parser.add_argument("--json", action="store_true", help="print machine-readable results")
+    args = parser.parse_args()
+
+    component_class = load_component_class()
+    report = {
+        "python": sys.version.split()[0],
+        "action_overhead": bench_action_overhead(component_class, args.iterations),
+        "list_processing": bench_list_processing(component_class, args.sizes, args.iterations),
+        "import_time": bench_import_time(args.import_runs),
+    }
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+
+    print(f"Python {report['python']}")
+    for section in ("action_overhead", "list_processing", "import_time"):
+        print(f"\n{section.replace('_', ' ').title()}")
+        for name, stats in report[section].items():
+            print(f"  {name:<32} " + "  ".join(f"{key}={value}" for key, value in stats.items()))
+
+
+if __name__ == "__main__":
+    main()
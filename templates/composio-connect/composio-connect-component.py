@@ -1,4 +1,10 @@
+import hashlib
 import json
+import random
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
 from typing import Any
 
 from composio import Action
@@ -7,6 +13,176 @@ from langflow.base.composio.composio_base import ComposioBaseComponent
 from langflow.inputs import BoolInput, FileInput, IntInput, MessageTextInput
 from langflow.logging import logger
 
+try:
+    import preaa_tracing  # LangFuse spans (templates/shared-langfuse-tracing), if installed
+except ImportError:
+    preaa_tracing = None
+
+# Dropped connections and timeouts, whichever HTTP library the Composio SDK raised them from.
+_TRANSPORT_ERRORS: tuple[type[BaseException], ...] = (ConnectionError, TimeoutError)
+try:
+    import requests
+
+    _TRANSPORT_ERRORS += (requests.exceptions.ConnectionError, requests.exceptions.Timeout)
+except ImportError:
+    pass
+try:
+    import httpx
+
+    _TRANSPORT_ERRORS += (httpx.TransportError,)
+except ImportError:
+    pass
+
+# Graph error codes that mean "slow down" even when the status code is not 429.
+_THROTTLE_ERROR_CODES = {"TooManyRequests", "ApplicationThrottled", "activityLimitReached"}
+_TRANSIENT_STATUS_CODES = {500, 502, 503, 504}
+_AUTH_STATUS_CODES = {401, 403}
+
+
+class ComposioActionError(ValueError):
+    """A Composio action that completed with an error response."""
+
+    retryable: bool = False
+
+    def __init__(
+        self,
+        message: str,
+        status_code: int = 400,
+        details: dict | None = None,
+        retry_after: float | None = None,
+    ):
+        super().__init__(message)
+        self.status_code = status_code
+        self.details = details if details is not None else {"error": message}
+        self.retry_after = retry_after
+
+    def to_dict(self) -> dict:
+        """Return the error in the dict shape handed back to the agent."""
+        error = {**self.details, "status_code": self.status_code, "error_type": type(self).__name__}
+        if self.retry_after is not None:
+            error["retry_after"] = self.retry_after
+        return error
+
+
+class ComposioAuthError(ComposioActionError):
+    """The connected account is not authorized for the action (401/403)."""
+
+
+class ComposioTransientError(ComposioActionError):
+    """A failure that is expected to clear on its own (5xx, dropped connection)."""
+
+    retryable = True
+
+
+class ComposioRateLimitError(ComposioTransientError):
+    """The service throttled the request (429 or a Graph throttling code)."""
+
+
+class ComposioCircuitOpenError(ComposioActionError):
+    """The connected account has failed repeatedly and calls are short-circuited."""
+
+
+def _parse_retry_after(error_data: dict) -> float | None:
+    """Read a Retry-After hint (delta-seconds or HTTP-date) from an error payload."""
+    value = error_data.get("retry_after")
+    headers = error_data.get("headers")
+    if value is None and isinstance(headers, dict):
+        value = next((v for k, v in headers.items() if k.lower() == "retry-after"), None)
+    if value is None:
+        return None
+    try:
+        return max(0.0, float(value))
+    except (TypeError, ValueError):
+        pass
+    try:
+        retry_at = parsedate_to_datetime(str(value))
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+def classify_action_error(result: dict) -> ComposioActionError:
+    """Turn an unsuccessful ``execute_action`` result into a typed error."""
+    error_data = result.get("data") or {}
+    error_message = error_data.get("message", str(result.get("error", "Unknown Error")))
+    try:
+        status_code = int(error_data.get("status_code", 400))
+    except (TypeError, ValueError):
+        status_code = 400
+
+    details: dict = {"error": error_message}
+    if isinstance(error_message, str):
+        try:
+            parsed = json.loads(error_message)
+        except json.JSONDecodeError:
+            parsed = None
+        if isinstance(parsed, dict) and isinstance(parsed.get("error", {}), dict):
+            details = parsed.get("error", {})
+    elif isinstance(error_message, dict):
+        details = error_message
+
+    message = str(details.get("message") or details.get("error") or error_message)
+    retry_after = _parse_retry_after(error_data)
+    if status_code == 429 or details.get("code") in _THROTTLE_ERROR_CODES:
+        return ComposioRateLimitError(message, status_code, details, retry_after)
+    if status_code in _TRANSIENT_STATUS_CODES:
+        return ComposioTransientError(message, status_code, details, retry_after)
+    if status_code in _AUTH_STATUS_CODES:
+        return ComposioAuthError(message, status_code, details)
+    return ComposioActionError(message, status_code, details)
+
+
+class _CircuitBreaker:
+    """Consecutive-failure circuit breaker shared by all calls for one connected account."""
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._failures = 0
+        self._opened_at: float | None = None
+        self._half_open_probe = False
+        self._lock = threading.Lock()
+
+    def before_call(self) -> None:
+        """Raise ComposioCircuitOpenError unless a call may go through now."""
+        with self._lock:
+            if self._opened_at is None:
+                return
+            remaining = self.reset_timeout - (time.monotonic() - self._opened_at)
+            if remaining <= 0 and not self._half_open_probe:
+                # Let exactly one probe through; its outcome closes or re-opens the circuit.
+                self._half_open_probe = True
+                return
+        msg = "Circuit open after repeated transient failures for this connected account"
+        raise ComposioCircuitOpenError(msg, 503, retry_after=round(max(remaining, 0.0), 3))
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._half_open_probe = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            if self._half_open_probe or self._failures >= self.failure_threshold:
+                self._opened_at = time.monotonic()
+                self._half_open_probe = False
+
+
+_circuit_breakers: dict[str, _CircuitBreaker] = {}
+_circuit_breakers_lock = threading.Lock()
+
+
+def _get_circuit_breaker(key: str) -> _CircuitBreaker:
+    with _circuit_breakers_lock:
+        breaker = _circuit_breakers.get(key)
+        if breaker is None:
+            breaker = _circuit_breakers[key] = _CircuitBreaker()
+        return breaker
+
 
 class ComposioOutlookAPIComponent(ComposioBaseComponent):
     display_name: str = "Outlook"
@@ -163,8 +339,27 @@ class ComposioOutlookAPIComponent(ComposioBaseComponent):
         "OUTLOOK_OUTLOOK_LIST_MESSAGES_orderby",
     }
 
+    # Read-only actions that can be re-sent after any transient failure. Everything else
+    # is only retried when the service throttled it, since a throttled request was not applied.
+    _idempotent_actions = {
+        "OUTLOOK_OUTLOOK_GET_PROFILE",
+        "OUTLOOK_OUTLOOK_LIST_MESSAGES",
+        "OUTLOOK_OUTLOOK_LIST_EVENTS",
+        "OUTLOOK_OUTLOOK_GET_EVENT",
+    }
+
+    _retry_base_delay: float = 0.5
+    _retry_max_delay: float = 30.0
+
     inputs = [
         *ComposioBaseComponent._base_inputs,
+        IntInput(
+            name="max_retries",
+            display_name="Max Retries",
+            info="Retries for throttled or temporarily unavailable requests. Honors Retry-After when present.",
+            value=3,
+            advanced=True,
+        ),
         MessageTextInput(
             name="OUTLOOK_OUTLOOK_LIST_EVENTS_user_id",
             display_name="User Id",
@@ -690,6 +885,22 @@ class ComposioOutlookAPIComponent(ComposioBaseComponent):
 
     def execute_action(self):
         """Execute action and return response as Message."""
+        if preaa_tracing is None:
+            return self._execute_action()
+        with preaa_tracing.span("composio.execute_action", app=self.app_name) as span:
+            result = self._execute_action()
+            if span:  # falsy when this call is not sampled
+                error = result if isinstance(result, dict) and "error_type" in result else {}
+                span.set(
+                    action=self._action_key,
+                    attempts=self._attempts,
+                    error_type=error.get("error_type"),
+                    status_code=error.get("status_code"),
+                )
+            return result
+
+    def _execute_action(self):
+        self._action_key, self._attempts = None, 0
         toolset = self._build_wrapper()
 
         try:
@@ -699,6 +910,7 @@ class ComposioOutlookAPIComponent(ComposioBaseComponent):
             if not action_key:
                 msg = f"Invalid action: {display_name}"
                 raise ValueError(msg)
+            self._action_key = action_key
 
             enum_name = getattr(Action, action_key)
             params = {}
@@ -719,23 +931,11 @@ class ComposioOutlookAPIComponent(ComposioBaseComponent):
 
                     params[param_name] = value
 
-            result = toolset.execute_action(
-                action=enum_name,
-                params=params,
-            )
-            if not result.get("successful"):
-                error_data = result.get("data", {})
-                error_message = error_data.get("message", str(result.get("error", "Unknown Error")))
-
-                if isinstance(error_message, str):
-                    try:
-                        error_obj = json.loads(error_message).get("error", {})
-                        error_obj["status_code"] = error_data.get("status_code", 400)
-                        return error_obj  # noqa: TRY300
-                    except json.JSONDecodeError:
-                        return {"error": error_message, "status_code": error_data.get("status_code", 400)}
-
-                return error_message
+            try:
+                result = self._execute_with_retry(toolset, action_key, enum_name, params)
+            except ComposioActionError as error:
+                logger.warning(f"{action_key} failed with {type(error).__name__} ({error.status_code}): {error}")
+                return error.to_dict()
 
             result_data = result.get("data", {})
             actions_data = self._actions_data.get(action_key, {})
@@ -755,6 +955,65 @@ class ComposioOutlookAPIComponent(ComposioBaseComponent):
             msg = f"Failed to execute {display_name}: {e!s}"
             raise ValueError(msg) from e
 
+    def _breaker_key(self) -> str:
+        """One breaker per connected account: app, Composio account (hashed API key) and entity."""
+        api_key = getattr(self, "api_key", None) or ""
+        if hasattr(api_key, "get_secret_value"):
+            api_key = api_key.get_secret_value()
+        account = hashlib.sha256(str(api_key).encode()).hexdigest()[:16]
+        return f"{self.app_name}:{account}:{getattr(self, 'entity_id', None) or 'default'}"
+
+    def _execute_with_retry(self, toolset, action_key: str, enum_name, params: dict) -> dict:
+        """Run the action, absorbing transient failures according to the retry policy."""
+        breaker = _get_circuit_breaker(self._breaker_key())
+        attempt = 0
+        while True:
+            breaker.before_call()
+            self._attempts = attempt + 1
+            recorded = False
+            try:
+                try:
+                    result = toolset.execute_action(action=enum_name, params=params)
+                except _TRANSPORT_ERRORS as e:
+                    error: ComposioActionError = ComposioTransientError(f"Connection to Composio failed: {e!s}", 503)
+                else:
+                    if result.get("successful"):
+                        breaker.record_success()
+                        recorded = True
+                        return result
+                    error = classify_action_error(result)
+
+                if error.retryable:
+                    breaker.record_failure()
+                else:
+                    breaker.record_success()
+                recorded = True
+            finally:
+                # Any other exception still counts as a failure, which also ends a half-open probe;
+                # otherwise the breaker would stay open for good.
+                if not recorded:
+                    breaker.record_failure()
+            if not self._should_retry(action_key, error, attempt):
+                raise error
+
+            delay = self._retry_delay(error, attempt)
+            attempt += 1
+            logger.info(f"{action_key}: {type(error).__name__}, retry {attempt} in {delay:.2f}s")
+            time.sleep(delay)
+
+    def _should_retry(self, action_key: str, error: ComposioActionError, attempt: int) -> bool:
+        if not error.retryable or attempt >= max(int(self.max_retries or 0), 0):
+            return False
+        if error.retry_after is not None and error.retry_after > self._retry_max_delay:
+            return False
+        return action_key in self._idempotent_actions or isinstance(error, ComposioRateLimitError)
+
+    def _retry_delay(self, error: ComposioActionError, attempt: int) -> float:
+        if error.retry_after is not None:
+            return error.retry_after
+        # Full jitter keeps concurrent agents from retrying in lockstep.
+        return random.uniform(0, min(self._retry_max_delay, self._retry_base_delay * 2**attempt))  # noqa: S311
+
     def update_build_config(self, build_config: dict, field_value: Any, field_name: str | None = None) -> dict:
         return super().update_build_config(build_config, field_value, field_name)
 
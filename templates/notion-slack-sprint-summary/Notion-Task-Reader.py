@@ -0,0 +1,308 @@
+from langflow.custom import Component
+from langflow.io import BoolInput, IntInput, MultilineInput, Output, SecretStrInput, StrInput
+from langflow.schema import Data
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any
+from urllib.parse import unquote
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+
+import httpx
+
+try:
+    import preaa_http  # shared pooled transport (templates/shared-http-transport), if installed
+except ImportError:
+    preaa_http = None
+
+NOTION_API_URL = "https://api.notion.com/v1"
+NOTION_VERSION = "2022-06-28"
+CONNECT_TIMEOUT_SECONDS = 5.0
+READ_TIMEOUT_SECONDS = 30.0
+MAX_PAGE_SIZE = 100
+MAX_RETRIES = 3
+SCHEMA_CACHE_TTL_SECONDS = 10 * 60
+
+DEFAULT_WATERMARK_PATH = "~/.cache/langflow/notion-watermarks.sqlite3"
+
+# Property name -> property ID per database, used to build ``filter_properties``.
+_schemas: dict[str, tuple[float, dict[str, str]]] = {}
+_lock = threading.Lock()
+
+
+class WatermarkStore:
+    """SQLite table of the newest ``last_edited_time`` seen per database and query."""
+
+    def __init__(self, path: str):
+        self.path = Path(path).expanduser()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("CREATE TABLE IF NOT EXISTS watermarks (key TEXT PRIMARY KEY, last_edited_time TEXT NOT NULL)")
+
+    @contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    def get(self, key: str) -> str | None:
+        with self._connect() as conn:
+            row = conn.execute("SELECT last_edited_time FROM watermarks WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def set(self, key: str, last_edited_time: str) -> None:
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT INTO watermarks (key, last_edited_time) VALUES (?, ?) "
+                "ON CONFLICT(key) DO UPDATE SET last_edited_time = excluded.last_edited_time",
+                (key, last_edited_time),
+            )
+
+
+def plain_value(prop: dict) -> Any:
+    """Reduce a Notion property value to the plain Python value a prompt needs."""
+    kind = prop.get("type")
+    value = prop.get(kind)
+    if kind in ("title", "rich_text"):
+        return "".join(part.get("plain_text", "") for part in value or [])
+    if kind in ("select", "status"):
+        return value.get("name") if value else None
+    if kind == "multi_select":
+        return [option["name"] for option in value or []]
+    if kind == "people":
+        return [person.get("name") or person.get("id") for person in value or []]
+    if kind in ("created_by", "last_edited_by"):
+        return value.get("name") or value.get("id") if value else None
+    if kind == "date":
+        if not value:
+            return None
+        return f"{value['start']} → {value['end']}" if value.get("end") else value["start"]
+    if kind == "relation":
+        return [related["id"] for related in value or []]
+    if kind == "files":
+        return [file.get("name") for file in value or []]
+    if kind == "unique_id":
+        if not value:
+            return None
+        return f"{value.get('prefix') or ''}{'-' if value.get('prefix') else ''}{value.get('number')}"
+    if kind in ("formula", "rollup"):
+        if not value:
+            return None
+        inner = value.get(value.get("type"))
+        if value.get("type") == "array":
+            return [plain_value(item) for item in inner or []]
+        return plain_value({"type": value.get("type"), value.get("type"): inner}) if isinstance(inner, dict) else inner
+    # number, checkbox, url, email, phone_number, created_time, last_edited_time
+    return value
+
+
+class NotionTaskReader(Component):
+    display_name = "Notion Task Reader"
+    description = (
+        "Query a Notion database page by page, returning one Data row per page with only the selected "
+        "properties. Can remember where the last run stopped and fetch only pages edited since."
+    )
+    icon = "NotionDirectoryLoader"
+
+    inputs = [
+        SecretStrInput(
+            name="notion_secret",
+            display_name="Notion Secret",
+            info="The Notion integration token.",
+            required=True,
+        ),
+        StrInput(
+            name="database_id",
+            display_name="Database ID",
+            info="The ID of the Notion database to query.",
+            required=True,
+        ),
+        MultilineInput(
+            name="query_json",
+            display_name="Database query (JSON)",
+            info="A JSON string with 'filter' and 'sorts' objects. Leave empty for no filters or sorts.",
+        ),
+        StrInput(
+            name="properties",
+            display_name="Properties",
+            info="Property names to fetch (e.g. Name, Status, Assignee, Due). Leave empty to fetch all properties.",
+            is_list=True,
+        ),
+        BoolInput(
+            name="incremental",
+            display_name="Only Changed Pages",
+            info="Fetch only pages edited since the previous complete run of the same query.",
+            value=False,
+        ),
+        IntInput(
+            name="page_size",
+            display_name="Page Size",
+            info="Pages requested per API call (max 100).",
+            value=MAX_PAGE_SIZE,
+            advanced=True,
+        ),
+        IntInput(
+            name="max_pages",
+            display_name="Max Pages",
+            info="Stop after this many pages (0 for no limit). A partial read does not move the watermark.",
+            value=0,
+            advanced=True,
+        ),
+        StrInput(
+            name="watermark_path",
+            display_name="Watermark Store Path",
+            info="SQLite file that keeps the last_edited_time watermark between runs.",
+            value=DEFAULT_WATERMARK_PATH,
+            advanced=True,
+        ),
+    ]
+
+    outputs = [
+        Output(name="pages", display_name="Pages", method="read_pages"),
+    ]
+
+    def _client(self) -> httpx.Client:
+        options = {
+            "base_url": f"{NOTION_API_URL}/",
+            "headers": {"Authorization": f"Bearer {self.notion_secret}", "Notion-Version": NOTION_VERSION},
+            "timeout": httpx.Timeout(READ_TIMEOUT_SECONDS, connect=CONNECT_TIMEOUT_SECONDS),
+        }
+        # _request waits out 429/503 itself, so the shared transport only adds pooling and instrumentation.
+        return preaa_http.client(retries=0, **options) if preaa_http else httpx.Client(**options)
+
+    def _request(self, client: httpx.Client, method: str, path: str, **kwargs) -> dict:
+        """Call the Notion API, waiting out 429/503 responses (Notion allows ~3 requests/s)."""
+        for attempt in range(MAX_RETRIES + 1):
+            response = client.request(method, path, **kwargs)
+            if response.status_code not in (429, 503) or attempt == MAX_RETRIES:
+                break
+            time.sleep(float(response.headers.get("Retry-After", 1)))
+        if response.is_error:
+            try:
+                detail = response.json().get("message", response.text)
+            except ValueError:
+                detail = response.text
+            raise ValueError(f"Notion API error {response.status_code}: {detail}")
+        return response.json()
+
+    def _property_ids(self, client: httpx.Client) -> list[str]:
+        """Resolve the selected property names to IDs for ``filter_properties``."""
+        names = [name.strip() for name in self.properties or [] if name and name.strip()]
+        if not names:
+            return []
+
+        cache_key = f"{hashlib.sha256(self.notion_secret.encode()).hexdigest()[:16]}:{self.database_id}"
+        with _lock:
+            cached = _schemas.get(cache_key)
+        if cached and time.monotonic() - cached[0] < SCHEMA_CACHE_TTL_SECONDS and all(n in cached[1] for n in names):
+            schema = cached[1]
+        else:
+            database = self._request(client, "GET", f"databases/{self.database_id}")
+            # Schema IDs come back URL-encoded; unquote so the query string is encoded once.
+            schema = {name: unquote(prop["id"]) for name, prop in database.get("properties", {}).items()}
+            with _lock:
+                _schemas[cache_key] = (time.monotonic(), schema)
+
+        missing = [name for name in names if name not in schema]
+        if missing:
+            raise ValueError(f"Unknown Notion properties {missing}; available: {sorted(schema)}")
+        return [schema[name] for name in names]
+
+    def _query(self) -> dict:
+        if not self.query_json or not self.query_json.strip():
+            return {}
+        try:
+            query = json.loads(self.query_json)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"Invalid JSON format for query: {e}") from e
+        return {key: query[key] for key in ("filter", "sorts") if query.get(key)}
+
+    def _watermark_key(self, query: dict) -> str:
+        canonical = json.dumps(
+            {"filter": query.get("filter"), "properties": sorted(self.properties or [])}, sort_keys=True
+        )
+        return f"{self.database_id}:{hashlib.sha256(canonical.encode()).hexdigest()[:16]}"
+
+    @staticmethod
+    def _since_filter(user_filter: dict | None, since: str) -> dict:
+        # Notion rounds last_edited_time to the minute, so the boundary is inclusive.
+        edited = {"timestamp": "last_edited_time", "last_edited_time": {"on_or_after": since}}
+        if not user_filter:
+            return edited
+        # Merge into the existing compound filter rather than nesting, to stay within Notion's
+        # two-level depth limit: extend a top-level "and", and push the condition into each
+        # branch of a top-level "or".
+        if "and" in user_filter:
+            return {"and": [*user_filter["and"], edited]}
+        if "or" in user_filter:
+            branches = []
+            for branch in user_filter["or"]:
+                branches.extend(branch["or"] if "or" in branch else [branch])
+            return {"or": [NotionTaskReader._since_filter(branch, since) for branch in branches]}
+        return {"and": [user_filter, edited]}
+
+    def iter_pages(self, client: httpx.Client, body: dict, property_ids: list[str]) -> Iterator[dict]:
+        """Yield raw pages, following ``next_cursor`` until ``has_more`` is false."""
+        params = [("filter_properties", property_id) for property_id in property_ids]
+        page_size = min(max(int(self.page_size or MAX_PAGE_SIZE), 1), MAX_PAGE_SIZE)
+        cursor = None
+        while True:
+            payload = {**body, "page_size": page_size}
+            if cursor:
+                payload["start_cursor"] = cursor
+            batch = self._request(client, "POST", f"databases/{self.database_id}/query", params=params, json=payload)
+            yield from batch.get("results", [])
+            cursor = batch.get("next_cursor")
+            if not batch.get("has_more") or not cursor:
+                return
+
+    def iter_rows(self) -> Iterator[Data]:
+        """Yield one Data row per page as each API batch arrives.
+
+        The watermark moves only once the iterator is exhausted, so a consumer that stops
+        early, or a read cut short by Max Pages or an error, re-reads the same window next time.
+        """
+        query = self._query()
+        store = WatermarkStore(self.watermark_path) if self.incremental and self.watermark_path else None
+        watermark_key = self._watermark_key(query)
+        since = store.get(watermark_key) if store else None
+        if since:
+            query["filter"] = self._since_filter(query.get("filter"), since)
+
+        limit = max(int(self.max_pages or 0), 0)
+        count = 0
+        newest = since
+        complete = True
+        with self._client() as client:
+            for page in self.iter_pages(client, query, self._property_ids(client)):
+                if limit and count >= limit:
+                    complete = False
+                    break
+                properties = {name: plain_value(prop) for name, prop in page.get("properties", {}).items()}
+                text = "; ".join(
+                    f"{name}: {value}" for name, value in properties.items() if value not in (None, "", [])
+                )
+                newest = max(newest or "", page["last_edited_time"])
+                count += 1
+                yield Data(
+                    text=text,
+                    id=page["id"],
+                    url=page.get("url"),
+                    last_edited_time=page["last_edited_time"],
+                    properties=properties,
+                )
+
+        if store and complete and newest:
+            store.set(watermark_key, newest)
+
+        scope = f"edited since {since}" if since else "all matching"
+        self.status = f"{count} pages ({scope}){'' if complete else ', stopped at Max Pages'}"
+
+    def read_pages(self) -> list[Data]:
+        return list(self.iter_rows())
@@ -1,6 +1,401 @@
 from langflow.custom import Component
-from langflow.io import MessageInput, StrInput, Output
-import requests
+from langflow.io import BoolInput, DataInput, DropdownInput, IntInput, MessageInput, StrInput, Output
+from langflow.logging import logger
+from collections import OrderedDict
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from pathlib import Path
+import asyncio
+import hashlib
+import json
+import re
+import sqlite3
+import threading
+import time
+import uuid
+
+import httpx
+
+try:
+    import preaa_http  # shared pooled transport (templates/shared-http-transport), if installed
+except ImportError:
+    preaa_http = None
+
+try:
+    import preaa_tracing  # LangFuse spans (templates/shared-langfuse-tracing), if installed
+except ImportError:
+    preaa_tracing = None
+
+SLACK_API_URL = "https://slack.com/api"
+CONNECT_TIMEOUT_SECONDS = 5.0
+READ_TIMEOUT_SECONDS = 15.0
+CONNECT_RETRY_SECONDS = 1.0
+AUTH_CACHE_TTL_SECONDS = 15 * 60
+CHANNEL_CACHE_TTL_SECONDS = 60 * 60
+# Names conversations.list did not return (channels the token cannot see) are not looked up
+# again for this long, so they do not cost a full listing on every send.
+CHANNEL_MISS_TTL_SECONDS = 10 * 60
+
+# chat.postMessage allows roughly one message per second per channel, with a
+# workspace-wide ceiling of a few hundred per minute.
+CHANNEL_RATE_PER_SECOND = 1.0
+WORKSPACE_RATE_PER_SECOND = 4.0
+WORKSPACE_BURST = 10
+
+DEFAULT_SPOOL_PATH = "~/.cache/langflow/slack-send-spool.sqlite3"
+MAX_SPOOL_ATTEMPTS = 10
+
+# Failures worth keeping a message in the spool for; anything else, including the auth errors
+# in REAUTH_ERRORS, is a permanent rejection that replaying cannot fix.
+SPOOL_RETRY_ERRORS = {"ratelimited", "service_unavailable", "connection_error", "request_timeout"}
+
+# Instrumentation levels, most to least verbose. "off" records nothing and costs one comparison.
+INSTRUMENTATION_LEVELS = {"debug": 10, "info": 20, "error": 40, "off": 100}
+
+# Fire-and-forget deliveries whose outcome can still be looked up with delivery_status().
+MAX_TRACKED_DELIVERIES = 1000
+
+# Channel, group, DM and user IDs are posted to as-is, without a lookup.
+CHANNEL_ID_PATTERN = re.compile(r"^[CGDUW][A-Z0-9]{8,}$")
+FENCE = "```"
+
+# Slack message limits: section text, header text, blocks per message and the plain
+# ``text`` field. MESSAGE_CHAR_BUDGET keeps block messages well under the payload cap.
+SECTION_CHAR_LIMIT = 3000
+HEADER_CHAR_LIMIT = 150
+MAX_BLOCKS_PER_MESSAGE = 50
+MESSAGE_CHAR_BUDGET = 12000
+TEXT_CHAR_LIMIT = 39000
+FALLBACK_TEXT_CHARS = 300
+
+# Errors that mean the cached auth.test result can no longer be trusted.
+REAUTH_ERRORS = {"invalid_auth", "token_revoked", "token_expired", "account_inactive", "not_authed"}
+
+# LangFlow builds a fresh component per run, so pools and the auth cache live at module level.
+# All Slack I/O runs on one background event loop, which owns the per-token clients; the
+# LangFlow worker only awaits (or, in fire-and-forget mode, does not wait for) the result.
+_clients: dict[str, httpx.AsyncClient] = {}
+_auth_cache: dict[str, tuple[float, dict]] = {}
+_channel_ids: dict[str, tuple[float, dict[str, str]]] = {}
+_channel_misses: dict[str, dict[str, float]] = {}
+_spools: dict[str, "SendSpool"] = {}
+_buckets: dict[str, "TokenBucket"] = {}
+_deliveries: OrderedDict[str, dict] = OrderedDict()
+_delivery_loop: asyncio.AbstractEventLoop | None = None
+_lock = threading.Lock()
+
+
+def get_delivery_loop() -> asyncio.AbstractEventLoop:
+    """Return the background event loop that performs Slack deliveries, starting it once."""
+    global _delivery_loop
+    with _lock:
+        if _delivery_loop is None:
+            _delivery_loop = asyncio.new_event_loop()
+            threading.Thread(target=_delivery_loop.run_forever, name="slack-delivery", daemon=True).start()
+        return _delivery_loop
+
+
+def get_client(token: str) -> httpx.AsyncClient:
+    """Return the pooled client for a token. Must be called on the delivery loop."""
+    client = _clients.get(token)
+    if client is None:
+        options = {
+            "base_url": f"{SLACK_API_URL}/",
+            "headers": {"Authorization": f"Bearer {token}"},
+            "timeout": httpx.Timeout(READ_TIMEOUT_SECONDS, connect=CONNECT_TIMEOUT_SECONDS),
+        }
+        if preaa_http is not None:
+            # _send_with_retry already paces and retries posts, so the shared transport does not.
+            client = preaa_http.async_client(retries=0, **options)
+        else:
+            client = httpx.AsyncClient(limits=httpx.Limits(max_connections=16, max_keepalive_connections=4), **options)
+        _clients[token] = client
+    return client
+
+
+def delivery_status(delivery_id: str) -> dict | None:
+    """Look up a fire-and-forget delivery: queued, delivered or failed, plus the Slack result."""
+    with _lock:
+        status = _deliveries.get(delivery_id)
+        return dict(status) if status else None
+
+
+def _track_delivery(delivery_id: str, **status) -> None:
+    with _lock:
+        _deliveries[delivery_id] = status
+        _deliveries.move_to_end(delivery_id)
+        while len(_deliveries) > MAX_TRACKED_DELIVERIES:
+            _deliveries.popitem(last=False)
+
+
+def invalidate_auth(token: str) -> None:
+    with _lock:
+        _auth_cache.pop(token, None)
+
+
+class TokenBucket:
+    """Token bucket for coroutines; ``pause`` pushes every waiter back after a 429."""
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def _take(self) -> float:
+        """Consume a token and return 0, or return how long to wait before trying again."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            if now >= self._paused_until and self._tokens >= 1:
+                self._tokens -= 1
+                return 0.0
+            return max(self._paused_until - now, (1 - self._tokens) / self.rate)
+
+    async def acquire(self) -> None:
+        while (wait := self._take()) > 0:
+            await asyncio.sleep(wait)
+
+    def pause(self, seconds: float) -> None:
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+            self._tokens = 0
+
+
+def get_bucket(key: str, rate: float, capacity: float) -> TokenBucket:
+    with _lock:
+        bucket = _buckets.get(key)
+        if bucket is None:
+            bucket = _buckets[key] = TokenBucket(rate, capacity)
+        return bucket
+
+
+_HEADING = re.compile(r"^\s{0,3}(#{1,6})\s+(.*?)\s*#*\s*$")
+_RULE = re.compile(r"^\s{0,3}([-*_])(\s*\1){2,}\s*$")
+_BULLET = re.compile(r"^(\s*)[-*+]\s+(.*)$")
+_CODE_SPAN = re.compile(r"(`[^`\n]*`)")
+_LINK = re.compile(r"\[([^\]\n]+)\]\((https?://[^)\s]+)\)")
+_BOLD = re.compile(r"(\*\*|__)(?=\S)(.+?)(?<=\S)\1")
+_ITALIC = re.compile(r"(?<![*\w])\*(?=[^\s*])([^*\n]*?[^\s*])?\*(?![*\w])")
+_STRIKE = re.compile(r"~~(?=\S)(.+?)(?<=\S)~~")
+
+
+def _inline_mrkdwn(line: str) -> str:
+    """Convert inline markdown to Slack mrkdwn, leaving code spans untouched."""
+    parts = _CODE_SPAN.split(line)
+    for i in range(0, len(parts), 2):
+        text = parts[i].replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
+        text = _LINK.sub(r"<\2|\1>", text)
+        text = _ITALIC.sub(lambda m: f"_{m.group(1) or ''}_", text)
+        text = _BOLD.sub(r"*\2*", text)
+        parts[i] = _STRIKE.sub(r"~\1~", text)
+    return "".join(parts)
+
+
+def _pack_lines(lines: list[str], limit: int) -> list[str]:
+    """Join lines into as few chunks of at most ``limit`` characters as possible.
+
+    A fenced code block split across chunks is closed at the end of one chunk and reopened at
+    the start of the next, so every chunk renders on its own.
+    """
+    fence_size = len(FENCE) + 1
+    # Oversized lines are hard-split to a width that still fits between a reopened and a closing fence.
+    width = max(limit - 2 * fence_size, 1)
+    chunks: list[str] = []
+    current: list[str] = []
+    size = 0
+    in_code = False
+    for long_line in lines:
+        for line in [long_line[i : i + width] for i in range(0, len(long_line), width)] or [""]:
+            opens_or_closes = line.lstrip().startswith(FENCE)
+            reserve = fence_size if in_code != opens_or_closes else 0
+            if current and size + 1 + len(line) + reserve > limit:
+                if in_code:
+                    current.append(FENCE)
+                chunks.append("\n".join(current))
+                current, size = ([FENCE], len(FENCE)) if in_code else ([], 0)
+            size += len(line) + (1 if current else 0)
+            current.append(line)
+            in_code = in_code != opens_or_closes
+    if current:
+        chunks.append("\n".join(current))
+    return [chunk.strip("\n") for chunk in chunks if chunk.strip()]
+
+
+def markdown_to_blocks(markdown: str) -> list[dict]:
+    """Render LLM markdown as Block Kit blocks in one pass over the lines.
+
+    Headings become header blocks, horizontal rules become dividers and everything
+    in between becomes section blocks of mrkdwn, split at line boundaries.
+    """
+    blocks: list[dict] = []
+    section: list[str] = []
+    in_code = False
+
+    def flush() -> None:
+        for chunk in _pack_lines(section, SECTION_CHAR_LIMIT):
+            blocks.append({"type": "section", "text": {"type": "mrkdwn", "text": chunk}})
+        section.clear()
+
+    for line in markdown.splitlines():
+        if line.lstrip().startswith("```"):
+            in_code = not in_code
+            section.append(line.strip())
+        elif in_code:
+            section.append(line.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;"))
+        elif heading := _HEADING.match(line):
+            flush()
+            title = heading.group(2).replace("**", "").replace("__", "").strip()
+            if len(title) <= HEADER_CHAR_LIMIT:
+                blocks.append({"type": "header", "text": {"type": "plain_text", "text": title, "emoji": True}})
+            else:
+                section.append(f"*{_inline_mrkdwn(title)}*")
+        elif _RULE.match(line):
+            flush()
+            blocks.append({"type": "divider"})
+        elif bullet := _BULLET.match(line):
+            section.append(f"{bullet.group(1)}• {_inline_mrkdwn(bullet.group(2))}")
+        else:
+            section.append(_inline_mrkdwn(line))
+    flush()
+    return blocks
+
+
+def _block_text(block: dict) -> str:
+    return block.get("text", {}).get("text", "")
+
+
+def pack_messages(blocks: list[dict]) -> list[dict]:
+    """Pack blocks into the fewest messages that fit Slack's per-message limits.
+
+    A header is never left as the last block of a message; it moves to the next one
+    with its section. Each block's size is measured once.
+    """
+    messages: list[list[dict]] = []
+    current: list[dict] = []
+    size = 0
+    for block in blocks:
+        block_size = len(_block_text(block))
+        if current and (len(current) >= MAX_BLOCKS_PER_MESSAGE or size + block_size > MESSAGE_CHAR_BUDGET):
+            carry = [current.pop()] if current[-1]["type"] == "header" else []
+            if current:
+                messages.append(current)
+            current, size = carry, sum(len(_block_text(b)) for b in carry)
+        current.append(block)
+        size += block_size
+    if current:
+        messages.append(current)
+
+    payloads = []
+    for message in messages:
+        while message and message[-1]["type"] == "divider":
+            message.pop()
+        while message and message[0]["type"] == "divider":
+            message.pop(0)
+        if message:
+            fallback = next((_block_text(b) for b in message if _block_text(b)), "")
+            payloads.append({"text": fallback[:FALLBACK_TEXT_CHARS], "blocks": message})
+    return payloads
+
+
+def _retry_after_seconds(value: str | None, default: float = 1.0) -> float:
+    """Read a Retry-After header given as delta-seconds or as an HTTP-date."""
+    if not value:
+        return default
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return default
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+class SendSpool:
+    """SQLite-backed spool of messages that Slack did not accept on the first try.
+
+    Rows are keyed by a hash of the token, never the token itself, and are replayed
+    by the next run that uses the same token. A row being sent is leased so that
+    concurrent runs, including other worker processes, do not send it twice. The
+    methods block; call them from a worker thread, not the delivery loop.
+    """
+
+    lease_seconds = 120.0
+
+    def __init__(self, path: str):
+        self.path = Path(path).expanduser()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS spool ("
+                "id INTEGER PRIMARY KEY AUTOINCREMENT, token_key TEXT NOT NULL, payload TEXT NOT NULL, "
+                "attempts INTEGER NOT NULL DEFAULT 0, last_error TEXT, leased_until REAL NOT NULL DEFAULT 0)"
+            )
+
+    @contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    def add(self, token_key: str, payload: dict, error: str | None = None) -> int:
+        """Store a payload for the next drain, counting the failed attempt if ``error`` is given."""
+        with self._connect() as conn:
+            cursor = conn.execute(
+                "INSERT INTO spool (token_key, payload, attempts, last_error) VALUES (?, ?, ?, ?)",
+                (token_key, json.dumps(payload), int(error is not None), error),
+            )
+            return cursor.lastrowid
+
+    def claim_next(self, token_key: str) -> tuple[int, dict] | None:
+        """Lease the oldest message for this token that nobody is sending."""
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            row = conn.execute(
+                "SELECT id, payload FROM spool WHERE token_key = ? AND leased_until < ? ORDER BY id LIMIT 1",
+                (token_key, time.time()),
+            ).fetchone()
+            if row:
+                leased_until = time.time() + self.lease_seconds
+                conn.execute("UPDATE spool SET leased_until = ? WHERE id = ?", (leased_until, row[0]))
+            conn.execute("COMMIT")
+        return (row[0], json.loads(row[1])) if row else None
+
+    def remove(self, spool_id: int) -> None:
+        with self._connect() as conn:
+            conn.execute("DELETE FROM spool WHERE id = ?", (spool_id,))
+
+    def release(self, spool_id: int, error: str) -> None:
+        """Record a failed attempt and make the message available again, up to MAX_SPOOL_ATTEMPTS."""
+        with self._connect() as conn:
+            conn.execute(
+                "UPDATE spool SET attempts = attempts + 1, last_error = ?, leased_until = 0 WHERE id = ?",
+                (error, spool_id),
+            )
+            conn.execute("DELETE FROM spool WHERE id = ? AND attempts >= ?", (spool_id, MAX_SPOOL_ATTEMPTS))
+
+
+def get_spool(path: str) -> SendSpool:
+    """Open the spool at ``path`` once per process. Blocks; call it from a worker thread."""
+    with _lock:
+        spool = _spools.get(path)
+    if spool is None:
+        spool = SendSpool(path)
+        with _lock:
+            spool = _spools.setdefault(path, spool)
+    return spool
+
 
 class SlackUserSender(Component):
     display_name = "Slack User Sender"
@@ -9,51 +404,445 @@ class SlackUserSender(Component):
 
     inputs = [
         StrInput(name="user_token", display_name="Slack User Token (xoxp-...)", required=True),
-        StrInput(name="channel", display_name="Channel ID or Name", required=True),
+        StrInput(
+            name="channel",
+            display_name="Channel ID or Name",
+            info="Target channel. Used when no fan-out channels or per-channel messages are set.",
+            required=True,
+        ),
         MessageInput(name="message", display_name="Message Input"),
         StrInput(name="username", display_name="Display Name (optional)", value="Marcus Izumi", advanced=True),
         StrInput(name="icon_emoji", display_name="Emoji Icon (optional)", value=":wave:", advanced=True),
+        StrInput(
+            name="channels",
+            display_name="Fan-out Channels",
+            info="Channels that all receive the message input. When set, Channel is not posted to.",
+            is_list=True,
+            advanced=True,
+        ),
+        DataInput(
+            name="channel_messages",
+            display_name="Per-channel Messages",
+            info="Data rows with 'channel' and 'text' fields, each posted to its own channel instead of Channel.",
+            is_list=True,
+            advanced=True,
+        ),
+        BoolInput(
+            name="render_blocks",
+            display_name="Render as Block Kit",
+            info="Convert markdown to Slack blocks. Long output is split at section boundaries and threaded.",
+            value=False,
+            advanced=True,
+        ),
+        IntInput(
+            name="max_concurrency",
+            display_name="Max Concurrent Channels",
+            info="How many channels are posted to in parallel during fan-out.",
+            value=4,
+            advanced=True,
+        ),
+        BoolInput(
+            name="fire_and_forget",
+            display_name="Fire and Forget",
+            info="Return a delivery handle immediately instead of waiting for Slack. Failures are logged and spooled.",
+            value=False,
+            advanced=True,
+        ),
+        DropdownInput(
+            name="instrumentation_level",
+            display_name="Instrumentation Level",
+            info="Log one compact line per post (channel, status, latency, retries). 'debug' also logs each retry.",
+            options=list(INSTRUMENTATION_LEVELS),
+            value="off",
+            advanced=True,
+        ),
+        IntInput(
+            name="max_retries",
+            display_name="Max Retries",
+            info="Retries after Slack rate-limits a post (waits for Retry-After each time) or cannot be reached.",
+            value=3,
+            advanced=True,
+        ),
+        StrInput(
+            name="spool_path",
+            display_name="Send Spool Path",
+            info="SQLite file that keeps rate-limited messages until they are delivered. Leave empty to disable.",
+            value=DEFAULT_SPOOL_PATH,
+            advanced=True,
+        ),
     ]
 
     outputs = [
-        Output(name="response", display_name="Slack Response", method="send_message")
+        Output(name="response", display_name="Slack Response", method="send_message"),
     ]
 
-    def send_message(self):
-        import json
-    
-        # --- Debug who this token actually is ---
-        auth_check = requests.get(
-            "https://slack.com/api/auth.test",
-            headers={"Authorization": f"Bearer {self.user_token}"},
-        ).json()
-        self.log(f"[DEBUG] Auth check: {json.dumps(auth_check, indent=2)}")
-    
+    def _instrument(self, level: str, event: str, **fields) -> None:
+        """Emit a one-line ``key=value`` record if ``level`` is enabled; never logs token identity."""
+        if INSTRUMENTATION_LEVELS[level] < INSTRUMENTATION_LEVELS.get(self.instrumentation_level or "off", 100):
+            return
+        logger.log(level.upper(), f"slack.{event} " + " ".join(f"{key}={value}" for key, value in fields.items()))
+
+    async def verify_token(self, force: bool = False) -> dict:
+        """Run auth.test at most once per AUTH_CACHE_TTL_SECONDS for this token."""
+        now = time.monotonic()
+        with _lock:
+            cached = _auth_cache.get(self.user_token)
+        self._auth_cache_hit = bool(cached and not force and now - cached[0] < AUTH_CACHE_TTL_SECONDS)
+        if self._auth_cache_hit:
+            return cached[1]
+
+        auth_check = (await get_client(self.user_token).get("auth.test")).json()
+        self._instrument("debug", "auth_test", ok=auth_check.get("ok"), error=auth_check.get("error"))
+
         if not auth_check.get("ok"):
-            raise ValueError(f"Token auth failed: {auth_check}")
-    
-        # --- Extract text safely ---
+            invalidate_auth(self.user_token)
+            raise ValueError(f"Token auth failed: {auth_check.get('error')}")
+
+        with _lock:
+            _auth_cache[self.user_token] = (now, auth_check)
+        return auth_check
+
+    async def resolve_channel_ids(self, channels: list[str]) -> dict[str, str]:
+        """Map channel names to IDs using one cached conversations.list per token."""
+        names = {c for c in channels if not CHANNEL_ID_PATTERN.match(c)}
+        resolved = {c: c for c in channels if c not in names}
+        if not names:
+            return resolved
+
+        now = time.monotonic()
+        with _lock:
+            cached = _channel_ids.get(self.user_token)
+            misses = dict(_channel_misses.get(self.user_token, {}))
+        fresh = cached and now - cached[0] < CHANNEL_CACHE_TTL_SECONDS
+        lookup = cached[1] if fresh else {}
+        # Refresh if the cache is stale or a channel may have been created since it was built;
+        # names that were recently missing from a listing do not trigger another one.
+        recent_misses = {name for name, missed_at in misses.items() if now - missed_at < CHANNEL_MISS_TTL_SECONDS}
+        unknown = [name for name in names if name.lstrip("#") not in lookup and name.lstrip("#") not in recent_misses]
+        if not fresh or unknown:
+            lookup = await self._fetch_channel_ids()
+            with _lock:
+                token_misses = _channel_misses.setdefault(self.user_token, {})
+                for name in names:
+                    if name.lstrip("#") not in lookup:
+                        token_misses[name.lstrip("#")] = now
+
+        for name in names:
+            # Fall back to the raw name; chat.postMessage still accepts it.
+            resolved[name] = lookup.get(name.lstrip("#"), name)
+        return resolved
+
+    async def _fetch_channel_ids(self) -> dict[str, str]:
+        client = get_client(self.user_token)
+        lookup: dict[str, str] = {}
+        params = {"types": "public_channel,private_channel", "exclude_archived": "true", "limit": 1000}
+        while True:
+            page = (await client.get("conversations.list", params=params)).json()
+            if not page.get("ok"):
+                # Cached as well (e.g. missing channels:read scope), so every send does not retry the listing.
+                self._instrument("error", "channel_lookup", status=page.get("error"), fallback="name")
+                break
+            lookup.update({channel["name"]: channel["id"] for channel in page.get("channels", [])})
+            cursor = page.get("response_metadata", {}).get("next_cursor")
+            if not cursor:
+                break
+            params["cursor"] = cursor
+
+        with _lock:
+            _channel_ids[self.user_token] = (time.monotonic(), lookup)
+        return lookup
+
+    def _message_text(self) -> str:
+        if self.message is None:
+            return ""
         if hasattr(self.message, "text"):
-            text = self.message.text
-        else:
-            text = str(self.message)
-    
-        payload = {
-            "channel": self.channel,
-            "text": text,
-            "username": self.username,
-            "icon_emoji": self.icon_emoji,
-        }
-    
-        res = requests.post(
-            "https://slack.com/api/chat.postMessage",
-            headers={
-                "Authorization": f"Bearer {self.user_token}",
-                "Content-Type": "application/json",
-            },
-            json=payload,
+            return self.message.text
+        return str(self.message)
+
+    @property
+    def _token_key(self) -> str:
+        return hashlib.sha256(self.user_token.encode()).hexdigest()[:16]
+
+    async def _spool(self) -> SendSpool | None:
+        if not self.spool_path:
+            return None
+        try:
+            return await asyncio.to_thread(get_spool, self.spool_path)
+        except (OSError, sqlite3.Error) as e:
+            # Sending still works without a spool; only failed messages are not kept.
+            logger.warning(f"Slack spool unavailable at {self.spool_path}: {e}")
+            return None
+
+    async def _send_with_retry(self, payload: dict) -> tuple[dict, int]:
+        """POST chat.postMessage within the rate limits, retrying when Slack throttles.
+
+        Only a 429 or a failure to connect is retried: in both cases Slack has not taken the
+        message. A 5xx or a read timeout can arrive after the post landed, so those go to the
+        spool instead of being sent again right away. Returns the Slack result and the number
+        of retries it took.
+        """
+        channel_bucket = get_bucket(f"{self._token_key}:{payload['channel']}", CHANNEL_RATE_PER_SECOND, 1)
+        workspace_bucket = get_bucket(self._token_key, WORKSPACE_RATE_PER_SECOND, WORKSPACE_BURST)
+        client = get_client(self.user_token)
+        attempt = 0
+        while True:
+            await channel_bucket.acquire()
+            await workspace_bucket.acquire()
+            retry_after = None
+            try:
+                response = await client.post("chat.postMessage", json=payload)
+            except (httpx.ConnectError, httpx.ConnectTimeout) as e:
+                result = {"ok": False, "error": "connection_error", "detail": str(e)}
+            except httpx.TimeoutException as e:
+                return {"ok": False, "error": "request_timeout", "detail": str(e)}, attempt
+            except httpx.TransportError as e:
+                return {"ok": False, "error": "connection_error", "detail": str(e)}, attempt
+            else:
+                if response.status_code >= 500:
+                    return {"ok": False, "error": "service_unavailable"}, attempt
+                if response.status_code == 429:
+                    result = {"ok": False, "error": "ratelimited"}
+                else:
+                    result = response.json()
+                if result.get("error") in REAUTH_ERRORS:
+                    # A revoked or expired token only shows up here once auth.test is cached;
+                    # drop the cache and re-check so the next run reports it as an auth error.
+                    invalidate_auth(self.user_token)
+                    try:
+                        await self.verify_token(force=True)
+                    except ValueError as e:
+                        result["detail"] = str(e)
+                    return result, attempt
+                if result.get("error") != "ratelimited":
+                    return result, attempt
+                retry_after = _retry_after_seconds(response.headers.get("Retry-After"))
+
+            if attempt >= max(int(self.max_retries or 0), 0):
+                return result, attempt
+            attempt += 1
+            self._instrument(
+                "debug",
+                "retry",
+                channel=payload["channel"],
+                status=result["error"],
+                attempt=attempt,
+                wait_s=CONNECT_RETRY_SECONDS if retry_after is None else retry_after,
+            )
+            if retry_after is None:  # the connection failed, so only this post waits
+                await asyncio.sleep(CONNECT_RETRY_SECONDS)
+            else:
+                workspace_bucket.pause(retry_after)
+
+    async def _deliver(self, payload: dict, spool: SendSpool | None, spool_id: int | None = None) -> dict:
+        """Send one payload; if Slack does not accept it for now, keep it in the spool.
+
+        ``spool_id`` is set when re-sending a spooled row. A new message only touches the
+        spool when its send fails.
+        """
+        started = time.perf_counter()
+        try:
+            result, retries = await self._send_with_retry(payload)
+        except Exception as e:
+            if spool:
+                await self._spool_failure(spool, spool_id, payload, str(e))
+            raise
+        if spool:
+            if result.get("ok") or result.get("error") not in SPOOL_RETRY_ERRORS:
+                if spool_id is not None:
+                    await asyncio.to_thread(spool.remove, spool_id)
+            else:
+                await self._spool_failure(spool, spool_id, payload, result.get("error"))
+                result["spooled"] = True
+        if (stats := getattr(self, "_post_stats", None)) is not None:
+            stats["posts"] += 1
+            stats["retries"] += retries
+            stats["spooled"] += bool(result.get("spooled"))
+        self._instrument(
+            "info" if result.get("ok") else "error",
+            "post",
+            channel=payload["channel"],
+            status=result.get("error") or "ok",
+            latency_ms=round((time.perf_counter() - started) * 1000, 1),
+            retries=retries,
+            spooled=bool(result.get("spooled")),
         )
-    
+        return result
+
+    async def _spool_failure(self, spool: SendSpool, spool_id: int | None, payload: dict, error: str) -> None:
+        if spool_id is None:
+            await asyncio.to_thread(spool.add, self._token_key, payload, error)
+        else:
+            await asyncio.to_thread(spool.release, spool_id, error)
+
+    async def drain_spool(self, spool: SendSpool | None) -> None:
+        """Re-send messages left over from earlier runs with this token, oldest first.
+
+        A failure here is logged and never stops the new message from being sent.
+        """
+        try:
+            await self._drain_spool(spool)
+        except Exception as e:
+            logger.warning(f"Slack spool drain failed: {type(e).__name__}: {e}")
+            self._instrument("error", "spool_drain", status=type(e).__name__)
+
+    async def _drain_spool(self, spool: SendSpool | None) -> None:
+        while spool and (claimed := await asyncio.to_thread(spool.claim_next, self._token_key)):
+            spool_id, payload = claimed
+            result = await self._deliver(payload, spool, spool_id)
+            if result.get("spooled"):
+                break  # still throttled; try again next run
+            self._instrument("info", "spool_drained", channel=payload["channel"], status=result.get("error") or "ok")
+
+    def _render(self, text: str) -> list[dict]:
+        if self.render_blocks:
+            parts = pack_messages(markdown_to_blocks(text))
+        else:
+            parts = [{"text": chunk} for chunk in _pack_lines(text.splitlines(), TEXT_CHAR_LIMIT)]
+        return parts or [{"text": text}]
+
+    async def _post(self, channel: str, text: str, spool: SendSpool | None = None) -> dict:
+        """Post text as one or more messages, threading follow-ups under the first."""
+        base = {"channel": channel, "username": self.username, "icon_emoji": self.icon_emoji}
+        first, *rest = self._render(text)
+        result = await self._deliver({**base, **first}, spool)
+        if not rest:
+            return result
+
+        if result.get("ok"):
+            thread = {"channel": result.get("channel", channel), "thread_ts": result["ts"]}
+            result["replies"] = [await self._deliver({**base, **thread, **part}, spool) for part in rest]
+        elif result.get("spooled"):
+            # Keep the follow-ups in order behind the first message; they cannot be threaded yet.
+            for part in rest:
+                await asyncio.to_thread(spool.add, self._token_key, {**base, **part})
+        return result
+
+    async def _run_on_delivery_loop(self, coro):
+        return await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(coro, get_delivery_loop()))
+
+    def _dispatch(self, coro, **info) -> dict:
+        """Start a delivery in the background and return its handle right away."""
+        delivery_id = uuid.uuid4().hex
+        _track_delivery(delivery_id, status="queued", **info)
+        future = asyncio.run_coroutine_threadsafe(coro, get_delivery_loop())
+
+        def done(f) -> None:
+            if f.exception():
+                logger.error(f"Slack delivery {delivery_id} failed: {f.exception()}")
+                _track_delivery(delivery_id, status="failed", error=str(f.exception()), **info)
+            else:
+                _track_delivery(delivery_id, status="delivered", result=f.result(), **info)
+
+        future.add_done_callback(done)
+        return {"delivery_id": delivery_id, "status": "queued", **info}
+
+    async def _send_single(self, channel: str, text: str) -> dict:
+        await self.verify_token()
+        spool = await self._spool()
+        await self.drain_spool(spool)
+
+        result = await self._post(channel, text, spool)
+        if not result.get("ok"):
+            if result.get("spooled"):
+                msg = f"Slack did not accept the message ({result['error']}); it will be retried on the next run"
+                raise ValueError(msg)
+            raise ValueError(f"Slack rejected the message: {result.get('error')}")
+        return result
+
+    async def send_message(self):
+        self._post_stats = {"posts": 0, "retries": 0, "spooled": 0}
+        if preaa_tracing is None:
+            return await self._send_message()
+        with preaa_tracing.span("slack.send_message", fire_and_forget=bool(self.fire_and_forget)) as span:
+            result = await self._send_message()
+            if span:  # falsy when this call is not sampled
+                # In fire-and-forget mode the posts happen after the span ends, so only the handoff is timed.
+                span.set(
+                    ok=result.get("ok", result.get("status") == "queued"),
+                    error=result.get("error"),
+                    auth_cache_hit=getattr(self, "_auth_cache_hit", None),
+                    **self._post_stats,
+                )
+            return result
+
+    async def _send_message(self):
+        # Fan-out is a mode of this output rather than a second output: LangFlow runs every
+        # output of a node without outgoing edges, which would post the summary twice.
+        if targets := self._fan_out_targets():
+            return await self._send_fan_out(targets)
+        if not self.channel:
+            raise ValueError("Channel is required to send a single message")
+
+        coro = self._send_single(self.channel, self._message_text())
+        if self.fire_and_forget:
+            handle = self._dispatch(coro, channel=self.channel)
+            self.status = f"Queued message to {self.channel} (delivery {handle['delivery_id']})"
+            return handle
+
+        result = await self._run_on_delivery_loop(coro)
         self.status = f"Sent message as {self.username or 'User'} to {self.channel}"
-        self.log(f"[DEBUG] Slack response: {json.dumps(res.json(), indent=2)}")
-        return res.json()
+        return result
+
+    def _fan_out_targets(self) -> list[tuple[str, str]]:
+        targets = []
+        default_text = self._message_text()
+        rows = self.channel_messages or []
+        for row in rows if isinstance(rows, list) else [rows]:
+            data = row.data if hasattr(row, "data") else row
+            channel = str(data.get("channel") or "").strip()
+            if channel:
+                targets.append((channel, data.get("text") or data.get("message") or default_text))
+        for channel in self.channels or []:
+            if channel and channel.strip():
+                targets.append((channel.strip(), default_text))
+        return targets
+
+    async def _fan_out(self, targets: list[tuple[str, str]]) -> list[dict]:
+        await self.verify_token()
+        channel_ids = await self.resolve_channel_ids([channel for channel, _ in targets])
+
+        spool = await self._spool()
+        await self.drain_spool(spool)
+
+        # Posts to the same channel stay sequential to keep their order; distinct channels run
+        # in parallel, paced by the per-channel and workspace token buckets.
+        by_channel: dict[str, list[int]] = {}
+        for index, (channel, _) in enumerate(targets):
+            by_channel.setdefault(channel_ids[channel], []).append(index)
+
+        results: list[dict | None] = [None] * len(targets)
+        semaphore = asyncio.Semaphore(max(1, int(self.max_concurrency or 1)))
+
+        async def post_channel(channel_id: str, indexes: list[int]) -> None:
+            async with semaphore:
+                for index in indexes:
+                    channel, text = targets[index]
+                    try:
+                        response = await self._post(channel_id, text, spool)
+                    except Exception as e:  # one failing channel must not sink the rest
+                        response = {"ok": False, "error": str(e)}
+                    results[index] = {
+                        "channel": channel,
+                        "channel_id": channel_id,
+                        "ok": bool(response.get("ok")),
+                        "ts": response.get("ts"),
+                        "error": response.get("error"),
+                        "spooled": bool(response.get("spooled")),
+                        "messages": 1 + len(response.get("replies", [])),
+                    }
+
+        await asyncio.gather(*(post_channel(cid, idx) for cid, idx in by_channel.items()))
+        return results
+
+    async def _send_fan_out(self, targets: list[tuple[str, str]]) -> dict:
+        """Post to many channels concurrently; ``results`` has one entry per channel."""
+        if self.fire_and_forget:
+            handle = self._dispatch(self._fan_out(targets), channels=len(targets))
+            self.status = f"Queued {len(targets)} messages (delivery {handle['delivery_id']})"
+            return handle
+
+        results = await self._run_on_delivery_loop(self._fan_out(targets))
+        sent = sum(1 for row in results if row["ok"])
+        self.status = f"Sent {sent}/{len(results)} messages as {self.username or 'User'}"
+        errors = sorted({row["error"] for row in results if row["error"]})
+        return {"ok": sent == len(results), "error": ", ".join(errors) or None, "results": results}
@@ -0,0 +1,255 @@
+from langflow.custom import Component
+from langflow.io import DataInput, HandleInput, IntInput, MessageTextInput, MultilineInput, StrInput, Output
+from langflow.schema import Data
+from langflow.schema.message import Message
+from contextlib import contextmanager
+from pathlib import Path
+import asyncio
+import hashlib
+import json
+import re
+import sqlite3
+import time
+
+DEFAULT_CACHE_PATH = "~/.cache/langflow/sprint-summary-cache.sqlite3"
+CACHE_TTL_SECONDS = 30 * 24 * 60 * 60
+
+# Group summaries reduced per LLM call; more than this are reduced in rounds.
+REDUCE_FAN_IN = 12
+
+DEFAULT_MAP_PROMPT = """You are summarizing part of a sprint for a Slack update.
+All tasks below share {group_by} = {group}.
+
+{tasks}
+
+Write 2-5 concise markdown bullets for this group: progress, blockers, overdue or high-priority items.
+Mention task names. Return only the bullets."""
+
+DEFAULT_REDUCE_PROMPT = """You are writing a sprint status summary for Slack.
+Request: {request}
+
+Summaries per {group_by}:
+
+{summaries}
+
+Combine them into one markdown report with a short heading, total counts, and one section per {group_by}.
+Keep it under 400 words. Do not invent tasks."""
+
+
+def fill_prompt(template: str, **values: str) -> str:
+    """Substitute ``{name}`` placeholders, leaving any other braces (e.g. JSON examples) as written."""
+    pattern = re.compile("|".join(re.escape(f"{{{name}}}") for name in values))
+    return pattern.sub(lambda match: values[match.group(0)[1:-1]], template)
+
+
+class SummaryCache:
+    """SQLite table of LLM summaries keyed by a hash of the model, prompt and input text.
+
+    The methods block; the summarizer calls them through ``asyncio.to_thread``.
+    """
+
+    def __init__(self, path: str):
+        self.path = Path(path).expanduser()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS summaries (key TEXT PRIMARY KEY, summary TEXT NOT NULL, created REAL)"
+            )
+            conn.execute("DELETE FROM summaries WHERE created < ?", (time.time() - CACHE_TTL_SECONDS,))
+
+    @contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    def get(self, key: str) -> str | None:
+        with self._connect() as conn:
+            row = conn.execute("SELECT summary FROM summaries WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def put(self, key: str, summary: str) -> None:
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO summaries (key, summary, created) VALUES (?, ?, ?)",
+                (key, summary, time.time()),
+            )
+
+
+class TaskGroupSummarizer(Component):
+    display_name = "Task Group Summarizer"
+    description = (
+        "Summarize tasks in groups (by assignee, status, project...) in parallel, then combine the group "
+        "summaries into one sprint report. Unchanged groups reuse their cached summary."
+    )
+    icon = "list-tree"
+
+    inputs = [
+        HandleInput(
+            name="llm",
+            display_name="Language Model",
+            info="Connect the Model output of a Language Model node.",
+            input_types=["LanguageModel"],
+            required=True,
+        ),
+        DataInput(
+            name="tasks",
+            display_name="Tasks",
+            info="One Data row per task, e.g. from the Notion Task Reader.",
+            is_list=True,
+            required=True,
+        ),
+        StrInput(
+            name="group_by",
+            display_name="Group By",
+            info="Task property to group on, e.g. Assignee, Status or Project.",
+            value="Assignee",
+        ),
+        MessageTextInput(
+            name="request",
+            display_name="Request",
+            info="The original user request, passed to the final summary prompt.",
+        ),
+        IntInput(
+            name="max_concurrency",
+            display_name="Max Concurrent Calls",
+            info="Group summaries requested from the model at the same time.",
+            value=4,
+            advanced=True,
+        ),
+        IntInput(
+            name="max_tasks_per_group",
+            display_name="Max Tasks per Call",
+            info="Larger groups are split into chunks of this size before summarizing.",
+            value=40,
+            advanced=True,
+        ),
+        MultilineInput(
+            name="map_prompt",
+            display_name="Group Prompt",
+            info="Prompt per group. Placeholders: {group_by}, {group}, {tasks}; other braces are kept as written.",
+            value=DEFAULT_MAP_PROMPT,
+            advanced=True,
+        ),
+        MultilineInput(
+            name="reduce_prompt",
+            display_name="Report Prompt",
+            info="Prompt that combines group summaries. Placeholders: {request}, {group_by}, {summaries}.",
+            value=DEFAULT_REDUCE_PROMPT,
+            advanced=True,
+        ),
+        StrInput(
+            name="cache_path",
+            display_name="Summary Cache Path",
+            info="SQLite file for cached group summaries. Leave empty to disable caching.",
+            value=DEFAULT_CACHE_PATH,
+            advanced=True,
+        ),
+    ]
+
+    outputs = [
+        Output(name="summary", display_name="Summary", method="summarize"),
+    ]
+
+    def _task_fields(self, row: Data) -> tuple[dict, str]:
+        data = row.data if isinstance(row, Data) else dict(row)
+        fields = data.get("properties") or data
+        text = data.get("text") or json.dumps(fields, sort_keys=True, default=str)
+        return fields, text
+
+    def group_tasks(self) -> dict[str, list[str]]:
+        """Map each group name to its task lines, in a stable order so hashes do not churn."""
+        groups: dict[str, list[str]] = {}
+        for row in self.tasks or []:
+            fields, text = self._task_fields(row)
+            value = fields.get(self.group_by)
+            if isinstance(value, list):
+                value = ", ".join(str(v) for v in value)
+            groups.setdefault(str(value) if value not in (None, "") else "Unassigned", []).append(text)
+        return {group: sorted(lines) for group, lines in sorted(groups.items())}
+
+    def _model_id(self) -> str:
+        for attr in ("model_name", "model", "model_id"):
+            value = getattr(self.llm, attr, None)
+            if isinstance(value, str) and value:
+                return f"{type(self.llm).__name__}:{value}"
+        return type(self.llm).__name__
+
+    def _cache_key(self, prompt: str) -> str:
+        return hashlib.sha256(f"{self._model_id()}\n{prompt}".encode()).hexdigest()
+
+    async def _complete(
+        self, prompt: str, cache: SummaryCache | None, semaphore: asyncio.Semaphore, stats: dict
+    ) -> str:
+        key = self._cache_key(prompt)
+        if cache and (cached := await asyncio.to_thread(cache.get, key)) is not None:
+            stats["cached"] += 1
+            return cached
+        async with semaphore:
+            response = await self.llm.ainvoke(prompt)
+        text = getattr(response, "content", response)
+        text = text if isinstance(text, str) else str(text)
+        stats["calls"] += 1
+        if cache:
+            await asyncio.to_thread(cache.put, key, text)
+        return text
+
+    async def summarize(self) -> Message:
+        groups = self.group_tasks()
+        if not groups:
+            self.status = "No tasks to summarize"
+            return Message(text="No tasks matched the request.")
+
+        cache = await asyncio.to_thread(SummaryCache, self.cache_path) if self.cache_path else None
+        semaphore = asyncio.Semaphore(max(1, int(self.max_concurrency or 1)))
+        chunk = max(1, int(self.max_tasks_per_group or 1))
+        stats = {"cached": 0, "calls": 0}
+
+        labels, prompts = [], []
+        for group, lines in groups.items():
+            for start in range(0, len(lines), chunk):
+                part = f" (part {start // chunk + 1})" if len(lines) > chunk else ""
+                labels.append(f"{group}{part} - {len(lines[start:start + chunk])} tasks")
+                prompts.append(
+                    fill_prompt(
+                        self.map_prompt,
+                        group_by=self.group_by,
+                        group=group,
+                        tasks="\n".join(f"- {line}" for line in lines[start:start + chunk]),
+                    )
+                )
+        summaries = await asyncio.gather(*(self._complete(p, cache, semaphore, stats) for p in prompts))
+        sections = [f"### {label}\n{summary.strip()}" for label, summary in zip(labels, summaries)]
+
+        # Reduce in rounds so a sprint with many assignees never overflows one prompt.
+        while True:
+            batches = [sections[i:i + REDUCE_FAN_IN] for i in range(0, len(sections), REDUCE_FAN_IN)]
+            reduced = await asyncio.gather(
+                *(
+                    self._complete(
+                        fill_prompt(
+                            self.reduce_prompt,
+                            request=self.request or "Sprint status summary",
+                            group_by=self.group_by,
+                            summaries="\n\n".join(batch),
+                        ),
+                        cache,
+                        semaphore,
+                        stats,
+                    )
+                    for batch in batches
+                )
+            )
+            if len(reduced) == 1:
+                report = reduced[0]
+                break
+            sections = list(reduced)
+
+        task_count = sum(len(lines) for lines in groups.values())
+        self.status = (
+            f"{task_count} tasks in {len(groups)} groups: {stats['calls']} model calls, {stats['cached']} cached"
+        )
+        return Message(text=report)
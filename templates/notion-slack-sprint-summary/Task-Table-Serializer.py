@@ -0,0 +1,179 @@
+from langflow.custom import Component
+from langflow.io import DataInput, IntInput, StrInput, Output
+from langflow.schema import Data
+from langflow.schema.message import Message
+import json
+import string
+
+try:
+    import tiktoken
+except ImportError:  # fall back to a character estimate
+    tiktoken = None
+
+DEFAULT_ENCODING = "o200k_base"
+# Rough characters per token for English/JSON when tiktoken is not installed.
+CHARS_PER_TOKEN = 4
+# Page fields that identify or decorate a page rather than describe the task. They are left out
+# unless named in Columns.
+PAGE_METADATA_KEYS = {"text", "id", "url", "public_url", "object", "parent", "archived", "in_trash", "icon", "cover"}
+
+
+def make_token_counter(encoding_name: str):
+    """Return a token-counting function and whether its counts are exact.
+
+    Counts are exact with tiktoken. Without it, or when the encoding cannot be loaded (unknown
+    name, or no network to download it), tokens are estimated from the character count.
+    """
+    if tiktoken is not None:
+        try:
+            encoding = tiktoken.get_encoding(encoding_name)
+            return lambda text: len(encoding.encode(text, disallowed_special=())), True
+        except Exception:
+            pass
+    return lambda text: -(-len(text) // CHARS_PER_TOKEN), False
+
+
+def code_prefix(column: str, used: set[str]) -> str:
+    """A letters-only code prefix for ``column`` that no other column in ``used`` has.
+
+    Codes are a prefix followed by digits, so distinct letter prefixes give distinct codes.
+    """
+    letters = "".join(ch for ch in column.upper() if ch in string.ascii_uppercase) or "V"
+    candidates = [letters[:n] for n in range(1, len(letters) + 1)]
+    candidates += [f"{letters}{suffix}" for suffix in string.ascii_uppercase]
+    return next(prefix for prefix in candidates if prefix not in used)
+
+
+def cell_text(value) -> str:
+    """Flatten a task property (plain or raw Notion property JSON) into one line of text."""
+    if value is None:
+        return ""
+    if isinstance(value, dict):
+        if "type" in value and value["type"] in value:
+            return cell_text(value[value["type"]])
+        for key in ("name", "plain_text", "start", "content"):
+            if key in value:
+                return cell_text(value[key])
+        return json.dumps(value, separators=(",", ":"), default=str)
+    if isinstance(value, list):
+        return ", ".join(text for text in (cell_text(item) for item in value) if text)
+    return " ".join(str(value).split())
+
+
+class TaskTableSerializer(Component):
+    display_name = "Task Table Serializer"
+    description = (
+        "Turn task rows into a compact pipe-separated table for an LLM prompt: column names once, one line per "
+        "task, long fields truncated and repeated long values replaced by short codes."
+    )
+    icon = "table"
+
+    inputs = [
+        DataInput(
+            name="tasks",
+            display_name="Tasks",
+            info="Task rows from the Notion Task Reader or Notion List Pages.",
+            is_list=True,
+            required=True,
+        ),
+        StrInput(
+            name="columns",
+            display_name="Columns",
+            info="Properties to include, in order. Leave empty to include every non-empty property.",
+            is_list=True,
+        ),
+        IntInput(
+            name="max_field_chars",
+            display_name="Max Field Length",
+            info="Longer values are cut and end with '…'.",
+            value=80,
+        ),
+        IntInput(
+            name="max_enum_values",
+            display_name="Max Codes per Column",
+            info="Columns with at most this many distinct values may use short codes with a legend.",
+            value=12,
+            advanced=True,
+        ),
+        StrInput(
+            name="encoding_name",
+            display_name="Tokenizer",
+            info="tiktoken encoding used for the token report. Without tiktoken, tokens are estimated.",
+            value=DEFAULT_ENCODING,
+            advanced=True,
+        ),
+    ]
+
+    outputs = [
+        Output(name="table", display_name="Table", method="build_table"),
+    ]
+
+    def _records(self) -> list[dict]:
+        records = []
+        for row in self.tasks or []:
+            data = row.data if isinstance(row, Data) else dict(row)
+            records.append(data.get("properties") or {k: v for k, v in data.items() if k != "text"})
+        return records
+
+    def _truncate(self, text: str) -> str:
+        limit = max(int(self.max_field_chars or 0), 0)
+        text = text.replace("|", "/")
+        return text if not limit or len(text) <= limit else text[: limit - 1].rstrip() + "…"
+
+    def _encode_enums(self, header: list[str], rows: list[list[str]], count) -> list[str]:
+        """Replace repeated values with codes where that saves tokens; return the legend lines."""
+        legend = []
+        used_prefixes: set[str] = set()
+        for index, column in enumerate(header):
+            values = [row[index] for row in rows if row[index]]
+            distinct = sorted(set(values))
+            if not 1 < len(distinct) <= int(self.max_enum_values or 0) or len(distinct) == len(values):
+                continue
+            prefix = code_prefix(column, used_prefixes)
+            codes = {value: f"{prefix}{n}" for n, value in enumerate(distinct, 1)}
+            entries = ", ".join(f"{code}={value}" for value, code in codes.items())
+            line = f"{column}: {entries}"
+            plain = sum(count(value) for value in values)
+            coded = sum(count(codes[value]) for value in values) + count(line)
+            if coded >= plain:
+                continue
+            legend.append(line)
+            used_prefixes.add(prefix)
+            for row in rows:
+                if row[index]:
+                    row[index] = codes[row[index]]
+        return legend
+
+    def build_table(self) -> Message:
+        records = self._records()
+        count, exact = make_token_counter(self.encoding_name or DEFAULT_ENCODING)
+        # The verbose form the ParserComponent stringifies today, for the before/after report.
+        verbose = [
+            json.dumps(row.data if isinstance(row, Data) else row, indent=2, default=str) for row in self.tasks or []
+        ]
+        before = count("\n".join(verbose))
+
+        columns = [c.strip() for c in self.columns or [] if c and c.strip()]
+        if not columns:
+            for record in records:
+                columns.extend(key for key in record if key not in columns and key not in PAGE_METADATA_KEYS)
+
+        rows = [[self._truncate(cell_text(record.get(column))) for column in columns] for record in records]
+        header = [column for index, column in enumerate(columns) if any(row[index] for row in rows)]
+        keep = [columns.index(column) for column in header]
+        rows = [[row[index] for index in keep] for row in rows]
+
+        legend = self._encode_enums(header, rows, count)
+        lines = [f"{len(rows)} tasks"]
+        if legend:
+            lines.append("Codes: " + "; ".join(legend))
+        lines.append(" | ".join(header))
+        lines.extend(" | ".join(row) for row in rows)
+        table = "\n".join(lines)
+
+        after = count(table)
+        ratio = before / after if after else 0
+        estimated = "" if exact else " (estimated)"
+        self.status = f"{len(rows)} tasks: {before:,} → {after:,} tokens{estimated}, {ratio:.1f}× smaller"
+        self.log(self.status)
+        return Message(text=table)
@@ -1,14 +1,337 @@
+import asyncio
+import copy
+import hashlib
 import json
+import sqlite3
+import sys
+import threading
+import time
+import weakref
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from pathlib import Path
 import httpx
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Dict, List, Optional, Tuple, Union
 from langflow.base.models.model import LCModelComponent
 from langflow.field_typing import Text
 from langflow.field_typing.range_spec import RangeSpec
-from langflow.io import BoolInput, DropdownInput, FloatInput, IntInput, SecretStrInput, SliderInput, MessageTextInput, Output, MessageInput
+from langflow.logging import logger
+from langflow.io import (
+    BoolInput, DropdownInput, FloatInput, IntInput, SecretStrInput, SliderInput, MessageTextInput, StrInput, Output,
+    MessageInput,
+)
 from langflow.schema.message import Message
 from langflow.schema import Data
 import re
 
+try:
+    import preaa_http  # shared pooled transport (templates/shared-http-transport), if installed
+except ImportError:
+    preaa_http = None
+
+try:
+    import preaa_tracing  # LangFuse spans (templates/shared-langfuse-tracing), if installed
+except ImportError:
+    preaa_tracing = None
+
+PERPLEXITY_API_URL = "https://api.perplexity.ai/chat/completions"
+REQUEST_TIMEOUT = httpx.Timeout(60.0, connect=5.0)
+# How long a call waits for an identical in-flight request before sending its own.
+FLIGHT_WAIT_SECONDS = REQUEST_TIMEOUT.read
+
+# LangFlow builds a fresh component per run, so the client (and its connection pool) lives at
+# module level; opening a client per call paid a new TCP and TLS handshake every time.
+_client: Optional[httpx.Client] = None
+_client_lock = threading.Lock()
+
+
+def get_client() -> httpx.Client:
+    """Return the shared Perplexity client, creating it on first use."""
+    global _client
+    with _client_lock:
+        if _client is None:
+            if preaa_http is not None:
+                _client = preaa_http.client(timeout=REQUEST_TIMEOUT)
+            else:
+                _client = httpx.Client(timeout=REQUEST_TIMEOUT)
+        return _client
+
+
+# An async client's connections belong to the event loop that opened them, so keep one per loop.
+_async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = weakref.WeakKeyDictionary()
+
+
+def get_async_client() -> httpx.AsyncClient:
+    """Return the Perplexity async client for the running event loop, creating it on first use."""
+    loop = asyncio.get_running_loop()
+    with _client_lock:
+        client = _async_clients.get(loop)
+        if client is None:
+            if preaa_http is not None:
+                client = preaa_http.async_client(timeout=REQUEST_TIMEOUT)
+            else:
+                client = httpx.AsyncClient(timeout=REQUEST_TIMEOUT)
+            _async_clients[loop] = client
+        return client
+
+
+class _Flight(Future):
+    """One upstream request shared by every concurrent call with the same payload."""
+
+    def __init__(self):
+        super().__init__()
+        self.followers = 0
+        # Set by the leader once admitted, so waiting calls report the model that answered.
+        self.model: Optional[str] = None
+        self.downgraded_from: Optional[str] = None
+        # A running future cannot be cancelled, so a waiter that gives up does not cancel it
+        # for the others.
+        self.set_running_or_notify_cancel()
+
+
+# Single-flight: while a request is in flight, calls with the same normalized payload, API key
+# and admission settings wait for its result instead of sending their own. Nothing is kept after
+# it lands.
+_flights: Dict[str, _Flight] = {}
+_flights_lock = threading.Lock()
+_flight_stats = {"requests": 0, "coalesced": 0}
+
+
+def flight_key(api_key: str, payload: Dict, admission: Optional[Dict] = None) -> str:
+    """Key identical requests by API key, payload and admission settings.
+
+    Key order and whitespace runs in messages are ignored. ``admission`` holds the budget scopes
+    and limits the leader is admitted under; a follower is never checked against its own, so
+    only calls that would be admitted the same way may share a request.
+    """
+    messages = [
+        {**message, "content": " ".join(str(message.get("content", "")).split())}
+        for message in payload.get("messages", [])
+    ]
+    canonical = json.dumps(
+        {"payload": {**payload, "messages": messages}, "admission": admission or {}},
+        sort_keys=True,
+        separators=(",", ":"),
+        default=str,
+    )
+    return hashlib.sha256(f"{api_key}\0{canonical}".encode()).hexdigest()
+
+
+def _join_flight(key: str) -> Tuple[_Flight, bool]:
+    """Return the flight for ``key`` and whether the caller leads it (and must send the request)."""
+    with _flights_lock:
+        flight = _flights.get(key)
+        if flight is not None:
+            flight.followers += 1
+            _flight_stats["coalesced"] += 1
+            return flight, False
+        flight = _flights[key] = _Flight()
+        _flight_stats["requests"] += 1
+        return flight, True
+
+
+def _land_flight(
+    key: str, flight: _Flight, result: Optional[Dict] = None, error: Optional[BaseException] = None
+) -> None:
+    with _flights_lock:
+        _flights.pop(key, None)
+    if error is None:
+        flight.set_result(result)
+    elif isinstance(error, Exception):
+        flight.set_exception(error)
+    else:  # the leader was cancelled or interrupted; its followers still need an answer
+        flight.set_exception(ValueError("Perplexity request was cancelled by the call that sent it"))
+
+
+def _follower_result(flight: _Flight) -> Dict:
+    """The leader's response for a waiting caller; each gets its own copy to format."""
+    error = flight.exception()
+    if error is not None:
+        raise ValueError(str(error))
+    return copy.deepcopy(flight.result())
+
+
+def coalescing_stats() -> Dict[str, int]:
+    """Upstream requests sent, and calls that shared another call's request instead of sending one."""
+    with _flights_lock:
+        return dict(_flight_stats)
+
+
+# USD per million input / output tokens and per request (low search context), from Perplexity's
+# pricing page. Budgets only need the right order of magnitude; update when prices change.
+MODEL_PRICES = {
+    "sonar": (1.0, 1.0, 0.005),
+    "sonar-pro": (3.0, 15.0, 0.006),
+    "sonar-reasoning": (1.0, 5.0, 0.005),
+}
+# Cheaper model used instead when a cost budget cannot cover the requested one.
+DOWNGRADES = {"sonar-pro": "sonar", "sonar-reasoning": "sonar"}
+
+# Spend per flow and per API key is recorded here, shared by every process using the file.
+DEFAULT_BUDGET_PATH = "~/.cache/langflow/perplexity-budget.sqlite3"
+# Spend older than this is pruned, so no budget window may be longer.
+BUDGET_RETENTION_SECONDS = 31 * 24 * 3600
+MAX_BUDGET_WINDOW_HOURS = BUDGET_RETENTION_SECONDS // 3600
+# Rough prompt-size estimate: three characters per token errs high for English text, plus a
+# few tokens of framing per message.
+CHARS_PER_TOKEN = 3
+TOKENS_PER_MESSAGE = 4
+
+
+def estimate_prompt_tokens(messages: List[Dict]) -> int:
+    """Estimate prompt tokens before sending; no tokenizer needed."""
+    return sum(-(-len(str(m.get("content", ""))) // CHARS_PER_TOKEN) + TOKENS_PER_MESSAGE for m in messages)
+
+
+def estimate_cost(model: str, input_tokens: int, output_tokens: int) -> float:
+    """USD for one request; unknown models are priced as the most expensive one."""
+    input_price, output_price, request_price = MODEL_PRICES.get(model, MODEL_PRICES["sonar-pro"])
+    return (input_tokens * input_price + output_tokens * output_price) / 1_000_000 + request_price
+
+
+@dataclass
+class Budget:
+    """Spending limit for one scope over the budget window; 0 means no limit."""
+
+    scope: str
+    label: str
+    tokens: int = 0
+    cost: float = 0.0
+
+
+class BudgetStore:
+    """SQLite ledger of Perplexity spend per scope (a flow or a hashed API key).
+
+    A request reserves its worst-case estimate when admitted and is settled with the actual
+    usage afterwards, so concurrent calls and other processes see each other's spend.
+    """
+
+    def __init__(self, path: str):
+        self.path = Path(path).expanduser()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS spend (id INTEGER PRIMARY KEY, scope TEXT NOT NULL, "
+                "created REAL NOT NULL, tokens INTEGER NOT NULL, cost REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS spend_scope ON spend (scope, created)")
+
+    @contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    def reserve(
+        self, budgets: List[Budget], tokens: int, costs: List[Tuple[str, float]], window_seconds: float
+    ) -> Tuple[str, List[int]]:
+        """Record ``tokens`` against every budget with the first (model, cost) option that fits them all.
+
+        Returns the chosen model and the reservation IDs; raises ValueError naming the
+        exhausted budget when no option fits.
+        """
+        now = time.time()
+        with self._connect() as conn:
+            # IMMEDIATE takes the write lock up front, so check-and-reserve is atomic across processes.
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                retention = max(BUDGET_RETENTION_SECONDS, window_seconds)
+                conn.execute("DELETE FROM spend WHERE created < ?", (now - retention,))
+                used = {
+                    budget.scope: conn.execute(
+                        "SELECT COALESCE(SUM(tokens), 0), COALESCE(SUM(cost), 0) FROM spend "
+                        "WHERE scope = ? AND created >= ?",
+                        (budget.scope, now - window_seconds),
+                    ).fetchone()
+                    for budget in budgets
+                }
+                for budget in budgets:
+                    used_tokens = used[budget.scope][0]
+                    if budget.tokens and used_tokens + tokens > budget.tokens:
+                        raise ValueError(
+                            f"Perplexity token budget for {budget.label} is exhausted: {used_tokens:,} of "
+                            f"{budget.tokens:,} tokens used, and this request may use up to {tokens:,}"
+                        )
+                for model, cost in costs:
+                    if all(not b.cost or used[b.scope][1] + cost <= b.cost for b in budgets):
+                        ids = [
+                            conn.execute(
+                                "INSERT INTO spend (scope, created, tokens, cost) VALUES (?, ?, ?, ?)",
+                                (budget.scope, now, tokens, cost),
+                            ).lastrowid
+                            for budget in budgets
+                        ]
+                        conn.execute("COMMIT")
+                        return model, ids
+                model, cost = costs[-1]
+                budget = next(b for b in budgets if b.cost and used[b.scope][1] + cost > b.cost)
+                raise ValueError(
+                    f"Perplexity cost budget for {budget.label} is exhausted: ${used[budget.scope][1]:.4f} of "
+                    f"${budget.cost:.4f} used, and this request may cost up to ${cost:.4f} with {model}"
+                )
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+
+    def settle(self, ids: List[int], tokens: int, cost: float) -> None:
+        """Replace the reserved estimate with what the request actually used."""
+        with self._connect() as conn:
+            conn.executemany("UPDATE spend SET tokens = ?, cost = ? WHERE id = ?", [(tokens, cost, i) for i in ids])
+
+    def release(self, ids: List[int]) -> None:
+        """Drop a reservation whose request was never sent or failed."""
+        with self._connect() as conn:
+            conn.executemany("DELETE FROM spend WHERE id = ?", [(i,) for i in ids])
+
+    def used(self, scope: str, window_seconds: float) -> Tuple[int, float]:
+        with self._connect() as conn:
+            return conn.execute(
+                "SELECT COALESCE(SUM(tokens), 0), COALESCE(SUM(cost), 0) FROM spend WHERE scope = ? AND created >= ?",
+                (scope, time.time() - window_seconds),
+            ).fetchone()
+
+
+_budget_stores: Dict[str, BudgetStore] = {}
+_budget_stores_lock = threading.Lock()
+
+
+def get_budget_store(path: str) -> BudgetStore:
+    """One store per file, created on first use."""
+    with _budget_stores_lock:
+        store = _budget_stores.get(path)
+        if store is None:
+            store = _budget_stores[path] = BudgetStore(path)
+        return store
+
+
+class Citation:
+    """One source of an answer. ``index`` is its [n] marker in the text; URLs are interned, so a
+    source cited by many answers is held once per process."""
+
+    __slots__ = ("index", "url", "title")
+
+    def __init__(self, index: int, url: str = "", title: Optional[str] = None):
+        self.index = index
+        self.url = sys.intern(url) if url else ""
+        self.title = title or None
+
+    @classmethod
+    def from_api(cls, index: int, raw: Any) -> "Citation":
+        """Accept the API's URL strings as well as dicts with url/link and title/name/snippet."""
+        if isinstance(raw, dict):
+            url = raw.get('url', '') or raw.get('link', '')
+            return cls(index, str(url), raw.get('title', '') or raw.get('name', '') or raw.get('snippet', ''))
+        if isinstance(raw, str):
+            return cls(index, raw)
+        return cls(index, title=str(raw))
+
+    def __repr__(self) -> str:
+        return f"Citation({self.index}, {self.url!r})"
+
 
 class PerplexityComponent(LCModelComponent):
     display_name = "Perplexity Direct API"
@@ -156,6 +479,93 @@ class PerplexityComponent(LCModelComponent):
             value=False,
             advanced=True,
         ),
+        BoolInput(
+            name="coalesce_requests",
+            display_name="Share Identical Concurrent Requests",
+            info=(
+                "Calls with the same prompt and settings made while one is in flight share its response instead of "
+                "sending their own"
+            ),
+            value=True,
+            advanced=True,
+        ),
+        IntInput(
+            name="max_prompt_tokens",
+            display_name="Max Prompt Tokens",
+            info="Reject prompts estimated above this many tokens before calling the API (0 for no limit)",
+            advanced=True,
+            value=0,
+        ),
+        StrInput(
+            name="budget_name",
+            display_name="Budget Name",
+            info="Name of the flow budget this component spends from; defaults to the flow ID",
+            advanced=True,
+            value="",
+        ),
+        IntInput(
+            name="flow_token_budget",
+            display_name="Flow Token Budget",
+            info="Tokens this flow may use per budget window (0 for no limit)",
+            advanced=True,
+            value=0,
+        ),
+        FloatInput(
+            name="flow_cost_budget",
+            display_name="Flow Cost Budget (USD)",
+            info="Estimated spend this flow may reach per budget window (0 for no limit)",
+            advanced=True,
+            value=0.0,
+        ),
+        IntInput(
+            name="key_token_budget",
+            display_name="API Key Token Budget",
+            info="Tokens all flows using this API key may use per budget window (0 for no limit)",
+            advanced=True,
+            value=0,
+        ),
+        FloatInput(
+            name="key_cost_budget",
+            display_name="API Key Cost Budget (USD)",
+            info="Estimated spend all flows using this API key may reach per budget window (0 for no limit)",
+            advanced=True,
+            value=0.0,
+        ),
+        IntInput(
+            name="budget_window_hours",
+            display_name="Budget Window (hours)",
+            info=f"Budgets count spend over this many past hours (at most {MAX_BUDGET_WINDOW_HOURS})",
+            advanced=True,
+            value=24,
+        ),
+        DropdownInput(
+            name="budget_action",
+            display_name="When Cost Budget Is Short",
+            info=(
+                "Downgrade switches sonar-pro and sonar-reasoning to sonar if that fits the cost budget; reject fails "
+                "the call. A short token budget always fails the call, since a cheaper model uses as many tokens"
+            ),
+            advanced=True,
+            options=["downgrade", "reject"],
+            value="downgrade",
+        ),
+        BoolInput(
+            name="compact_metadata",
+            display_name="Compact Message Metadata",
+            info=(
+                "Store only model, citation URLs, token counts and response ID with the message; images, related "
+                "questions and filter settings stay out of chat history"
+            ),
+            value=False,
+            advanced=True,
+        ),
+        StrInput(
+            name="budget_path",
+            display_name="Budget Store Path",
+            info="SQLite file recording spend, shared by processes on this host",
+            advanced=True,
+            value=DEFAULT_BUDGET_PATH,
+        ),
     ]
     
     outputs = [
@@ -195,15 +605,242 @@ class PerplexityComponent(LCModelComponent):
         return domains
     
     def call_perplexity_api(self, messages: List[Dict], **kwargs) -> Dict:
-        """Make a direct API call to Perplexity."""
-        api_key = self.api_key
-        
-        # Prepare the API request
-        headers = {
-            "Authorization": f"Bearer {api_key}",
+        """Make a direct API call to Perplexity, within the configured budgets."""
+        return self._send(self.build_payload(messages))
+
+    async def acall_perplexity_api(self, messages: List[Dict], **kwargs) -> Dict:
+        """Async ``call_perplexity_api``; the budget store is used from a worker thread."""
+        return await self._asend(self.build_payload(messages))
+
+    def _budgets(self) -> List[Budget]:
+        budgets = []
+        flow_tokens = int(getattr(self, "flow_token_budget", 0) or 0)
+        flow_cost = float(getattr(self, "flow_cost_budget", 0) or 0)
+        if flow_tokens or flow_cost:
+            name = self._budget_name()
+            budgets.append(Budget(f"flow:{name}", f"flow '{name}'", flow_tokens, flow_cost))
+        key_tokens = int(getattr(self, "key_token_budget", 0) or 0)
+        key_cost = float(getattr(self, "key_cost_budget", 0) or 0)
+        if key_tokens or key_cost:
+            # Only a hash of the key is stored.
+            key_hash = hashlib.sha256(str(self.api_key).encode()).hexdigest()[:16]
+            budgets.append(Budget(f"key:{key_hash}", "this API key", key_tokens, key_cost))
+        return budgets
+
+    def _budget_name(self) -> str:
+        name = (getattr(self, "budget_name", "") or "").strip()
+        if not name:
+            try:
+                name = str(self.graph.flow_id or "")
+            except Exception:  # not running inside a flow
+                name = ""
+        return name or "default"
+
+    def _admission(self) -> Dict:
+        """The settings ``_admit`` checks a request against, for ``flight_key``."""
+        budget_path = getattr(self, "budget_path", "") or ""
+        return {
+            "max_prompt_tokens": int(getattr(self, "max_prompt_tokens", 0) or 0),
+            "budgets": [asdict(budget) for budget in self._budgets()] if budget_path else [],
+            "budget_action": getattr(self, "budget_action", "downgrade"),
+            "budget_window_hours": float(getattr(self, "budget_window_hours", 24) or 24),
+            "budget_path": budget_path,
+        }
+
+    def _admit(self, payload: Dict) -> Optional[Tuple[BudgetStore, List[int]]]:
+        """Pre-flight checks: prompt size, then token and cost budgets. May downgrade ``payload["model"]``.
+
+        Returns the budget reservation to settle once the request is done, or None without budgets.
+        """
+        prompt_tokens = estimate_prompt_tokens(payload["messages"])
+        self._estimated_prompt_tokens, self._model_used, self._downgraded_from = prompt_tokens, payload["model"], None
+        max_prompt_tokens = int(getattr(self, "max_prompt_tokens", 0) or 0)
+        if max_prompt_tokens and prompt_tokens > max_prompt_tokens:
+            raise ValueError(
+                f"Prompt is too long: about {prompt_tokens:,} tokens, over the limit of {max_prompt_tokens:,}"
+            )
+        budgets = self._budgets() if getattr(self, "budget_path", "") else []
+        if not budgets:
+            return None
+        # Reserve the worst case: the whole prompt plus a full-length answer.
+        output_tokens = payload.get("max_tokens", 1024)
+        model = payload["model"]
+        models = [model]
+        if getattr(self, "budget_action", "downgrade") == "downgrade" and model in DOWNGRADES:
+            models.append(DOWNGRADES[model])
+        costs = [(m, estimate_cost(m, prompt_tokens, output_tokens)) for m in models]
+        window_hours = float(getattr(self, "budget_window_hours", 24) or 24)
+        if window_hours > MAX_BUDGET_WINDOW_HOURS:
+            raise ValueError(
+                f"Budget window of {window_hours:g} hours is longer than the {MAX_BUDGET_WINDOW_HOURS} hours of spend "
+                "kept in the budget store"
+            )
+        window = max(window_hours, 1 / 60) * 3600
+        store = get_budget_store(self.budget_path)
+        chosen, ids = store.reserve(budgets, prompt_tokens + output_tokens, costs, window)
+        if chosen != model:
+            logger.info(f"Perplexity cost budget is short; downgraded {model} to {chosen}")
+            payload["model"], self._model_used, self._downgraded_from = chosen, chosen, model
+        return store, ids
+
+    def _settle(self, reservation: Optional[Tuple[BudgetStore, List[int]]], payload: Dict, result: Dict) -> None:
+        if reservation is None:
+            return
+        store, ids = reservation
+        usage = result.get("usage") or {}
+        input_tokens, output_tokens = usage.get("prompt_tokens") or 0, usage.get("completion_tokens") or 0
+        cost = (usage.get("cost") or {}).get("total_cost")
+        if cost is None:
+            cost = estimate_cost(payload["model"], input_tokens, output_tokens)
+        store.settle(ids, input_tokens + output_tokens, cost)
+
+    def _release(self, reservation: Optional[Tuple[BudgetStore, List[int]]]) -> None:
+        if reservation is not None:
+            reservation[0].release(reservation[1])
+
+    def _admitted_post(self, payload: Dict) -> Dict:
+        """Admit ``payload`` against the budgets, send it, and settle the reservation."""
+        reservation = self._admit(payload)
+        try:
+            result = self._post(payload)
+        except BaseException:
+            self._release(reservation)
+            raise
+        self._settle(reservation, payload, result)
+        return result
+
+    async def _admitted_apost(self, payload: Dict) -> Dict:
+        """Async ``_admitted_post``; the budget store is used from a worker thread."""
+        reservation = await asyncio.to_thread(self._admit, payload)
+        try:
+            result = await self._apost(payload)
+        except BaseException:
+            await asyncio.to_thread(self._release, reservation)
+            raise
+        await asyncio.to_thread(self._settle, reservation, payload, result)
+        return result
+
+    def _follow(self, flight: _Flight, payload: Dict) -> Dict:
+        """Take the shared response; this call sent nothing, so it reserves and spends no budget."""
+        self._coalesced, self._attempts, self._shared_with = True, 0, 0
+        self._estimated_prompt_tokens = estimate_prompt_tokens(payload["messages"])
+        self._model_used, self._downgraded_from = flight.model or payload["model"], flight.downgraded_from
+        return _follower_result(flight)
+
+    def _lead(self, key: str, flight: _Flight, result: Dict) -> Dict:
+        flight.model, flight.downgraded_from = self._model_used, self._downgraded_from
+        _land_flight(key, flight, result=result)
+        self._coalesced, self._shared_with = False, flight.followers
+        return result
+
+    def _send(self, payload: Dict) -> Dict:
+        """Send ``payload``; identical concurrent calls share one request.
+
+        The flight is joined before admission, so only the call that sends the request is
+        checked against and charged to the budgets.
+        """
+        if not getattr(self, "coalesce_requests", True):
+            self._coalesced, self._shared_with = False, 0
+            return self._admitted_post(payload)
+        key = flight_key(self.api_key, payload, self._admission())
+        flight, leader = _join_flight(key)
+        if not leader:
+            logger.debug("Sharing an identical in-flight Perplexity request")
+            try:
+                flight.exception(timeout=FLIGHT_WAIT_SECONDS)
+            except FutureTimeoutError:
+                logger.debug(
+                    f"Shared Perplexity request still running after {FLIGHT_WAIT_SECONDS:.0f}s; sending this one"
+                )
+                self._coalesced, self._shared_with = False, 0
+                return self._admitted_post(payload)
+            return self._follow(flight, payload)
+        try:
+            result = self._admitted_post(payload)
+        except BaseException as e:
+            _land_flight(key, flight, error=e)
+            raise
+        return self._lead(key, flight, result)
+
+    async def _asend(self, payload: Dict) -> Dict:
+        """Async ``_send``; shares requests with sync and async callers alike."""
+        if not getattr(self, "coalesce_requests", True):
+            self._coalesced, self._shared_with = False, 0
+            return await self._admitted_apost(payload)
+        key = flight_key(self.api_key, payload, self._admission())
+        flight, leader = _join_flight(key)
+        if not leader:
+            logger.debug("Sharing an identical in-flight Perplexity request")
+            try:
+                # The flight is already running, so timing out here does not cancel it for others.
+                await asyncio.wait_for(asyncio.wrap_future(flight), FLIGHT_WAIT_SECONDS)
+            except asyncio.TimeoutError:
+                logger.debug(
+                    f"Shared Perplexity request still running after {FLIGHT_WAIT_SECONDS:.0f}s; sending this one"
+                )
+                self._coalesced, self._shared_with = False, 0
+                return await self._admitted_apost(payload)
+            except Exception:
+                pass  # re-raised as ValueError by _follower_result
+            return self._follow(flight, payload)
+        try:
+            result = await self._admitted_apost(payload)
+        except BaseException as e:
+            _land_flight(key, flight, error=e)
+            raise
+        return self._lead(key, flight, result)
+
+    def _headers(self) -> Dict[str, str]:
+        return {
+            "Authorization": f"Bearer {self.api_key}",
             "Content-Type": "application/json"
         }
-        
+
+    def _post(self, payload: Dict) -> Dict:
+        try:
+            # Make the API request on the pooled client
+            response = get_client().post(PERPLEXITY_API_URL, headers=self._headers(), json=payload)
+            return self._read_response(response)
+        except httpx.HTTPError as e:
+            raise self._api_error(e)
+        except Exception as e:
+            raise ValueError(f"Error calling Perplexity API: {str(e)}")
+
+    async def _apost(self, payload: Dict) -> Dict:
+        try:
+            response = await get_async_client().post(PERPLEXITY_API_URL, headers=self._headers(), json=payload)
+            return self._read_response(response)
+        except httpx.HTTPError as e:
+            raise self._api_error(e)
+        except Exception as e:
+            raise ValueError(f"Error calling Perplexity API: {str(e)}")
+
+    def _read_response(self, response: httpx.Response) -> Dict:
+        self._attempts = response.extensions.get(preaa_http.ATTEMPTS_EXTENSION, 1) if preaa_http else 1
+        response.raise_for_status()
+        result = response.json()
+
+        # Debug: Print citations if present
+        if 'citations' in result:
+            print(f"DEBUG: Found {len(result['citations'])} citations in API response")
+            # Print first citation structure to understand format
+            if result['citations']:
+                first_citation = result['citations'][0]
+                if isinstance(first_citation, dict):
+                    print(f"DEBUG: Citation format is dict with keys: {first_citation.keys()}")
+                else:
+                    print(f"DEBUG: Citation format is: {type(first_citation).__name__}")
+
+        return result
+
+    def _api_error(self, e: httpx.HTTPError) -> ValueError:
+        error_msg = f"Perplexity API error: {str(e)}"
+        if hasattr(e, 'response') and hasattr(e.response, 'text'):
+            error_msg += f" - Response: {e.response.text}"
+        return ValueError(error_msg)
+
+    def build_payload(self, messages: List[Dict]) -> Dict:
+        """Build the chat completion request body from the component settings."""
         # Build request payload with proper type conversion
         payload = {
             "model": self.model_name,
@@ -279,41 +916,12 @@ class PerplexityComponent(LCModelComponent):
         
         # Debug: Print the final payload (can be commented out in production)
         print(f"DEBUG: Sending payload to Perplexity API: {json.dumps(payload, indent=2)}")
-        
-        try:
-            # Make the API request
-            with httpx.Client() as client:
-                response = client.post(
-                    "https://api.perplexity.ai/chat/completions",
-                    headers=headers,
-                    json=payload,
-                    timeout=60.0
-                )
-                response.raise_for_status()
-                result = response.json()
-                
-                # Debug: Print citations if present
-                if 'citations' in result:
-                    print(f"DEBUG: Found {len(result['citations'])} citations in API response")
-                    # Print first citation structure to understand format
-                    if result['citations']:
-                        first_citation = result['citations'][0]
-                        if isinstance(first_citation, dict):
-                            print(f"DEBUG: Citation format is dict with keys: {first_citation.keys()}")
-                        else:
-                            print(f"DEBUG: Citation format is: {type(first_citation).__name__}")
-                    
-                return result
-        except httpx.HTTPError as e:
-            error_msg = f"Perplexity API error: {str(e)}"
-            if hasattr(e, 'response') and hasattr(e.response, 'text'):
-                error_msg += f" - Response: {e.response.text}"
-            raise ValueError(error_msg)
-        except Exception as e:
-            raise ValueError(f"Error calling Perplexity API: {str(e)}")
-    
-    def format_citations_as_markdown(self, content: str, citations: List[Any]) -> str:
-        """Format citations as clickable markdown links with page titles."""
+        return payload
+
+    def format_citations_as_markdown(
+        self, content: str, citations: List[Any], domain_filter: Optional[List[str]] = None
+    ) -> str:
+        """Format citations (``Citation`` objects or raw API values) as clickable markdown links with page titles."""
         if not citations or not self.format_citations_as_links:
             return content
             
@@ -331,7 +939,8 @@ class PerplexityComponent(LCModelComponent):
         
         # Add note about domain filtering if filter was applied
         if self.search_domain_filter:
-            domain_filter = self.parse_domain_filter()
+            if domain_filter is None:
+                domain_filter = self.parse_domain_filter()
             included = [d for d in domain_filter if not d.startswith('-')]
             excluded = [d[1:] for d in domain_filter if d.startswith('-')]
             
@@ -342,17 +951,11 @@ class PerplexityComponent(LCModelComponent):
             formatted_content += "\n"
         
         for i, citation in enumerate(citations, 1):
-            # Try to extract title and URL from citation
-            url = None
-            title = None
-            
-            if isinstance(citation, dict):
-                # If citation is a dict, look for url and title fields
-                url = citation.get('url', '') or citation.get('link', '')
-                title = citation.get('title', '') or citation.get('name', '') or citation.get('snippet', '')
-            elif isinstance(citation, str):
-                # If citation is just a URL string
-                url = citation
+            # Take title and URL from the citation
+            if not isinstance(citation, Citation):
+                citation = Citation.from_api(i, citation)
+            url = citation.url
+            title = citation.title
                 
             # If we have a URL but no title, try to extract a title from the URL
             if url and not title:
@@ -457,6 +1060,50 @@ class PerplexityComponent(LCModelComponent):
     
     def process_message(self, input_value: Any) -> Message:
         """Process the input and generate a response with citations."""
+        if preaa_tracing is None:
+            return self._process_message(input_value)
+        with preaa_tracing.span("perplexity.process_message", kind="generation", model=self.model_name) as span:
+            message = self._process_message(input_value)
+            self._annotate_span(span, message)
+            return message
+
+    async def aprocess_message(self, input_value: Any) -> Message:
+        """Async ``process_message``; the request does not block the event loop."""
+        if preaa_tracing is None:
+            return await self._aprocess_message(input_value)
+        with preaa_tracing.span("perplexity.process_message", kind="generation", model=self.model_name) as span:
+            message = await self._aprocess_message(input_value)
+            self._annotate_span(span, message)
+            return message
+
+    def _annotate_span(self, span, message: Message) -> None:
+        if not span:  # falsy when this call is not sampled
+            return
+        span.model = message.metadata.get("model") or span.model
+        coalesced = getattr(self, "_coalesced", False)
+        if not coalesced:  # a shared response is billed once, to the call that sent it
+            usage = message.metadata.get("usage") or {}
+            span.set_usage(usage.get("prompt_tokens"), usage.get("completion_tokens"))
+        span.set(
+            search_mode=self.search_mode or "default",
+            citations=len(message.metadata.get("citations") or []),
+            attempts=getattr(self, "_attempts", 1),
+            coalesced=coalesced,
+            shared_with=getattr(self, "_shared_with", 0),
+            estimated_prompt_tokens=getattr(self, "_estimated_prompt_tokens", None),
+            downgraded_from=message.metadata.get("downgraded_from"),
+        )
+
+    def _process_message(self, input_value: Any) -> Message:
+        messages = self.build_messages(input_value)
+        return self.build_response_message(self.call_perplexity_api(messages))
+
+    async def _aprocess_message(self, input_value: Any) -> Message:
+        messages = self.build_messages(input_value)
+        return self.build_response_message(await self.acall_perplexity_api(messages))
+
+    def build_messages(self, input_value: Any) -> List[Dict]:
+        """Build the chat messages (system prompt and user text) for one input."""
         # Extract the actual message text
         user_message = ""
         
@@ -498,24 +1145,26 @@ class PerplexityComponent(LCModelComponent):
             "role": "user",
             "content": user_message
         })
-        
-        # Call Perplexity API
-        api_response = self.call_perplexity_api(messages)
-        
+        return messages
+
+    def build_response_message(self, api_response: Dict) -> Message:
+        """Turn a Perplexity response into the output Message with formatted citations."""
         # Extract the response content
         if 'choices' in api_response and len(api_response['choices']) > 0:
             choice = api_response['choices'][0]
             content = choice.get('message', {}).get('content', '')
             
-            # Extract citations if present
-            citations = api_response.get('citations', [])
+            # Extract citations if present, numbered as the [n] markers in the text
+            raw_citations = api_response.get('citations') or []
+            citations = [Citation.from_api(i, raw) for i, raw in enumerate(raw_citations, 1)]
+            domain_filter = self.parse_domain_filter()
             
             # Extract images if present
             images = api_response.get('images', [])
             
             # Format citations as markdown links if enabled
             if citations and self.format_citations_as_links:
-                content = self.format_citations_as_markdown(content, citations)
+                content = self.format_citations_as_markdown(content, citations, domain_filter)
                 
             # Add images if present
             if images and self.return_images:
@@ -527,30 +1176,56 @@ class PerplexityComponent(LCModelComponent):
                 if related_questions:
                     content += self.format_related_questions(related_questions)
             
-            # Create the Message object with metadata
-            message = Message(
-                text=content,
-                sender_name="Perplexity",
-                metadata={
-                    "model": self.model_name,
+            if getattr(self, "compact_metadata", False):
+                metadata = self.compact_message_metadata(api_response, citations)
+            else:
+                metadata = {
+                    "model": getattr(self, "_model_used", self.model_name),
+                    "downgraded_from": getattr(self, "_downgraded_from", None),
                     "search_mode": self.search_mode if hasattr(self, 'search_mode') and self.search_mode != "default" else None,
-                    "citations": citations,
-                    "domain_filter": self.parse_domain_filter(),
+                    "citations": raw_citations,
+                    "domain_filter": domain_filter,
                     "recency_filter": self.search_recency_filter,
                     "images": images,
                     "usage": api_response.get('usage', {}),
                     "id": api_response.get('id', ''),
                     "related_questions": api_response.get('related_questions', [])
                 }
+
+            # Create the Message object with metadata
+            message = Message(
+                text=content,
+                sender_name="Perplexity",
+                metadata=metadata
             )
             
-            # Store for output methods
+            # Store for output methods; citations stay available in process even when compact
             self.last_message = message
+            self.last_citations = citations
             
             return message
         else:
             raise ValueError("No response from Perplexity API")
     
+    def compact_message_metadata(self, api_response: Dict, citations: List[Citation]) -> Dict:
+        """Metadata small enough to store with every chat message.
+
+        Citations are kept as URLs in [n] order, since the text already carries their titles and
+        links. Settings the flow already knows (filters, search mode) and content rendered into the
+        text (images, related questions) are left out.
+        """
+        usage = api_response.get('usage') or {}
+        token_counts = ("prompt_tokens", "completion_tokens", "total_tokens")
+        metadata = {
+            "model": getattr(self, "_model_used", self.model_name),
+            "citations": [citation.url for citation in citations],
+            "usage": {key: usage[key] for key in token_counts if key in usage},
+            "id": api_response.get('id', ''),
+        }
+        if getattr(self, "_downgraded_from", None):
+            metadata["downgraded_from"] = self._downgraded_from
+        return metadata
+
     def build_model(self) -> Any:
         """Build model is required by LCModelComponent but we'll handle the API call directly."""
         # Return self as we're handling the API calls directly
@@ -603,6 +1278,4 @@ class PerplexityComponent(LCModelComponent):
     
     async def ainvoke(self, input: Union[str, Message, Dict], config: Optional[Dict] = None) -> Message:
         """Async version of invoke."""
-        # For now, just call the sync version
-        # You could make this truly async with httpx.AsyncClient if needed
-        return self.invoke(input, config)
\ No newline at end of file
+        return await self.aprocess_message(input)
\ No newline at end of file
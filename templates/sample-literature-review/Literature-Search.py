@@ -0,0 +1,543 @@
+from langflow.custom import Component
+from langflow.io import FloatInput, IntInput, MultilineInput, SecretStrInput, StrInput, Output
+from langflow.schema import Data
+from collections.abc import AsyncIterator
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from pathlib import Path
+import asyncio
+import hashlib
+import json
+import re
+import sqlite3
+import time
+import xml.etree.ElementTree as ET
+
+import httpx
+
+try:
+    import preaa_http  # shared pooled transport (templates/shared-http-transport), if installed
+except ImportError:
+    preaa_http = None
+
+# Endpoints and per-database request rates from artifacts/config.yaml.
+PUBMED_URL = "https://eutils.ncbi.nlm.nih.gov/entrez/eutils/"
+ARXIV_URL = "http://export.arxiv.org/api/query"
+IEEE_URL = "https://ieeexploreapi.ieee.org/api/v1/search/articles"
+DEFAULT_RATE_LIMITS = {"pubmed": 3.0, "arxiv": 1.0, "ieee": 2.0}
+DATABASES = tuple(DEFAULT_RATE_LIMITS)
+
+CONNECT_TIMEOUT_SECONDS = 5.0
+READ_TIMEOUT_SECONDS = 30.0
+MAX_RETRIES = 3
+
+# Largest page each API serves per request.
+PUBMED_FETCH_BATCH = 200
+ARXIV_PAGE_SIZE = 100
+IEEE_PAGE_SIZE = 200
+
+# Completed search pages and fetched records are checkpointed here, so an interrupted or
+# overlapping search resumes from the last finished request instead of starting over.
+DEFAULT_CHECKPOINT_PATH = "~/.cache/langflow/literature-review-checkpoints.sqlite3"
+DEFAULT_CHECKPOINT_MAX_AGE_HOURS = 7 * 24
+SECRET_PARAMS = {"api_key", "apikey"}
+
+ATOM = {"atom": "http://www.w3.org/2005/Atom", "arxiv": "http://arxiv.org/schemas/atom"}
+ARXIV_VERSION = re.compile(r"v\d+$")
+# Quoted phrases stay together; everything else is split into single terms.
+QUERY_TERMS = re.compile(r'"([^"]+)"|(\S+)')
+ARXIV_OPERATORS = {"AND", "OR", "ANDNOT"}
+
+
+@dataclass
+class Paper:
+    """One search result, normalized across databases."""
+
+    id: str
+    database: str
+    title: str
+    authors: list[str] = field(default_factory=list)
+    abstract: str = ""
+    year: int | None = None
+    journal: str = ""
+    doi: str = ""
+    arxiv_id: str = ""
+    pmid: str = ""
+    url: str = ""
+    pdf_url: str = ""
+    citations: int | None = None
+
+    def to_data(self) -> Data:
+        return Data(text=f"{self.title}\n\n{self.abstract}".strip(), **asdict(self))
+
+
+class RateLimiter:
+    """Spaces requests to one database at a fixed rate, shared by all of that database's calls."""
+
+    def __init__(self, rate: float):
+        self.interval = 1.0 / rate if rate > 0 else 0.0
+        self.next_at = 0.0
+        self.lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        async with self.lock:
+            now = time.monotonic()
+            wait = self.next_at - now
+            self.next_at = max(now, self.next_at) + self.interval
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+
+class CheckpointStore:
+    """SQLite table of finished units of work, keyed by stage and a hash of the unit's inputs.
+
+    The methods block; the search calls them through ``asyncio.to_thread``.
+    """
+
+    def __init__(self, path: str, max_age_seconds: float):
+        self.path = Path(path).expanduser()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_age_seconds = max_age_seconds
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS units (stage TEXT, key TEXT, value TEXT NOT NULL, created REAL, "
+                "PRIMARY KEY (stage, key))"
+            )
+
+    @contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    def get_many(self, stage: str, keys: list[str]) -> dict:
+        if not keys:
+            return {}
+        with self._connect() as conn:
+            rows = conn.execute(
+                f"SELECT key, value FROM units WHERE stage = ? AND created >= ? "
+                f"AND key IN ({','.join('?' * len(keys))})",
+                (stage, time.time() - self.max_age_seconds, *keys),
+            ).fetchall()
+        return {key: json.loads(value) for key, value in rows}
+
+    def get(self, stage: str, key: str):
+        return self.get_many(stage, [key]).get(key)
+
+    def put_many(self, stage: str, values: dict) -> None:
+        now = time.time()
+        with self._connect() as conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO units (stage, key, value, created) VALUES (?, ?, ?, ?)",
+                [(stage, key, json.dumps(value), now) for key, value in values.items()],
+            )
+
+    def put(self, stage: str, key: str, value) -> None:
+        self.put_many(stage, {key: value})
+
+
+def retry_after_seconds(value: str | None, default: float) -> float:
+    """Seconds to wait from a Retry-After header (delta-seconds or HTTP-date), or ``default``."""
+    if value is None:
+        return default
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return default
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+def _text(element: ET.Element | None) -> str:
+    return " ".join("".join(element.itertext()).split()) if element is not None else ""
+
+
+def _year(value: str) -> int | None:
+    match = re.search(r"\b(19|20)\d{2}\b", value or "")
+    return int(match.group(0)) if match else None
+
+
+def parse_pubmed(xml_text: str) -> list[Paper]:
+    papers = []
+    for article in ET.fromstring(xml_text).iter("PubmedArticle"):
+        pmid = _text(article.find("MedlineCitation/PMID"))
+        info = article.find("MedlineCitation/Article")
+        if info is None or not pmid:
+            continue
+        abstract = " ".join(
+            f"{part.get('Label')}: {_text(part)}" if part.get("Label") else _text(part)
+            for part in info.findall("Abstract/AbstractText")
+        )
+        authors = []
+        for author in info.findall("AuthorList/Author"):
+            if author.find("LastName") is not None:
+                authors.append(f"{_text(author.find('LastName'))}, {_text(author.find('Initials'))}".rstrip(", "))
+            elif author.find("CollectiveName") is not None:
+                authors.append(_text(author.find("CollectiveName")))
+        ids = {node.get("IdType"): _text(node) for node in article.findall("PubmedData/ArticleIdList/ArticleId")}
+        pub_date = info.find("Journal/JournalIssue/PubDate")
+        papers.append(
+            Paper(
+                id=f"pubmed:{pmid}",
+                database="pubmed",
+                title=_text(info.find("ArticleTitle")),
+                authors=authors,
+                abstract=abstract,
+                year=_year(_text(pub_date)),
+                journal=_text(info.find("Journal/Title")),
+                doi=ids.get("doi", ""),
+                pmid=pmid,
+                url=f"https://pubmed.ncbi.nlm.nih.gov/{pmid}/",
+            )
+        )
+    return papers
+
+
+def parse_arxiv(xml_text: str) -> list[Paper]:
+    papers = []
+    for entry in ET.fromstring(xml_text).findall("atom:entry", ATOM):
+        abs_url = _text(entry.find("atom:id", ATOM))
+        arxiv_id = ARXIV_VERSION.sub("", abs_url.rsplit("/abs/", 1)[-1])
+        if not arxiv_id:
+            continue
+        links = entry.findall("atom:link", ATOM)
+        pdf = next((link.get("href", "") for link in links if link.get("title") == "pdf"), "")
+        papers.append(
+            Paper(
+                id=f"arxiv:{arxiv_id}",
+                database="arxiv",
+                title=_text(entry.find("atom:title", ATOM)),
+                authors=[_text(author.find("atom:name", ATOM)) for author in entry.findall("atom:author", ATOM)],
+                abstract=_text(entry.find("atom:summary", ATOM)),
+                year=_year(_text(entry.find("atom:published", ATOM))),
+                journal=_text(entry.find("arxiv:journal_ref", ATOM)) or "arXiv preprint",
+                doi=_text(entry.find("arxiv:doi", ATOM)),
+                arxiv_id=arxiv_id,
+                url=abs_url,
+                pdf_url=pdf,
+            )
+        )
+    return papers
+
+
+def arxiv_search_query(query: str) -> str:
+    """Build an arXiv ``search_query`` that requires every term, rather than the whole query as one phrase."""
+    clauses = []
+    for phrase, word in QUERY_TERMS.findall(query):
+        # Characters with a meaning in arXiv's query syntax would break the clause.
+        term = " ".join(re.sub(r'[():"\[\]]', " ", phrase or word).split())
+        if not term or term in ARXIV_OPERATORS:
+            continue
+        clauses.append(f'all:"{term}"' if " " in term else f"all:{term}")
+    return " AND ".join(clauses)
+
+
+def parse_ieee(payload: dict) -> list[Paper]:
+    papers = []
+    for article in payload.get("articles", []):
+        number = str(article.get("article_number", ""))
+        if not number:
+            continue
+        papers.append(
+            Paper(
+                id=f"ieee:{number}",
+                database="ieee",
+                title=" ".join(str(article.get("title", "")).split()),
+                authors=[a.get("full_name", "") for a in article.get("authors", {}).get("authors", [])],
+                abstract=article.get("abstract", ""),
+                year=_year(str(article.get("publication_year", ""))),
+                journal=article.get("publication_title", ""),
+                doi=article.get("doi", ""),
+                url=article.get("html_url", ""),
+                pdf_url=article.get("pdf_url", ""),
+                citations=article.get("citing_paper_count"),
+            )
+        )
+    return papers
+
+
+class LiteratureSearchComponent(Component):
+    display_name = "Literature Search"
+    description = (
+        "Search PubMed, arXiv and IEEE Xplore at the same time, each under its own rate limit, and return "
+        "one normalized paper record per result."
+    )
+    icon = "book-open"
+
+    _checkpoints: CheckpointStore | None = None
+    _resumed = 0
+
+    inputs = [
+        MultilineInput(
+            name="search_request",
+            display_name="Search Request",
+            info="Request JSON as in artifacts/sample-input.json (query, date_range, databases), or a plain query.",
+            required=True,
+        ),
+        IntInput(
+            name="max_results_per_database",
+            display_name="Max Results per Database",
+            info="Candidates fetched from each database before ranking.",
+            value=100,
+        ),
+        SecretStrInput(
+            name="pubmed_api_key",
+            display_name="PubMed API Key",
+            info="Optional NCBI key. Without one NCBI allows 3 requests/s.",
+            required=False,
+        ),
+        SecretStrInput(
+            name="ieee_api_key",
+            display_name="IEEE API Key",
+            info="Required to search IEEE Xplore; IEEE is skipped without it.",
+            required=False,
+        ),
+        FloatInput(
+            name="pubmed_rate_limit",
+            display_name="PubMed Requests/s",
+            value=DEFAULT_RATE_LIMITS["pubmed"],
+            advanced=True,
+        ),
+        FloatInput(
+            name="arxiv_rate_limit",
+            display_name="arXiv Requests/s",
+            value=DEFAULT_RATE_LIMITS["arxiv"],
+            advanced=True,
+        ),
+        FloatInput(
+            name="ieee_rate_limit",
+            display_name="IEEE Requests/s",
+            value=DEFAULT_RATE_LIMITS["ieee"],
+            advanced=True,
+        ),
+        StrInput(
+            name="databases",
+            display_name="Databases",
+            info="Databases to search when the request does not list any.",
+            value=list(DATABASES),
+            is_list=True,
+            advanced=True,
+        ),
+        StrInput(
+            name="checkpoint_path",
+            display_name="Checkpoint Path",
+            info="SQLite file of finished search requests. Leave empty to always search from scratch.",
+            value=DEFAULT_CHECKPOINT_PATH,
+            advanced=True,
+        ),
+        IntInput(
+            name="checkpoint_max_age_hours",
+            display_name="Checkpoint Max Age (hours)",
+            info="Older checkpoints are ignored and searched again.",
+            value=DEFAULT_CHECKPOINT_MAX_AGE_HOURS,
+            advanced=True,
+        ),
+    ]
+
+    outputs = [
+        Output(name="papers", display_name="Papers", method="search_papers"),
+    ]
+
+    def parse_request(self) -> dict:
+        text = (self.search_request or "").strip()
+        try:
+            request = json.loads(text)
+        except json.JSONDecodeError:
+            request = {"query": text}
+        if not isinstance(request, dict) or not str(request.get("query", "")).strip():
+            raise ValueError("Search request needs a non-empty 'query'.")
+        return request
+
+    async def _get(self, client: httpx.AsyncClient, limiter: RateLimiter, url: str, params: dict) -> httpx.Response:
+        for attempt in range(MAX_RETRIES + 1):
+            await limiter.acquire()
+            response = await client.get(url, params=params)
+            if response.status_code not in (429, 500, 502, 503, 504) or attempt == MAX_RETRIES:
+                break
+            await asyncio.sleep(retry_after_seconds(response.headers.get("Retry-After"), 2**attempt))
+        response.raise_for_status()
+        return response
+
+    async def _checkpointed(self, stage: str, url: str, params: dict, fetch):
+        """Return a finished request's result from the checkpoint store, or run ``fetch`` and record it."""
+        public = {key: value for key, value in params.items() if key not in SECRET_PARAMS}
+        key = hashlib.sha256(json.dumps([url, public], sort_keys=True).encode()).hexdigest()
+        if self._checkpoints and (cached := await asyncio.to_thread(self._checkpoints.get, stage, key)) is not None:
+            self._resumed += 1
+            return cached
+        value = await fetch()
+        if self._checkpoints:
+            await asyncio.to_thread(self._checkpoints.put, stage, key, value)
+        return value
+
+    async def search_pubmed(self, client, limiter, request: dict, limit: int) -> AsyncIterator[list[Paper]]:
+        params = {"db": "pubmed", "term": request["query"], "retmax": limit, "retmode": "json"}
+        if self.pubmed_api_key:
+            params["api_key"] = self.pubmed_api_key
+        date_range = request.get("date_range") or {}
+        if date_range.get("start") or date_range.get("end"):
+            params.update(
+                datetype="pdat",
+                mindate=(date_range.get("start") or "1900-01-01").replace("-", "/"),
+                maxdate=(date_range.get("end") or "3000-01-01").replace("-", "/"),
+            )
+        url = f"{PUBMED_URL}esearch.fcgi"
+
+        async def esearch() -> list[str]:
+            found = (await self._get(client, limiter, url, params)).json()
+            return found.get("esearchresult", {}).get("idlist", [])
+
+        pmids = await self._checkpointed("pubmed-search", url, params, esearch)
+        # Records are checkpointed per PMID, so overlapping queries only fetch papers not seen yet.
+        if self._checkpoints:
+            stored = await asyncio.to_thread(self._checkpoints.get_many, "pubmed-record", pmids)
+            if stored:
+                self._resumed += 1
+                yield [Paper(**stored[pmid]) for pmid in pmids if pmid in stored]
+            pmids = [pmid for pmid in pmids if pmid not in stored]
+        for start in range(0, len(pmids), PUBMED_FETCH_BATCH):
+            fetch = {"db": "pubmed", "id": ",".join(pmids[start:start + PUBMED_FETCH_BATCH]), "retmode": "xml"}
+            if self.pubmed_api_key:
+                fetch["api_key"] = self.pubmed_api_key
+            papers = parse_pubmed((await self._get(client, limiter, f"{PUBMED_URL}efetch.fcgi", fetch)).text)
+            if self._checkpoints:
+                records = {paper.pmid: asdict(paper) for paper in papers}
+                await asyncio.to_thread(self._checkpoints.put_many, "pubmed-record", records)
+            yield papers
+
+    async def search_arxiv(self, client, limiter, request: dict, limit: int) -> AsyncIterator[list[Paper]]:
+        query = arxiv_search_query(request["query"])
+        if not query:
+            return
+        date_range = request.get("date_range") or {}
+        if date_range.get("start") or date_range.get("end"):
+            start = (date_range.get("start") or "1900-01-01").replace("-", "")
+            end = (date_range.get("end") or "3000-01-01").replace("-", "")
+            query += f" AND submittedDate:[{start}0000 TO {end}2359]"
+        for offset in range(0, limit, ARXIV_PAGE_SIZE):
+            params = {"search_query": query, "start": offset, "max_results": min(ARXIV_PAGE_SIZE, limit - offset)}
+
+            async def fetch_page() -> list[dict]:
+                return [asdict(p) for p in parse_arxiv((await self._get(client, limiter, ARXIV_URL, params)).text)]
+
+            papers = [Paper(**p) for p in await self._checkpointed("arxiv-page", ARXIV_URL, params, fetch_page)]
+            if papers:
+                yield papers
+            if len(papers) < params["max_results"]:
+                return
+
+    async def search_ieee(self, client, limiter, request: dict, limit: int) -> AsyncIterator[list[Paper]]:
+        date_range = request.get("date_range") or {}
+        for offset in range(0, limit, IEEE_PAGE_SIZE):
+            params = {
+                "apikey": self.ieee_api_key,
+                "querytext": request["query"],
+                "max_records": min(IEEE_PAGE_SIZE, limit - offset),
+                "start_record": offset + 1,
+            }
+            if _year(date_range.get("start", "")):
+                params["start_year"] = _year(date_range["start"])
+            if _year(date_range.get("end", "")):
+                params["end_year"] = _year(date_range["end"])
+
+            async def fetch_page() -> dict:
+                payload = (await self._get(client, limiter, IEEE_URL, params)).json()
+                return {"papers": [asdict(p) for p in parse_ieee(payload)], "total": payload.get("total_records")}
+
+            page = await self._checkpointed("ieee-page", IEEE_URL, params, fetch_page)
+            papers = [Paper(**p) for p in page["papers"]]
+            if papers:
+                yield papers
+            if offset + len(papers) >= min(limit, int(page["total"] or 0)):
+                return
+
+    def enabled_databases(self, request: dict) -> list[str]:
+        requested = request.get("databases") or self.databases or list(DATABASES)
+        enabled = [name for name in requested if name in DATABASES]
+        if "ieee" in enabled and not self.ieee_api_key:
+            self.log("Skipping IEEE: no API key")
+            enabled.remove("ieee")
+        return enabled
+
+    async def stream_papers(self, request: dict, errors: dict[str, str]) -> AsyncIterator[Paper]:
+        """Yield papers from all databases as each page arrives, fastest source first.
+
+        The LangFlow output (``search_papers``) collects this into one list; custom code can
+        iterate it directly to start on papers before every database has answered.
+        """
+        limit = max(1, int(self.max_results_per_database or 1))
+        sources = {"pubmed": self.search_pubmed, "arxiv": self.search_arxiv, "ieee": self.search_ieee}
+        rates = {"pubmed": self.pubmed_rate_limit, "arxiv": self.arxiv_rate_limit, "ieee": self.ieee_rate_limit}
+        queue: asyncio.Queue = asyncio.Queue()
+        done = object()
+
+        async def pump(name: str, client: httpx.AsyncClient) -> None:
+            limiter = RateLimiter(float(rates[name] or DEFAULT_RATE_LIMITS[name]))
+            try:
+                async for batch in sources[name](client, limiter, request, limit):
+                    await queue.put(batch)
+            except Exception as e:  # noqa: BLE001 - one database failing must not stop the others
+                # Status errors embed the request URL, which carries the API key.
+                if isinstance(e, httpx.HTTPStatusError):
+                    errors[name] = f"HTTP {e.response.status_code}"
+                elif isinstance(e, (httpx.HTTPError, ET.ParseError, ValueError)):
+                    errors[name] = str(e)
+                else:
+                    errors[name] = f"{type(e).__name__}: {e}"
+                self.log(f"{name} search failed: {errors[name]}")
+            finally:
+                await queue.put(done)
+
+        timeout = httpx.Timeout(READ_TIMEOUT_SECONDS, connect=CONNECT_TIMEOUT_SECONDS)
+        options = {"timeout": timeout, "follow_redirects": True}
+        # _get already rate-limits and retries per database.
+        client = preaa_http.async_client(retries=0, **options) if preaa_http else httpx.AsyncClient(**options)
+        async with client:
+            names = self.enabled_databases(request)
+            tasks = [asyncio.create_task(pump(name, client)) for name in names]
+            try:
+                remaining = len(tasks)
+                while remaining:
+                    item = await queue.get()
+                    if item is done:
+                        remaining -= 1
+                        continue
+                    for paper in item:
+                        yield paper
+            finally:
+                for task in tasks:
+                    task.cancel()
+                await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def search_papers(self) -> list[Data]:
+        request = self.parse_request()
+        max_age = float(self.checkpoint_max_age_hours or 0) * 3600
+        self._checkpoints = None
+        if self.checkpoint_path and max_age:
+            self._checkpoints = await asyncio.to_thread(CheckpointStore, self.checkpoint_path, max_age)
+        self._resumed = 0
+        errors: dict[str, str] = {}
+        counts: dict[str, int] = {}
+        papers = []
+        async for paper in self.stream_papers(request, errors):
+            counts[paper.database] = counts.get(paper.database, 0) + 1
+            papers.append(paper.to_data())
+
+        parts = [f"{name} {count}" for name, count in counts.items()]
+        parts += [f"{name} failed ({error})" for name, error in errors.items()]
+        if self._resumed:
+            parts.append(f"{self._resumed} checkpointed requests reused")
+        self.status = f"{len(papers)} papers: " + ", ".join(parts)
+        if errors and not papers:
+            raise ValueError(f"All database searches failed: {errors}")
+        return papers
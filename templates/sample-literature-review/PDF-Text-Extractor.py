@@ -0,0 +1,275 @@
+from langflow.custom import Component
+from langflow.io import DataInput, IntInput, StrInput, Output
+from langflow.schema import Data
+from pathlib import Path
+import asyncio
+import hashlib
+import os
+import sys
+import tempfile
+
+import httpx
+
+try:
+    import preaa_http  # shared pooled transport (templates/shared-http-transport), if installed
+except ImportError:
+    preaa_http = None
+
+try:
+    import pypdf
+except ImportError:
+    pypdf = None
+
+DEFAULT_CACHE_DIR = "~/.cache/langflow/pdf-text"
+CONNECT_TIMEOUT_SECONDS = 5.0
+READ_TIMEOUT_SECONDS = 60.0
+MAX_PDF_BYTES = 50 * 1024 * 1024
+# Publishers (arXiv in particular) block clients that fetch many PDFs at once.
+MAX_CONCURRENT_DOWNLOADS = 4
+PAGE_SEPARATOR = "\n\f\n"
+
+# Runs in a separate interpreter per document. LangFlow loads component code from a string,
+# so worker functions cannot be pickled into a multiprocessing pool; a subprocess also gets
+# its own address-space cap and cannot take the LangFlow worker down with a bad PDF.
+# Pages are written as they are extracted and announced on stdout, so neither process
+# holds the whole document in memory.
+WORKER_SCRIPT = r"""
+import os, sys
+path, out = sys.argv[1], sys.argv[2]
+max_pages, max_chars, memory_mb = int(sys.argv[3]), int(sys.argv[4]), int(sys.argv[5])
+if memory_mb:
+    try:
+        import resource
+        resource.setrlimit(resource.RLIMIT_AS, (memory_mb * 1024 * 1024,) * 2)
+    except (ImportError, ValueError, OSError):
+        pass
+from pypdf import PdfReader
+reader = PdfReader(path)
+written = 0
+part = f"{out}.{os.getpid()}.part"
+with open(part, "w", encoding="utf-8") as f:
+    for number, page in enumerate(reader.pages, 1):
+        if max_pages and number > max_pages:
+            break
+        text = page.extract_text() or ""
+        f.write(text + "\n\f\n")
+        written += len(text)
+        print(number, flush=True)
+        if max_chars and written >= max_chars:
+            break
+os.replace(part, out)
+"""
+
+
+class PDFTextExtractor(Component):
+    display_name = "PDF Text Extractor"
+    description = (
+        "Download each paper's PDF and extract its text in parallel worker processes with a memory cap. "
+        "Extracted text is cached on disk by file hash."
+    )
+    icon = "file-text"
+
+    inputs = [
+        DataInput(
+            name="papers",
+            display_name="Papers",
+            info="Paper records with a 'pdf_url' or a local 'pdf_path'.",
+            is_list=True,
+            required=True,
+        ),
+        IntInput(
+            name="max_workers",
+            display_name="Worker Processes",
+            info="PDFs extracted at the same time. Defaults to the number of CPU cores.",
+            value=os.cpu_count() or 2,
+        ),
+        IntInput(
+            name="max_pages",
+            display_name="Max Pages",
+            info="Pages read per document (0 for all).",
+            value=40,
+            advanced=True,
+        ),
+        IntInput(
+            name="max_chars",
+            display_name="Max Characters",
+            info="Extraction stops once a document has this much text.",
+            value=200_000,
+            advanced=True,
+        ),
+        IntInput(
+            name="memory_limit_mb",
+            display_name="Memory per Worker (MB)",
+            info="Address-space cap for each extraction process (POSIX only, 0 for no cap).",
+            value=1024,
+            advanced=True,
+        ),
+        IntInput(
+            name="timeout_seconds",
+            display_name="Timeout per PDF (s)",
+            value=120,
+            advanced=True,
+        ),
+        StrInput(
+            name="cache_dir",
+            display_name="Cache Directory",
+            info="Downloaded PDFs and extracted text are kept here, named by SHA-256 of the file.",
+            value=DEFAULT_CACHE_DIR,
+            advanced=True,
+        ),
+    ]
+
+    outputs = [
+        Output(name="papers_with_text", display_name="Papers with Full Text", method="extract_texts"),
+    ]
+
+    async def _download(self, client: httpx.AsyncClient, url: str, pdf_dir: Path) -> Path:
+        """Stream a PDF to disk, hashing as it arrives, and store it under its SHA-256."""
+        digest = hashlib.sha256()
+        size = 0
+        with tempfile.NamedTemporaryFile(dir=pdf_dir, suffix=".part", delete=False) as tmp:
+            try:
+                async with client.stream("GET", url) as response:
+                    response.raise_for_status()
+                    async for chunk in response.aiter_bytes():
+                        size += len(chunk)
+                        if size > MAX_PDF_BYTES:
+                            raise ValueError(f"PDF larger than {MAX_PDF_BYTES // (1024 * 1024)} MB")
+                        digest.update(chunk)
+                        tmp.write(chunk)
+                tmp.flush()
+                tmp.seek(0)
+                if tmp.read(5) != b"%PDF-":
+                    raise ValueError("response is not a PDF")
+            except BaseException:
+                os.unlink(tmp.name)
+                raise
+        target = pdf_dir / f"{digest.hexdigest()}.pdf"
+        os.replace(tmp.name, target)
+        return target
+
+    def _limits(self) -> tuple[int, int]:
+        return max(int(self.max_pages or 0), 0), max(int(self.max_chars or 0), 0)
+
+    def _text_file(self, text_dir: Path, file_hash: str) -> Path:
+        # Text extracted with different page or character limits is cached separately.
+        max_pages, max_chars = self._limits()
+        return text_dir / f"{file_hash}-p{max_pages}-c{max_chars}.txt"
+
+    async def _extract(self, pdf: Path, out: Path) -> int:
+        """Run the worker script on one PDF and return the number of pages read."""
+        max_pages, max_chars = self._limits()
+        # stderr goes to a file rather than a pipe nobody reads while the worker runs, so a chatty
+        # PDF (pypdf warns per malformed object) cannot fill the pipe and stall the worker.
+        with tempfile.TemporaryFile() as stderr:
+            process = await asyncio.create_subprocess_exec(
+                sys.executable,
+                "-c",
+                WORKER_SCRIPT,
+                str(pdf),
+                str(out),
+                str(max_pages),
+                str(max_chars),
+                str(max(int(self.memory_limit_mb or 0), 0)),
+                stdout=asyncio.subprocess.PIPE,
+                stderr=stderr,
+            )
+            pages = 0
+
+            async def run() -> None:
+                nonlocal pages
+                async for line in process.stdout:
+                    pages = int(line)
+                await process.wait()
+
+            try:
+                await asyncio.wait_for(run(), timeout=float(self.timeout_seconds or 120))
+            except asyncio.TimeoutError:
+                process.kill()
+                await process.wait()
+                raise ValueError(f"timed out after {pages} pages") from None
+            finally:
+                if process.returncode is None:  # cancelled while the worker was still running
+                    process.kill()
+                    await process.wait()
+                # A worker that was killed or crashed leaves its partial output behind.
+                Path(f"{out}.{process.pid}.part").unlink(missing_ok=True)
+            if process.returncode != 0:
+                stderr.seek(0)
+                lines = stderr.read().decode(errors="replace").strip().splitlines()
+                raise ValueError(lines[-1] if lines else f"worker exited with code {process.returncode}")
+        return pages
+
+    async def _process(self, paper: dict, client, pdf_dir: Path, text_dir: Path, workers, downloads) -> dict:
+        source = paper.get("pdf_path") or paper.get("pdf_url")
+        if not source:
+            return {**paper, "full_text_status": "no_pdf"}
+        try:
+            if paper.get("pdf_path"):
+                pdf = Path(paper["pdf_path"]).expanduser()
+                file_hash = hashlib.sha256(pdf.read_bytes()).hexdigest()
+            else:
+                # Remember which file a URL resolved to, so cached text is found without re-downloading.
+                url_entry = pdf_dir / f"url-{hashlib.sha256(source.encode()).hexdigest()}"
+                file_hash = url_entry.read_text().strip() if url_entry.exists() else ""
+                pdf = pdf_dir / f"{file_hash}.pdf"
+                if not file_hash or (not self._text_file(text_dir, file_hash).exists() and not pdf.exists()):
+                    async with downloads:
+                        pdf = await self._download(client, source, pdf_dir)
+                    file_hash = pdf.stem
+                    url_entry.write_text(file_hash)
+
+            text_file = self._text_file(text_dir, file_hash)
+            status = "cached"
+            # Several records can point at the same file; extract it once.
+            async with self._file_locks.setdefault(file_hash, asyncio.Lock()):
+                if not text_file.exists():
+                    async with workers:
+                        await self._extract(pdf, text_file)
+                    status = "extracted"
+
+            max_chars = self._limits()[1]
+            with text_file.open(encoding="utf-8") as f:
+                text = f.read(max_chars) if max_chars else f.read()
+            return {
+                **paper,
+                "full_text": text,
+                "full_text_pages": text.count(PAGE_SEPARATOR),
+                "pdf_sha256": file_hash,
+                "full_text_status": status,
+            }
+        except (httpx.HTTPError, OSError, ValueError) as e:
+            reason = f"HTTP {e.response.status_code}" if isinstance(e, httpx.HTTPStatusError) else str(e)
+            return {**paper, "full_text_status": f"failed: {reason}"}
+
+    async def extract_texts(self) -> list[Data]:
+        if pypdf is None:
+            raise ValueError("PDF extraction needs pypdf. Install it with: pip install pypdf")
+
+        cache_dir = Path(self.cache_dir or DEFAULT_CACHE_DIR).expanduser()
+        pdf_dir, text_dir = cache_dir / "pdf", cache_dir / "text"
+        pdf_dir.mkdir(parents=True, exist_ok=True)
+        text_dir.mkdir(parents=True, exist_ok=True)
+        workers = asyncio.Semaphore(max(1, int(self.max_workers or 1)))
+        self._file_locks: dict[str, asyncio.Lock] = {}
+        downloads = asyncio.Semaphore(MAX_CONCURRENT_DOWNLOADS)
+
+        papers = [dict(row.data if isinstance(row, Data) else row) for row in self.papers or []]
+        timeout = httpx.Timeout(READ_TIMEOUT_SECONDS, connect=CONNECT_TIMEOUT_SECONDS)
+        options = {"timeout": timeout, "follow_redirects": True}
+        # With the shared transport, downloads also retry 429/5xx and reuse publisher connections across runs.
+        client = preaa_http.async_client(**options) if preaa_http else httpx.AsyncClient(**options)
+        async with client:
+            results = await asyncio.gather(
+                *(self._process(p, client, pdf_dir, text_dir, workers, downloads) for p in papers)
+            )
+
+        counts: dict[str, int] = {}
+        output = []
+        for record in results:
+            status = record["full_text_status"].split(":", 1)[0]
+            counts[status] = counts.get(status, 0) + 1
+            text = record.pop("text", None) or f"{record.get('title', '')}\n\n{record.get('abstract', '')}".strip()
+            output.append(Data(text=text, **record))
+        self.status = f"{len(output)} papers: " + ", ".join(f"{n} {status}" for status, n in sorted(counts.items()))
+        return output
@@ -0,0 +1,341 @@
+from langflow.custom import Component
+from langflow.io import DataInput, HandleInput, IntInput, MultilineInput, StrInput, Output
+from langflow.schema import Data
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+import asyncio
+import hashlib
+import json
+import re
+import sqlite3
+import threading
+import time
+
+DEFAULT_CACHE_PATH = "~/.cache/langflow/literature-analysis.sqlite3"
+# The Paper Deduplicator's index; analyzed papers are marked there for its New Papers Only option.
+DEFAULT_PAPER_INDEX_PATH = "~/.cache/langflow/literature-papers.sqlite3"
+
+# The cache key includes a hash of the prompt text, so editing the prompt re-analyzes every paper.
+# Bump PROMPT_VERSION (or the Prompt Version input) when parsing changes but the prompt does not.
+PROMPT_VERSION = "1"
+
+DEFAULT_PROMPT = """Summarize the following research paper focusing on methodology, findings, and implications.
+
+Title: {title}
+Year: {year}
+Text:
+{content}
+
+Return only JSON with these keys:
+"summary" (2-3 sentences), "key_findings" (list of short strings), "methodology" (one phrase),
+"methods" (list of method names, e.g. "CNN", "randomized controlled trial"),
+"keywords" (list of 3-8 lowercase topic phrases)."""
+
+# Written to the NDJSON stream per paper; full text and vectors stay out of the output file.
+STREAM_EXCLUDED_FIELDS = {"text", "full_text", "embedding", "content_hash"}
+
+ANALYSIS_FIELDS = ("summary", "key_findings", "methodology", "methods", "keywords")
+JSON_BLOCK = re.compile(r"\{.*\}", re.DOTALL)
+
+
+class AnalysisCache:
+    """SQLite store of per-paper results keyed by content hash, prompt version and model.
+
+    The methods block; the analyzer calls them through ``asyncio.to_thread``.
+    """
+
+    def __init__(self, path: str):
+        self.path = Path(path).expanduser()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS analyses (content_hash TEXT, prompt_version TEXT, model TEXT, kind TEXT, "
+                "value TEXT NOT NULL, created REAL, PRIMARY KEY (content_hash, prompt_version, model, kind))"
+            )
+
+    @contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    def get(self, content_hash: str, prompt_version: str, model: str, kind: str):
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT value FROM analyses WHERE content_hash = ? AND prompt_version = ? AND model = ? AND kind = ?",
+                (content_hash, prompt_version, model, kind),
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def put(self, content_hash: str, prompt_version: str, model: str, kind: str, value) -> None:
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO analyses VALUES (?, ?, ?, ?, ?, ?)",
+                (content_hash, prompt_version, model, kind, json.dumps(value), time.time()),
+            )
+
+
+def mark_analyzed(path: str, paper_keys: list[str]) -> None:
+    """Set ``analyzed_at`` for these papers in the Paper Deduplicator's index, if it exists."""
+    index = Path(path).expanduser()
+    if not paper_keys or not index.exists():
+        return
+    now = datetime.now(timezone.utc).isoformat(timespec="seconds")
+    conn = sqlite3.connect(index, timeout=30)
+    try:
+        if "analyzed_at" in {row[1] for row in conn.execute("PRAGMA table_info(papers)")}:
+            conn.executemany("UPDATE papers SET analyzed_at = ? WHERE key = ?", [(now, key) for key in paper_keys])
+            conn.commit()
+    finally:
+        conn.close()
+
+
+def fill_prompt(template: str, **values: str) -> str:
+    """Substitute ``{name}`` placeholders, leaving any other braces (e.g. JSON examples) as written."""
+    pattern = re.compile("|".join(re.escape(f"{{{name}}}") for name in values))
+    return pattern.sub(lambda match: values[match.group(0)[1:-1]], template)
+
+
+def model_id(model) -> str:
+    for attr in ("model_name", "model", "model_id"):
+        value = getattr(model, attr, None)
+        if isinstance(value, str) and value:
+            return f"{type(model).__name__}:{value}"
+    return type(model).__name__
+
+
+def parse_analysis(text: str) -> dict:
+    """Read the model's JSON answer; fall back to treating the whole reply as the summary."""
+    match = JSON_BLOCK.search(text)
+    try:
+        parsed = json.loads(match.group(0)) if match else {}
+    except json.JSONDecodeError:
+        parsed = {}
+    if not isinstance(parsed, dict) or not parsed:
+        return {"summary": text.strip(), "key_findings": [], "methodology": "", "methods": [], "keywords": []}
+    analysis = {
+        field: parsed.get(field, [] if field in ("key_findings", "methods", "keywords") else "")
+        for field in ANALYSIS_FIELDS
+    }
+    analysis["keywords"] = [str(k).strip().lower() for k in analysis["keywords"] if str(k).strip()]
+    return analysis
+
+
+class PaperAnalyzer(Component):
+    display_name = "Paper Analyzer"
+    description = (
+        "Summarize each paper and extract findings, methods and keywords with an LLM, optionally embedding it. "
+        "Results are cached per paper, so re-runs only pay for new or changed papers."
+    )
+    icon = "microscope"
+
+    inputs = [
+        HandleInput(
+            name="llm",
+            display_name="Language Model",
+            info="Connect the Model output of a Language Model node.",
+            input_types=["LanguageModel"],
+            required=True,
+        ),
+        HandleInput(
+            name="embedding_model",
+            display_name="Embedding Model",
+            info="Optional. Adds an 'embedding' vector to each paper.",
+            input_types=["Embeddings"],
+            required=False,
+        ),
+        DataInput(
+            name="papers",
+            display_name="Papers",
+            info="Deduplicated (and optionally ranked or full-text) paper records.",
+            is_list=True,
+            required=True,
+        ),
+        MultilineInput(
+            name="prompt",
+            display_name="Summarization Prompt",
+            info="Placeholders: {title}, {year}, {content}. Editing it re-analyzes papers instead of using the cache.",
+            value=DEFAULT_PROMPT,
+            advanced=True,
+        ),
+        StrInput(
+            name="prompt_version",
+            display_name="Prompt Version",
+            info="Part of the cache key, with the prompt text. Change it to re-analyze every paper with the same "
+            "prompt.",
+            value=PROMPT_VERSION,
+            advanced=True,
+        ),
+        IntInput(
+            name="max_content_chars",
+            display_name="Max Text Length",
+            info="Full text longer than this is cut before it is sent to the model.",
+            value=24000,
+            advanced=True,
+        ),
+        IntInput(
+            name="max_concurrency",
+            display_name="Max Concurrent Calls",
+            value=4,
+            advanced=True,
+        ),
+        StrInput(
+            name="cache_path",
+            display_name="Analysis Cache Path",
+            info="SQLite file for per-paper results. Leave empty to disable caching.",
+            value=DEFAULT_CACHE_PATH,
+            advanced=True,
+        ),
+        StrInput(
+            name="stream_path",
+            display_name="Results Stream (NDJSON)",
+            info="If set, each paper is appended to this JSON Lines file as soon as it is analyzed. "
+            "The file is started fresh on every run; Review Output Writer appends the synthesis.",
+            advanced=True,
+        ),
+        StrInput(
+            name="paper_index_path",
+            display_name="Paper Index Path",
+            info="The Paper Deduplicator's index. Papers analyzed successfully are marked there, so New Papers "
+            "Only skips them next time. Leave empty to not mark papers.",
+            value=DEFAULT_PAPER_INDEX_PATH,
+            advanced=True,
+        ),
+    ]
+
+    outputs = [
+        Output(name="analyzed_papers", display_name="Analyzed Papers", method="analyze_papers"),
+    ]
+
+    def paper_content(self, paper: dict) -> str:
+        body = paper.get("full_text") or paper.get("abstract") or ""
+        return f"{paper.get('title', '')}\n\n{body}"[: max(int(self.max_content_chars or 0), 1)]
+
+    async def _analyze(self, paper: dict, content: str, semaphore: asyncio.Semaphore) -> dict:
+        prompt = fill_prompt(
+            self.prompt, title=str(paper.get("title", "")), year=str(paper.get("year") or "n.d."), content=content
+        )
+        async with semaphore:
+            response = await self.llm.ainvoke(prompt)
+        text = getattr(response, "content", response)
+        return parse_analysis(text if isinstance(text, str) else str(text))
+
+    async def analyze_papers(self) -> list[Data]:
+        cache = await asyncio.to_thread(AnalysisCache, self.cache_path) if self.cache_path else None
+        prompt_text = f"{self.prompt_version or PROMPT_VERSION}\n{self.prompt}"
+        version = hashlib.sha256(prompt_text.encode()).hexdigest()[:16]
+        llm_id = model_id(self.llm)
+        embed_id = model_id(self.embedding_model) if self.embedding_model else ""
+        semaphore = asyncio.Semaphore(max(1, int(self.max_concurrency or 1)))
+
+        papers = []
+        for row in self.papers or []:
+            paper = dict(row.data if isinstance(row, Data) else row)
+            content = self.paper_content(paper)
+            papers.append((paper, content, hashlib.sha256(content.encode()).hexdigest()))
+
+        stream = None
+        if self.stream_path:
+            path = Path(self.stream_path).expanduser()
+            path.parent.mkdir(parents=True, exist_ok=True)
+            stream = await asyncio.to_thread(path.open, "w", encoding="utf-8")
+
+        # Lines are written from worker threads one at a time, so concurrent papers never interleave
+        # and a write still running for a cancelled paper finishes before the file is closed.
+        stream_lock = threading.Lock()
+
+        def append(line: str) -> None:
+            with stream_lock:
+                if not stream.closed:
+                    stream.write(line)
+                    stream.flush()
+
+        def close() -> None:
+            with stream_lock:
+                stream.close()
+
+        async def write(line: dict) -> None:
+            if stream:
+                await asyncio.to_thread(append, json.dumps(line, default=str) + "\n")
+
+        started = datetime.now(timezone.utc).isoformat(timespec="seconds")
+        await write({"type": "review_started", "papers": len(papers), "time": started})
+
+        async def analyze(paper: dict, content: str, content_hash: str) -> tuple[dict | None, bool]:
+            """Analyze one paper; a failure is logged and streamed, and does not stop the others."""
+            try:
+                cached = None
+                if cache:
+                    cached = await asyncio.to_thread(cache.get, content_hash, version, llm_id, "analysis")
+                analysis = cached if cached is not None else await self._analyze(paper, content, semaphore)
+            except Exception as e:  # noqa: BLE001
+                error = f"{type(e).__name__}: {e}"
+                self.log(f"Analysis failed for {paper.get('title', paper.get('id', ''))!r}: {error}")
+                failure = {"type": "paper_failed", "id": paper.get("id"), "title": paper.get("title"), "error": error}
+                await write(failure)
+                return None, False
+            # Stored as soon as it is ready, so a failure later in the run keeps finished papers.
+            if cache and cached is None:
+                try:
+                    await asyncio.to_thread(cache.put, content_hash, version, llm_id, "analysis", analysis)
+                except sqlite3.Error as e:
+                    self.log(f"Could not cache the analysis of {paper.get('id', '')!r}: {e}")
+            record = {k: v for k, v in {**paper, **analysis}.items() if k not in STREAM_EXCLUDED_FIELDS}
+            await write({"type": "paper", "paper": record})
+            return analysis, cached is not None
+
+        tasks = [asyncio.ensure_future(analyze(*item)) for item in papers]
+        try:
+            # Every task has finished (or been cancelled) before the stream is closed.
+            outcomes = await asyncio.gather(*tasks, return_exceptions=True)
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            if stream:
+                await asyncio.to_thread(close)
+        results = [outcome if isinstance(outcome, tuple) else (None, False) for outcome in outcomes]
+        analyzed = [(item, result) for item, result in zip(papers, results) if result[0] is not None]
+        failed = len(papers) - len(analyzed)
+        if papers and not analyzed:
+            raise ValueError(f"All {failed} paper analyses failed; see the component log for the errors.")
+
+        embeddings: dict[str, list[float]] = {}
+        if self.embedding_model:
+            missing = []
+            for (_, content, content_hash), _ in analyzed:
+                vector = await asyncio.to_thread(cache.get, content_hash, "", embed_id, "embedding") if cache else None
+                if vector is not None:
+                    embeddings[content_hash] = vector
+                elif content_hash not in embeddings:
+                    missing.append((content_hash, content))
+                    embeddings[content_hash] = []
+            if missing:
+                vectors = await self.embedding_model.aembed_documents([content for _, content in missing])
+                for (content_hash, _), vector in zip(missing, vectors):
+                    embeddings[content_hash] = list(vector)
+                    if cache:
+                        await asyncio.to_thread(cache.put, content_hash, "", embed_id, "embedding", list(vector))
+
+        output = []
+        for (paper, _, content_hash), (analysis, cached) in analyzed:
+            record = {**paper, **analysis, "content_hash": content_hash, "analysis_cached": cached}
+            if content_hash in embeddings:
+                record["embedding"] = embeddings[content_hash]
+            text = f"{paper.get('title', '')}\n\n{analysis.get('summary', '')}".strip()
+            output.append(Data(text=text, **{k: v for k, v in record.items() if k != "text"}))
+
+        if self.paper_index_path:
+            keys = [paper["paper_key"] for (paper, _, _), _ in analyzed if paper.get("paper_key")]
+            await asyncio.to_thread(mark_analyzed, self.paper_index_path, keys)
+
+        reused = sum(cached for _, (_, cached) in analyzed)
+        self.status = (
+            f"{len(output)} papers: {len(output) - reused} analyzed, {reused} from cache"
+            + (f", {failed} failed" if failed else "")
+        )
+        return output
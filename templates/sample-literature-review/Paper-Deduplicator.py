@@ -0,0 +1,288 @@
+from langflow.custom import Component
+from langflow.io import BoolInput, DataInput, IntInput, StrInput, Output
+from langflow.schema import Data
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+import hashlib
+import json
+import re
+import sqlite3
+import unicodedata
+
+DEFAULT_INDEX_PATH = "~/.cache/langflow/literature-papers.sqlite3"
+
+# Titles whose 64-bit simhashes differ in at most this many bits are candidate duplicates.
+# Splitting the hash into BANDS 8-bit bands means any pair within BANDS - 1 bits shares a band,
+# so larger distances cannot be found reliably and are capped at MAX_HAMMING.
+DEFAULT_MAX_HAMMING = 6
+BANDS = 8
+MAX_HAMMING = BANDS - 1
+
+DOI_PREFIX = re.compile(r"^(https?://(dx\.)?doi\.org/|doi:)", re.IGNORECASE)
+ARXIV_DOI = re.compile(r"^10\.48550/arxiv\.(.+)$", re.IGNORECASE)
+ARXIV_VERSION = re.compile(r"v\d+$")
+# Prefer the most complete record when merging: journal metadata over preprints.
+SOURCE_PRIORITY = {"pubmed": 0, "ieee": 1, "arxiv": 2}
+
+
+def normalize_title(title: str) -> str:
+    text = unicodedata.normalize("NFKD", title or "").encode("ascii", "ignore").decode().lower()
+    return " ".join(re.sub(r"[^a-z0-9]+", " ", text).split())
+
+
+def first_author_surname(authors: list[str]) -> str:
+    if not authors:
+        return ""
+    name = authors[0]
+    surname = name.split(",", 1)[0] if "," in name else (name.split() or [""])[-1]
+    return normalize_title(surname)
+
+
+def normalize_doi(doi: str) -> str:
+    return DOI_PREFIX.sub("", (doi or "").strip()).lower()
+
+
+def simhash(text: str) -> int:
+    """64-bit simhash over character trigrams; small edits to a title flip few bits."""
+    padded = f" {text} "
+    features = [padded[i:i + 3] for i in range(len(padded) - 2)]
+    weights = [0] * 64
+    for feature in features:
+        bits = int.from_bytes(hashlib.blake2b(feature.encode(), digest_size=8).digest(), "big")
+        for i in range(64):
+            weights[i] += 1 if bits >> i & 1 else -1
+    return sum(1 << i for i, weight in enumerate(weights) if weight > 0)
+
+
+def bands(value: int) -> list[str]:
+    width = 64 // BANDS
+    return [f"{i}:{value >> (i * width) & ((1 << width) - 1):02x}" for i in range(BANDS)]
+
+
+def paper_aliases(paper: dict) -> list[str]:
+    """Identifiers that mark two records as the same paper, strongest first."""
+    aliases = []
+    doi = normalize_doi(paper.get("doi", ""))
+    arxiv_id = ARXIV_VERSION.sub("", paper.get("arxiv_id") or "")
+    if not arxiv_id and (match := ARXIV_DOI.match(doi)):
+        arxiv_id = match.group(1)
+    if doi:
+        aliases.append(f"doi:{doi}")
+    if arxiv_id:
+        aliases.append(f"arxiv:{arxiv_id.lower()}")
+    if paper.get("pmid"):
+        aliases.append(f"pmid:{paper['pmid']}")
+    title = normalize_title(paper.get("title", ""))
+    if title:
+        fingerprint = hashlib.sha1(f"{title}|{first_author_surname(paper.get('authors', []))}".encode()).hexdigest()
+        aliases.append(f"fp:{fingerprint[:16]}")
+    if paper.get("id"):
+        aliases.append(f"id:{paper['id']}")
+    return aliases
+
+
+def merge_records(records: list[dict]) -> dict:
+    """Combine duplicate records, filling each empty field from the next best source."""
+    ordered = sorted(records, key=lambda r: SOURCE_PRIORITY.get(r.get("database", ""), 9))
+    merged = dict(ordered[0])
+    for record in ordered[1:]:
+        for key, value in record.items():
+            if value not in (None, "", []) and merged.get(key) in (None, "", []):
+                merged[key] = value
+    if len(merged.get("abstract") or "") < max(len(r.get("abstract") or "") for r in records):
+        merged["abstract"] = max((r.get("abstract") or "" for r in records), key=len)
+    citations = [r["citations"] for r in records if isinstance(r.get("citations"), int)]
+    merged["citations"] = max(citations) if citations else merged.get("citations")
+    merged["sources"] = sorted({s for r in records for s in r.get("sources", [r.get("id")]) if s})
+    return merged
+
+
+class PaperIndex:
+    """SQLite index of every paper seen in earlier reviews, addressable by any of its aliases.
+
+    ``analyzed_at`` is set by the Paper Analyzer once a paper's analysis succeeds, so a paper
+    that was found but never analyzed (e.g. the run failed) still counts as new.
+    """
+
+    def __init__(self, path: str):
+        self.path = Path(path).expanduser()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS papers (
+                    key TEXT PRIMARY KEY, record TEXT NOT NULL, simhash TEXT, first_seen TEXT, last_seen TEXT
+                );
+                CREATE TABLE IF NOT EXISTS aliases (alias TEXT PRIMARY KEY, key TEXT NOT NULL);
+                CREATE TABLE IF NOT EXISTS bands (band TEXT NOT NULL, key TEXT NOT NULL, PRIMARY KEY (band, key));
+                """
+            )
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(papers)")}
+            if "analyzed_at" not in columns:
+                # Indexes from before the column existed counted every seen paper as done.
+                conn.execute("ALTER TABLE papers ADD COLUMN analyzed_at TEXT")
+                conn.execute("UPDATE papers SET analyzed_at = first_seen")
+
+    @contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=30)
+        try:
+            yield conn
+            conn.commit()
+        finally:
+            conn.close()
+
+    def lookup(self, aliases: list[str]) -> str | None:
+        with self._connect() as conn:
+            for alias in aliases:
+                row = conn.execute("SELECT key FROM aliases WHERE alias = ?", (alias,)).fetchone()
+                if row:
+                    return row[0]
+        return None
+
+    def candidates(self, band_keys: list[str]) -> dict[str, tuple[int, dict]]:
+        with self._connect() as conn:
+            rows = conn.execute(
+                f"SELECT p.key, p.simhash, p.record FROM papers p JOIN bands b ON b.key = p.key "
+                f"WHERE b.band IN ({','.join('?' * len(band_keys))})",
+                band_keys,
+            ).fetchall()
+        return {key: (int(value, 16), json.loads(record)) for key, value, record in rows if value}
+
+    def get(self, key: str) -> tuple[dict, str, str | None] | None:
+        with self._connect() as conn:
+            row = conn.execute("SELECT record, first_seen, analyzed_at FROM papers WHERE key = ?", (key,)).fetchone()
+        return (json.loads(row[0]), row[1], row[2]) if row else None
+
+    def save(self, key: str, record: dict, aliases: list[str], hash_value: int, now: str) -> None:
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT INTO papers (key, record, simhash, first_seen, last_seen) VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT(key) DO UPDATE SET record = excluded.record, simhash = excluded.simhash, "
+                "last_seen = excluded.last_seen",
+                (key, json.dumps(record), f"{hash_value:016x}", now, now),
+            )
+            conn.executemany("INSERT OR REPLACE INTO aliases (alias, key) VALUES (?, ?)", [(a, key) for a in aliases])
+            conn.executemany(
+                "INSERT OR IGNORE INTO bands (band, key) VALUES (?, ?)", [(band, key) for band in bands(hash_value)]
+            )
+
+
+class PaperDeduplicator(Component):
+    display_name = "Paper Deduplicator"
+    description = (
+        "Merge records of the same paper from different databases using DOI, arXiv ID and a title/author "
+        "fingerprint, and remember papers across reviews in a local index."
+    )
+    icon = "copy-minus"
+
+    inputs = [
+        DataInput(
+            name="papers",
+            display_name="Papers",
+            info="Paper records from the Literature Search component.",
+            is_list=True,
+            required=True,
+        ),
+        IntInput(
+            name="max_title_distance",
+            display_name="Title Similarity (bits)",
+            info="Titles whose simhashes differ by at most this many of 64 bits, with the same first author, "
+            f"are treated as one paper (at most {MAX_HAMMING}). 0 disables near-duplicate matching.",
+            value=DEFAULT_MAX_HAMMING,
+            advanced=True,
+        ),
+        BoolInput(
+            name="new_papers_only",
+            display_name="New Papers Only",
+            info="Drop papers that an earlier review has already analyzed. Papers only found before are kept.",
+            value=False,
+        ),
+        StrInput(
+            name="index_path",
+            display_name="Paper Index Path",
+            info="SQLite file that remembers papers across reviews. Leave empty to deduplicate this run only.",
+            value=DEFAULT_INDEX_PATH,
+            advanced=True,
+        ),
+    ]
+
+    outputs = [
+        Output(name="unique_papers", display_name="Unique Papers", method="deduplicate"),
+    ]
+
+    def _near_match(self, record: dict, hash_value: int, candidates: dict[str, tuple[int, dict]]) -> str | None:
+        limit = min(max(int(self.max_title_distance or 0), 0), MAX_HAMMING)
+        if not limit:
+            return None
+        author = first_author_surname(record.get("authors", []))
+        for key, (other_hash, other) in candidates.items():
+            if bin(hash_value ^ other_hash).count("1") <= limit and author == first_author_surname(
+                other.get("authors", [])
+            ):
+                return key
+        return None
+
+    def deduplicate(self) -> list[Data]:
+        index = PaperIndex(self.index_path) if self.index_path else None
+        now = datetime.now(timezone.utc).isoformat(timespec="seconds")
+
+        clusters: dict[str, dict] = {}  # canonical key -> {"records", "aliases", "hash", "seen"}
+        alias_keys: dict[str, str] = {}
+        band_keys: dict[str, set[str]] = {}
+        for row in self.papers or []:
+            record = dict(row.data if isinstance(row, Data) else row)
+            record.pop("text", None)
+            aliases = paper_aliases(record)
+            hash_value = simhash(normalize_title(record.get("title", "")))
+            row_bands = bands(hash_value)
+
+            key = next((alias_keys[a] for a in aliases if a in alias_keys), None)
+            if key is None:
+                nearby = {
+                    k: (clusters[k]["hash"], clusters[k]["records"][0]) for b in row_bands for k in band_keys.get(b, ())
+                }
+                key = self._near_match(record, hash_value, nearby)
+            if key is None and index:
+                key = index.lookup(aliases) or self._near_match(record, hash_value, index.candidates(row_bands))
+            if key is None:
+                key = aliases[0] if aliases else f"id:{len(clusters)}"
+
+            cluster = clusters.setdefault(
+                key, {"records": [], "aliases": set(), "hash": hash_value, "seen": None, "analyzed": None}
+            )
+            if not cluster["records"] and index and (stored := index.get(key)):
+                stored_record, cluster["seen"], cluster["analyzed"] = stored
+                cluster["records"].append(stored_record)
+            cluster["records"].append(record)
+            cluster["aliases"].update(aliases)
+            for alias in aliases:
+                alias_keys[alias] = key
+            for band in row_bands:
+                band_keys.setdefault(band, set()).add(key)
+
+        results = []
+        reused = 0
+        dropped = 0
+        for key, cluster in clusters.items():
+            merged = merge_records(cluster["records"])
+            merged["paper_key"] = key
+            merged["first_seen"] = cluster["seen"] or now
+            if index:
+                index.save(key, merged, sorted(cluster["aliases"]), cluster["hash"], now)
+            if cluster["seen"]:
+                reused += 1
+            if cluster["analyzed"] and self.new_papers_only:
+                dropped += 1
+                continue
+            text = f"{merged.get('title', '')}\n\n{merged.get('abstract', '')}".strip()
+            results.append(Data(text=text, **merged))
+
+        total = len(self.papers or [])
+        self.status = (
+            f"{total} records → {len(clusters)} papers ({total - len(clusters)} duplicates merged, "
+            f"{reused} seen in earlier reviews{f', {dropped} already analyzed and dropped' if dropped else ''})"
+        )
+        return results
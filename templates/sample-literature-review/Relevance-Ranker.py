@@ -0,0 +1,197 @@
+from langflow.custom import Component
+from langflow.io import DataInput, FloatInput, HandleInput, IntInput, MultilineInput, Output
+from langflow.schema import Data
+import json
+import re
+
+import numpy as np
+
+# Defaults from artifacts/config.yaml (analysis.min_relevance_score / max_papers).
+DEFAULT_MIN_SCORE = 0.7
+DEFAULT_MAX_PAPERS = 50
+
+# Okapi BM25 parameters; titles count TITLE_WEIGHT times toward term frequency.
+BM25_K1 = 1.2
+BM25_B = 0.75
+TITLE_WEIGHT = 2
+KEYWORD_WEIGHT = 0.5
+# BM25 is scaled against a paper of average length with every query term in its title (term
+# frequency TITLE_WEIGHT), which scores 1.0. The scale depends only on the query and the corpus
+# statistics, not on the best candidate, so Min Relevance Score is an absolute bar.
+REFERENCE_SATURATION = TITLE_WEIGHT * (BM25_K1 + 1) / (TITLE_WEIGHT + BM25_K1)
+# Cosine similarity from sentence-embedding models rarely leaves this band: unrelated text sits
+# near the floor and close matches near the ceiling. It is stretched to 0-1 to match BM25.
+EMBEDDING_FLOOR = 0.2
+EMBEDDING_CEILING = 0.6
+
+TOKEN = re.compile(r"[a-z0-9]+")
+STOPWORDS = frozenset(
+    "a an and are as at be by for from in into is of on or that the their this to with using based via".split()
+)
+
+
+def tokenize(text: str) -> list[str]:
+    tokens = []
+    for token in TOKEN.findall((text or "").lower()):
+        if token in STOPWORDS:
+            continue
+        if len(token) > 3 and token.endswith("s") and not token.endswith("ss"):
+            token = token[:-1]
+        tokens.append(token)
+    return tokens
+
+
+def _bm25(documents: list[list[str]], weights: dict[str, float]) -> tuple[np.ndarray, np.ndarray]:
+    """Raw BM25 per document and the idf-weighted importance of each query term."""
+    terms = list(weights)
+    if not documents or not terms:
+        return np.zeros(len(documents)), np.zeros(len(terms))
+    column = {term: j for j, term in enumerate(terms)}
+    tf = np.zeros((len(documents), len(terms)), dtype=np.float32)
+    lengths = np.empty(len(documents), dtype=np.float32)
+    for i, tokens in enumerate(documents):
+        lengths[i] = len(tokens)
+        for token in tokens:
+            j = column.get(token)
+            if j is not None:
+                tf[i, j] += 1
+    df = np.count_nonzero(tf, axis=0)
+    idf = np.log1p((len(documents) - df + 0.5) / (df + 0.5))
+    norm = BM25_K1 * (1 - BM25_B + BM25_B * lengths / max(float(lengths.mean()), 1.0))
+    saturated = tf * (BM25_K1 + 1) / (tf + norm[:, None])
+    term_weights = idf * np.array([weights[t] for t in terms], dtype=np.float32)
+    return saturated @ term_weights, term_weights
+
+
+def bm25_scores(documents: list[list[str]], weights: dict[str, float]) -> np.ndarray:
+    """Score every document against weighted query terms in one vectorized pass."""
+    return _bm25(documents, weights)[0]
+
+
+def relevance_scores(documents: list[list[str]], weights: dict[str, float]) -> tuple[np.ndarray, np.ndarray]:
+    """Raw BM25 and the same scores on an absolute 0-1 scale (see REFERENCE_SATURATION)."""
+    raw, term_weights = _bm25(documents, weights)
+    ceiling = REFERENCE_SATURATION * float(term_weights.sum())
+    return raw, np.clip(raw / ceiling, 0.0, 1.0) if ceiling > 0 else np.zeros(len(documents))
+
+
+def calibrate_cosine(similarity: np.ndarray) -> np.ndarray:
+    """Map embedding cosine similarity onto the 0-1 scale used for BM25."""
+    return np.clip((similarity - EMBEDDING_FLOOR) / (EMBEDDING_CEILING - EMBEDDING_FLOOR), 0.0, 1.0)
+
+
+class RelevanceRanker(Component):
+    display_name = "Relevance Ranker"
+    description = (
+        "Score candidate papers against the query and keywords with BM25 (plus optional embeddings) and keep "
+        "only the best ones above the minimum relevance score, before any LLM analysis."
+    )
+    icon = "arrow-down-wide-narrow"
+
+    inputs = [
+        DataInput(
+            name="papers",
+            display_name="Papers",
+            info="Candidate papers, usually from the Paper Deduplicator.",
+            is_list=True,
+            required=True,
+        ),
+        MultilineInput(
+            name="search_request",
+            display_name="Search Request",
+            info="The same request JSON given to Literature Search (query, keywords, max_papers), or a plain query.",
+            required=True,
+        ),
+        FloatInput(
+            name="min_relevance_score",
+            display_name="Min Relevance Score",
+            info="Papers scoring below this (0-1) are dropped.",
+            value=DEFAULT_MIN_SCORE,
+        ),
+        IntInput(
+            name="max_papers",
+            display_name="Max Papers",
+            info="Papers kept after ranking. 'max_papers' in the request takes precedence.",
+            value=DEFAULT_MAX_PAPERS,
+        ),
+        HandleInput(
+            name="embedding_model",
+            display_name="Embedding Model",
+            info="Optional. Blends semantic similarity into the score; a small local model is enough.",
+            input_types=["Embeddings"],
+            required=False,
+        ),
+        FloatInput(
+            name="embedding_weight",
+            display_name="Embedding Weight",
+            info="Share of the score from embedding similarity when an embedding model is connected.",
+            value=0.5,
+            advanced=True,
+        ),
+    ]
+
+    outputs = [
+        Output(name="ranked_papers", display_name="Ranked Papers", method="rank_papers"),
+    ]
+
+    def parse_request(self) -> dict:
+        text = (self.search_request or "").strip()
+        try:
+            request = json.loads(text)
+        except json.JSONDecodeError:
+            request = {"query": text}
+        return request if isinstance(request, dict) else {"query": text}
+
+    @staticmethod
+    def query_weights(request: dict) -> dict[str, float]:
+        weights: dict[str, float] = {}
+        for token in tokenize(request.get("query", "")):
+            weights[token] = weights.get(token, 0.0) + 1.0
+        for keyword in request.get("keywords") or []:
+            for token in tokenize(keyword):
+                weights[token] = weights.get(token, 0.0) + KEYWORD_WEIGHT
+        return weights
+
+    async def _embedding_scores(self, request: dict, texts: list[str]) -> np.ndarray:
+        query = " ".join([request.get("query", ""), *(request.get("keywords") or [])])
+        query_vector = np.asarray(await self.embedding_model.aembed_query(query), dtype=np.float32)
+        doc_vectors = np.asarray(await self.embedding_model.aembed_documents(texts), dtype=np.float32)
+        doc_norms = np.linalg.norm(doc_vectors, axis=1) * max(float(np.linalg.norm(query_vector)), 1e-9)
+        return calibrate_cosine(doc_vectors @ query_vector / np.maximum(doc_norms, 1e-9))
+
+    async def rank_papers(self) -> list[Data]:
+        request = self.parse_request()
+        records = [dict(row.data if isinstance(row, Data) else row) for row in self.papers or []]
+        if not records:
+            self.status = "No candidate papers"
+            return []
+
+        documents = [
+            tokenize(r.get("title", "")) * TITLE_WEIGHT + tokenize(r.get("abstract", "")) for r in records
+        ]
+        raw, scores = relevance_scores(documents, self.query_weights(request))
+
+        if self.embedding_model:
+            weight = min(max(float(self.embedding_weight or 0.0), 0.0), 1.0)
+            texts = [f"{r.get('title', '')}\n\n{r.get('abstract', '')}" for r in records]
+            scores = (1 - weight) * scores + weight * await self._embedding_scores(request, texts)
+
+        threshold = float(self.min_relevance_score if self.min_relevance_score is not None else DEFAULT_MIN_SCORE)
+        limit = int(request.get("max_papers") or self.max_papers or DEFAULT_MAX_PAPERS)
+        order = np.argsort(-scores, kind="stable")
+        keep = [i for i in order if scores[i] >= threshold][:limit]
+
+        ranked = []
+        for i in keep:
+            record = {
+                **records[i],
+                "relevance_score": round(float(scores[i]), 3),
+                "bm25_score": round(float(raw[i]), 3),
+            }
+            text = record.pop("text", None) or f"{record.get('title', '')}\n\n{record.get('abstract', '')}".strip()
+            ranked.append(Data(text=text, **record))
+
+        below = int(np.count_nonzero(scores < threshold))
+        span = f" (scores {scores[keep[0]]:.2f}-{scores[keep[-1]]:.2f})" if keep else ""
+        self.status = f"{len(records)} candidates → {len(ranked)} papers{span}; {below} below {threshold}"
+        return ranked
@@ -0,0 +1,138 @@
+from langflow.custom import Component
+from langflow.io import DataInput, MessageTextInput, MultilineInput, StrInput, Output
+from langflow.schema import Data
+from langflow.schema.message import Message
+from datetime import datetime, timezone
+from pathlib import Path
+import json
+import os
+import tempfile
+
+# Lines written by the Paper Analyzer. Everything else in the stream belongs to this writer and is
+# replaced, not appended to, when the writer runs again on the same stream.
+ANALYZER_LINE_TYPES = {"review_started", "paper", "paper_failed"}
+
+
+class ReviewOutputWriter(Component):
+    display_name = "Review Output Writer"
+    description = (
+        "Finish a literature review's JSON Lines stream: write the theme, trend and gap tables and the final "
+        "synthesis after the per-paper lines written by the Paper Analyzer."
+    )
+    icon = "file-json"
+
+    inputs = [
+        StrInput(
+            name="stream_path",
+            display_name="Results Stream (NDJSON)",
+            info="The same file set as Results Stream on the Paper Analyzer.",
+            required=True,
+        ),
+        DataInput(
+            name="aggregates",
+            display_name="Aggregates",
+            info="Aggregates output of the Theme & Trend Aggregator.",
+            required=False,
+        ),
+        MessageTextInput(
+            name="synthesis",
+            display_name="Synthesis",
+            info="The final LLM summary / gap analysis text.",
+            required=False,
+        ),
+        MultilineInput(
+            name="search_request",
+            display_name="Search Request",
+            info="Optional request JSON, recorded as review metadata.",
+            required=False,
+        ),
+    ]
+
+    outputs = [
+        Output(name="stream_result", display_name="Stream Result", method="finish_stream"),
+        Output(name="document", display_name="Review Document", method="build_document"),
+    ]
+
+    def _path(self) -> Path:
+        path = Path(self.stream_path).expanduser()
+        if not path.exists():
+            raise ValueError(f"No review stream at {path}; set the same path on the Paper Analyzer.")
+        return path
+
+    def _sections(self) -> list[dict]:
+        lines = []
+        if self.search_request:
+            try:
+                request = json.loads(self.search_request)
+            except json.JSONDecodeError:
+                request = {"query": self.search_request}
+            lines.append({"type": "metadata", "metadata": request})
+        aggregates = self.aggregates.data if isinstance(self.aggregates, Data) else self.aggregates or {}
+        for key, value in aggregates.items():
+            lines.append({"type": key, key: value})
+        if self.synthesis:
+            lines.append({"type": "synthesis", "synthesis": self.synthesis})
+        return lines
+
+    def finish_stream(self) -> Message:
+        """Write the synthesis sections and a closing line after the analyzer's lines; runs once per build.
+
+        Sections from an earlier run of this writer are dropped first, so re-running the end of
+        the flow does not duplicate them. The file is rewritten line by line and swapped in
+        atomically.
+        """
+        path = self._path()
+        if not getattr(self, "_finished", False):
+            sections = self._sections()
+            finished = datetime.now(timezone.utc).isoformat(timespec="seconds")
+            fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+            try:
+                with path.open(encoding="utf-8") as source, os.fdopen(fd, "w", encoding="utf-8") as stream:
+                    for raw in source:
+                        if raw.strip() and json.loads(raw).get("type") in ANALYZER_LINE_TYPES:
+                            stream.write(raw if raw.endswith("\n") else raw + "\n")
+                    for line in sections:
+                        stream.write(json.dumps(line, default=str) + "\n")
+                    stream.write(json.dumps({"type": "review_completed", "time": finished}) + "\n")
+                os.replace(tmp, path)
+            except BaseException:
+                Path(tmp).unlink(missing_ok=True)
+                raise
+            self._finished = True
+            self._sections_written = len(sections)
+        self.status = f"Wrote {self._sections_written} sections to {path}"
+        return Message(text=f"Review results written to {path}")
+
+    def build_document(self) -> Data:
+        """Fold the stream into one JSON document shaped like artifacts/sample-output.json."""
+        self.finish_stream()
+        document: dict = {"metadata": {}, "summary": {}, "papers": []}
+        with self._path().open(encoding="utf-8") as stream:
+            for raw in stream:
+                if not raw.strip():
+                    continue
+                line = json.loads(raw)
+                kind = line.pop("type", None)
+                if kind == "paper":
+                    document["papers"].append(line["paper"])
+                elif kind == "paper_failed":
+                    document.setdefault("failed_papers", []).append(line)
+                elif kind == "review_started":
+                    document["metadata"]["started"] = line.get("time")
+                elif kind == "review_completed":
+                    document["metadata"]["analysis_date"] = line.get("time")
+                elif kind == "metadata":
+                    document["metadata"].update(line["metadata"])
+                elif kind:
+                    document[kind] = line.get(kind)
+
+        document["summary"]["total_papers"] = len(document["papers"])
+        document["summary"]["key_themes"] = [theme["name"] for theme in document.get("themes") or []]
+        methodology = document.get("methodology_analysis") or {}
+        if methodology:
+            document["summary"]["methodology_trends"] = {
+                "most_common": (methodology.get("most_common") or [None])[0],
+                "emerging": methodology.get("emerging_methods") or [],
+                "declining": methodology.get("declining_methods") or [],
+            }
+        return Data(data=document)
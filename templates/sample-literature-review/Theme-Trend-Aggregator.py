@@ -0,0 +1,258 @@
+from langflow.custom import Component
+from langflow.io import BoolInput, DataInput, IntInput, Output
+from langflow.schema import Data
+from langflow.schema.message import Message
+import json
+import re
+
+import numpy as np
+
+try:
+    from scipy import sparse
+except ImportError:  # dense NumPy is fine for a few hundred papers
+    sparse = None
+
+# Defaults from artifacts/config.yaml (analysis.themes / analysis.gaps).
+DEFAULT_MIN_OCCURRENCE = 3
+DEFAULT_MAX_THEMES = 10
+DEFAULT_MIN_PAPERS_FOR_GAP = 5
+
+# A pair of common themes is a gap candidate when they appear together less than
+# GAP_LIFT times as often as they would if they were independent.
+GAP_LIFT = 0.5
+MAX_GAP_CANDIDATES = 10
+# Share-per-year slope (fraction of papers per year) that marks a theme as emerging or declining.
+TREND_SLOPE = 0.05
+# Methods shown per year in the prompt context, most used first; the full table stays in the aggregates.
+MAX_PROMPT_METHODS = 10
+
+YEAR = re.compile(r"\s*(\d{4})")
+
+
+def incidence(rows: list[list[str]], vocabulary: list[str]):
+    """Paper × term 0/1 matrix, sparse when scipy is available."""
+    column = {term: j for j, term in enumerate(vocabulary)}
+    pairs = {(i, column[t]) for i, terms in enumerate(rows) for t in terms if t in column}
+    shape = (len(rows), len(vocabulary))
+    if sparse is not None:
+        i, j = zip(*pairs) if pairs else ((), ())
+        return sparse.csr_matrix((np.ones(len(pairs), dtype=np.int32), (i, j)), shape=shape)
+    dense = np.zeros(shape, dtype=np.int32)
+    for i, j in pairs:
+        dense[i, j] = 1
+    return dense
+
+
+def to_array(matrix) -> np.ndarray:
+    return matrix.toarray() if sparse is not None and sparse.issparse(matrix) else np.asarray(matrix)
+
+
+def paper_year(value) -> int:
+    """Publication year as an int, or 0 when missing or unreadable (e.g. "n.d.")."""
+    try:
+        return max(int(value or 0), 0)
+    except (TypeError, ValueError):
+        match = YEAR.match(str(value))
+        return int(match.group(1)) if match else 0
+
+
+def normalize_terms(values) -> list[str]:
+    if isinstance(values, str):
+        values = [values]
+    return sorted({" ".join(str(v).lower().split()) for v in values or [] if str(v).strip()})
+
+
+class ThemeTrendAggregator(Component):
+    display_name = "Theme & Trend Aggregator"
+    description = (
+        "Count themes, theme co-occurrence, per-year theme and method trends and gap candidates from per-paper "
+        "keywords, so the final LLM call works from small tables instead of every paper."
+    )
+    icon = "chart-network"
+
+    inputs = [
+        DataInput(
+            name="papers",
+            display_name="Analyzed Papers",
+            info="Papers with 'keywords', 'methods' and 'year', e.g. from the Paper Analyzer.",
+            is_list=True,
+            required=True,
+        ),
+        IntInput(
+            name="min_occurrence",
+            display_name="Min Theme Occurrence",
+            info="Keywords in fewer papers than this are not themes (themes.min_occurrence).",
+            value=DEFAULT_MIN_OCCURRENCE,
+        ),
+        IntInput(
+            name="max_themes",
+            display_name="Max Themes",
+            info="themes.max_themes",
+            value=DEFAULT_MAX_THEMES,
+        ),
+        BoolInput(
+            name="identify_gaps",
+            display_name="Identify Gaps",
+            info="gaps.enabled",
+            value=True,
+        ),
+        IntInput(
+            name="min_papers_for_gap",
+            display_name="Min Papers for Gap",
+            info="Both themes of a gap candidate must appear in at least this many papers (gaps.min_papers_for_gap).",
+            value=DEFAULT_MIN_PAPERS_FOR_GAP,
+            advanced=True,
+        ),
+        BoolInput(
+            name="track_trends",
+            display_name="Track Trends",
+            info="methodology.track_trends",
+            value=True,
+            advanced=True,
+        ),
+    ]
+
+    outputs = [
+        Output(name="aggregates", display_name="Aggregates", method="build_aggregates"),
+        Output(name="prompt_context", display_name="Prompt Context", method="build_prompt_context"),
+    ]
+
+    def _trends(self, years: np.ndarray, matrix: np.ndarray, names: list[str]) -> tuple[dict, list[str], list[str]]:
+        """Per-year counts plus names whose share of each year's papers is rising or falling."""
+        known = years > 0
+        span = np.unique(years[known])
+        if not len(span):
+            return {}, [], []
+        by_year = (years[known][:, None] == span[None, :]).astype(np.int32).T @ matrix[known]
+        table = {str(y): {n: int(c) for n, c in zip(names, row) if c} for y, row in zip(span, by_year)}
+        if len(span) < 2:
+            return table, [], []
+        papers_per_year = np.bincount(np.searchsorted(span, years[known]), minlength=len(span))
+        share = by_year / np.maximum(papers_per_year, 1)[:, None]
+        slopes = np.polyfit(span.astype(float), share, 1)[0]
+        emerging = [names[j] for j in np.argsort(-slopes) if slopes[j] >= TREND_SLOPE]
+        declining = [names[j] for j in np.argsort(slopes) if slopes[j] <= -TREND_SLOPE]
+        return table, emerging, declining
+
+    def aggregate(self) -> dict:
+        if hasattr(self, "_aggregates"):
+            return self._aggregates
+        records = [row.data if isinstance(row, Data) else dict(row) for row in self.papers or []]
+        ids = [str(r.get("paper_key") or r.get("id") or i) for i, r in enumerate(records)]
+        keywords = [normalize_terms(r.get("keywords")) for r in records]
+        methods = [normalize_terms(r.get("methods") or r.get("methodology")) for r in records]
+        years = np.array([paper_year(r.get("year")) for r in records], dtype=np.int64)
+
+        # Themes: keywords by document frequency, then the co-occurrence among the kept ones.
+        vocabulary = sorted({k for terms in keywords for k in terms})
+        X = incidence(keywords, vocabulary)
+        frequency = np.asarray(X.sum(axis=0)).ravel()
+        ranked = [j for j in np.argsort(-frequency, kind="stable") if frequency[j] >= int(self.min_occurrence or 1)]
+        top = ranked[: int(self.max_themes or DEFAULT_MAX_THEMES)]
+        theme_names = [vocabulary[j] for j in top]
+        T = to_array(X[:, top]) if top else np.zeros((len(records), 0), dtype=np.int32)
+        co = T.T @ T
+
+        themes = []
+        for a, name in enumerate(theme_names):
+            partners = [(theme_names[b], int(co[a, b])) for b in np.argsort(-co[a]) if b != a and co[a, b]]
+            themes.append(
+                {
+                    "name": name,
+                    "frequency": int(co[a, a]),
+                    "papers": [ids[i] for i in np.flatnonzero(T[:, a])],
+                    "co_occurs_with": dict(partners[:5]),
+                }
+            )
+
+        # Gap candidates: common themes that rarely appear together.
+        gaps = []
+        if self.identify_gaps and len(records):
+            counts = np.diag(co).astype(float)
+            expected = np.outer(counts, counts) / len(records)
+            lift = np.divide(co, expected, out=np.ones_like(expected), where=expected > 0)
+            common = counts >= int(self.min_papers_for_gap or 1)
+            candidates = np.argwhere(np.triu(common[:, None] & common[None, :] & (lift < GAP_LIFT), k=1))
+            for a, b in sorted(candidates.tolist(), key=lambda ab: lift[ab[0], ab[1]])[:MAX_GAP_CANDIDATES]:
+                gaps.append(
+                    {
+                        "themes": [theme_names[a], theme_names[b]],
+                        "papers_each": [int(counts[a]), int(counts[b])],
+                        "papers_together": int(co[a, b]),
+                        "expected_together": round(float(expected[a, b]), 1),
+                    }
+                )
+
+        method_names = sorted({m for terms in methods for m in terms})
+        M = to_array(incidence(methods, method_names))
+        method_counts = M.sum(axis=0)
+        trends, emerging_methods, declining_methods = {}, [], []
+        theme_trends = {}
+        if self.track_trends:
+            trends, emerging_methods, declining_methods = self._trends(years, M, method_names)
+            theme_trends, emerging_themes, declining_themes = self._trends(years, T, theme_names)
+            for theme in themes:
+                theme["trend"] = (
+                    "emerging" if theme["name"] in emerging_themes
+                    else "declining" if theme["name"] in declining_themes
+                    else "stable"
+                )
+
+        databases: dict[str, int] = {}
+        for record in records:
+            databases[record.get("database", "unknown")] = databases.get(record.get("database", "unknown"), 0) + 1
+        publication = np.unique(years[years > 0], return_counts=True)
+
+        self._aggregates = {
+            "themes": themes,
+            "theme_trends": theme_trends,
+            "gap_candidates": gaps,
+            "methodology_analysis": {
+                "trends": trends,
+                "most_common": [method_names[j] for j in np.argsort(-method_counts)[:5] if method_counts[j]],
+                "emerging_methods": emerging_methods,
+                "declining_methods": declining_methods,
+            },
+            "statistics": {
+                "total_papers": len(records),
+                "publication_trends": {str(y): int(n) for y, n in zip(*publication)},
+                "database_distribution": databases,
+                "methodology_distribution": {n: int(c) for n, c in zip(method_names, method_counts) if c},
+            },
+        }
+        self.status = (
+            f"{len(records)} papers: {len(vocabulary)} keywords → {len(themes)} themes, "
+            f"{len(method_names)} methods, {len(gaps)} gap candidates"
+        )
+        return self._aggregates
+
+    def build_aggregates(self) -> Data:
+        return Data(data=self.aggregate())
+
+    def build_prompt_context(self) -> Message:
+        """Compact text of the tables for the gap-identification prompt; its size grows with themes, not papers."""
+        aggregates = self.aggregate()
+        lines = [f"Papers: {aggregates['statistics']['total_papers']}"]
+        lines.append("Themes (papers, trend, most co-occurring):")
+        for theme in aggregates["themes"]:
+            partners = ", ".join(f"{name} {count}" for name, count in theme["co_occurs_with"].items())
+            trend = theme.get("trend", "n/a")
+            lines.append(f"- {theme['name']}: {theme['frequency']}, {trend}; with {partners or '-'}")
+        if aggregates["gap_candidates"]:
+            lines.append("Common theme pairs rarely studied together (together/expected):")
+            for gap in aggregates["gap_candidates"]:
+                lines.append(f"- {' + '.join(gap['themes'])}: {gap['papers_together']}/{gap['expected_together']}")
+        methodology = aggregates["methodology_analysis"]
+        if methodology["trends"]:
+            usage = aggregates["statistics"]["methodology_distribution"]
+            shown = set(sorted(usage, key=lambda name: (-usage[name], name))[:MAX_PROMPT_METHODS])
+            by_year = {
+                year: {name: count for name, count in counts.items() if name in shown}
+                for year, counts in methodology["trends"].items()
+            }
+            label = f"top {len(shown)} of {len(usage)}" if len(usage) > len(shown) else "all"
+            lines.append(f"Methods per year ({label}): " + json.dumps(by_year, separators=(",", ":")))
+            lines.append(f"Emerging methods: {', '.join(methodology['emerging_methods']) or '-'}")
+            lines.append(f"Declining methods: {', '.join(methodology['declining_methods']) or '-'}")
+        lines.append("Papers per year: " + json.dumps(aggregates["statistics"]["publication_trends"]))
+        return Message(text="\n".join(lines))
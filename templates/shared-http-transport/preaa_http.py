@@ -0,0 +1,348 @@
+"""Shared HTTP transport for PREAA template components.
+
+Components create their httpx clients through ``client()`` / ``async_client()`` instead of
+calling ``httpx.Client()`` directly. Every client made here sends through the same
+per-host connection pools, so a component that builds a new client per run still reuses
+warm connections, and gets:
+
+- default connect/read timeouts,
+- retries for throttled (429) and unavailable (502/503/504) responses, honoring Retry-After,
+- optional per-host rate limits shared by every component in the process,
+- one instrumentation record per request, delivered to ``add_observer`` callbacks,
+- ``use_transport`` to swap the network for a mock handler in tests and benchmarks.
+
+Install it next to LangFlow (see README.md); components fall back to plain httpx when it
+cannot be imported.
+"""
+
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from email.utils import parsedate_to_datetime
+from datetime import datetime, timezone
+import asyncio
+import logging
+import random
+import threading
+import time
+import weakref
+
+import httpx
+
+logger = logging.getLogger("preaa_http")
+
+DEFAULT_TIMEOUT = httpx.Timeout(30.0, connect=5.0)
+DEFAULT_LIMITS = httpx.Limits(max_connections=20, max_keepalive_connections=10, keepalive_expiry=30.0)
+DEFAULT_RETRIES = 2
+BACKOFF_SECONDS = 0.5
+MAX_RETRY_WAIT_SECONDS = 60.0
+
+RETRY_STATUS_CODES = {429, 502, 503, 504}
+# Only these are re-sent after a 5xx or a dropped connection; a POST is retried only when it
+# cannot have reached the server (connect failure) or the server refused it outright (429).
+IDEMPOTENT_METHODS = {"GET", "HEAD", "OPTIONS", "PUT", "DELETE"}
+
+_STARTED = "preaa_http.started"
+# Response extension holding how many attempts the request took.
+ATTEMPTS_EXTENSION = "preaa_http.attempts"
+
+
+@dataclass
+class HostConfig:
+    limits: httpx.Limits = field(default_factory=lambda: DEFAULT_LIMITS)
+    rate_per_second: float | None = None
+    burst: float = 1.0
+
+
+class RateLimiter:
+    """Token bucket usable from threads and coroutines alike; ``pause`` backs everyone off after a 429."""
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = max(capacity, 1.0)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def _take(self) -> float:
+        """Consume a token and return 0, or return how long to wait before trying again."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            if now >= self._paused_until and self._tokens >= 1:
+                self._tokens -= 1
+                return 0.0
+            return max(self._paused_until - now, (1 - self._tokens) / self.rate)
+
+    def acquire(self) -> None:
+        while (wait := self._take()) > 0:
+            time.sleep(wait)
+
+    async def acquire_async(self) -> None:
+        while (wait := self._take()) > 0:
+            await asyncio.sleep(wait)
+
+    def pause(self, seconds: float) -> None:
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+            self._tokens = 0
+
+
+# Process-wide state. LangFlow builds a fresh component per run, so pools must outlive it.
+_hosts: dict[str, HostConfig] = {}
+_limiters: dict[str, RateLimiter] = {}
+_pools: dict[str, httpx.HTTPTransport] = {}
+# Async pools belong to the event loop that opened their connections.
+_async_pools: dict[tuple[str, int], tuple[weakref.ref, httpx.AsyncHTTPTransport]] = {}
+_observers: list = []
+_injected: httpx.BaseTransport | httpx.AsyncBaseTransport | None = None
+_lock = threading.Lock()
+
+
+def configure_host(host: str, rate_per_second: float | None = None, burst: float = 1.0, limits=None) -> None:
+    """Set a shared rate limit and/or pool size for one host, e.g. ``configure_host("api.notion.com", 3)``.
+
+    Pool limits apply to pools created after the call, so configure hosts at import time.
+    """
+    with _lock:
+        _hosts[host] = HostConfig(limits or DEFAULT_LIMITS, rate_per_second, burst)
+        _limiters.pop(host, None)
+
+
+def _config(host: str) -> HostConfig:
+    return _hosts.get(host) or HostConfig()
+
+
+def _limiter(host: str) -> RateLimiter | None:
+    config = _config(host)
+    if not config.rate_per_second:
+        return None
+    with _lock:
+        limiter = _limiters.get(host)
+        if limiter is None:
+            limiter = _limiters[host] = RateLimiter(config.rate_per_second, config.burst)
+        return limiter
+
+
+def add_observer(callback) -> None:
+    """Call ``callback(record)`` after every request; see ``_record`` for the fields."""
+    with _lock:
+        _observers.append(callback)
+
+
+def remove_observer(callback) -> None:
+    with _lock:
+        if callback in _observers:
+            _observers.remove(callback)
+
+
+def _record(request: httpx.Request, status: int | None, attempts: int, error: str | None = None) -> None:
+    """Report one request. Only the path is recorded: query strings often carry API keys."""
+    started = request.extensions.get(_STARTED)
+    record = {
+        "method": request.method,
+        "host": request.url.host,
+        "path": request.url.path,
+        "status": status,
+        "elapsed_ms": round((time.perf_counter() - started) * 1000, 1) if started else None,
+        "attempts": attempts,
+        "error": error,
+    }
+    logger.debug("http %s", " ".join(f"{key}={value}" for key, value in record.items()))
+    for callback in list(_observers):
+        try:
+            callback(record)
+        except Exception:  # an observer must never break the request
+            logger.exception("HTTP observer failed")
+
+
+@contextmanager
+def use_transport(transport):
+    """Route every shared-transport request to ``transport`` (or an ``httpx.MockTransport`` handler).
+
+    Retries, rate limits and observers still run, so tests exercise the same code path as
+    production without touching the network::
+
+        with preaa_http.use_transport(lambda request: httpx.Response(200, json={"ok": True})):
+            component.send_message()
+    """
+    global _injected
+    if not isinstance(transport, (httpx.BaseTransport, httpx.AsyncBaseTransport)):
+        transport = httpx.MockTransport(transport)
+    with _lock:
+        previous, _injected = _injected, transport
+    try:
+        yield transport
+    finally:
+        with _lock:
+            _injected = previous
+
+
+def _origin(url: httpx.URL) -> str:
+    return f"{url.scheme}://{url.netloc.decode()}"
+
+
+def _pool(url: httpx.URL) -> httpx.BaseTransport:
+    if _injected is not None:
+        return _injected
+    key = _origin(url)
+    with _lock:
+        pool = _pools.get(key)
+        if pool is None:
+            pool = _pools[key] = httpx.HTTPTransport(limits=_config(url.host).limits)
+        return pool
+
+
+def _async_pool(url: httpx.URL) -> httpx.AsyncBaseTransport:
+    if _injected is not None:
+        return _injected
+    loop = asyncio.get_running_loop()
+    key = (_origin(url), id(loop))
+    with _lock:
+        entry = _async_pools.get(key)
+        if entry is None or entry[0]() is not loop:
+            # Forget pools of loops that have gone away; their connections cannot be reused.
+            for stale_key, (ref, _) in list(_async_pools.items()):
+                stale_loop = ref()
+                if stale_loop is None or stale_loop.is_closed():
+                    del _async_pools[stale_key]
+            entry = _async_pools[key] = (weakref.ref(loop), httpx.AsyncHTTPTransport(limits=_config(url.host).limits))
+        return entry[1]
+
+
+def _retry_wait(response: httpx.Response | None, attempt: int) -> float:
+    """Seconds to wait before the next attempt: Retry-After if given, else jittered exponential backoff."""
+    value = response.headers.get("Retry-After") if response is not None else None
+    if value:
+        try:
+            return min(max(float(value), 0.0), MAX_RETRY_WAIT_SECONDS)
+        except ValueError:
+            pass
+        try:
+            retry_at = parsedate_to_datetime(value)
+            if retry_at.tzinfo is None:
+                retry_at = retry_at.replace(tzinfo=timezone.utc)
+            return min(max((retry_at - datetime.now(timezone.utc)).total_seconds(), 0.0), MAX_RETRY_WAIT_SECONDS)
+        except (TypeError, ValueError):
+            pass
+    return min(BACKOFF_SECONDS * 2**attempt + random.uniform(0, BACKOFF_SECONDS), MAX_RETRY_WAIT_SECONDS)
+
+
+def _retryable_status(request: httpx.Request, status: int) -> bool:
+    return status == 429 or (status in RETRY_STATUS_CODES and request.method in IDEMPOTENT_METHODS)
+
+
+def _retryable_error(request: httpx.Request, error: httpx.TransportError) -> bool:
+    return isinstance(error, (httpx.ConnectError, httpx.ConnectTimeout)) or request.method in IDEMPOTENT_METHODS
+
+
+class PooledTransport(httpx.BaseTransport):
+    """Sends through the shared per-host pool with rate limiting and retries. Closing it is a no-op."""
+
+    def __init__(self, retries: int = DEFAULT_RETRIES):
+        self.retries = retries
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        limiter = _limiter(request.url.host)
+        attempt = 0
+        while True:
+            if limiter:
+                limiter.acquire()
+            try:
+                response = _pool(request.url).handle_request(request)
+            except httpx.TransportError as e:
+                if attempt >= self.retries or not _retryable_error(request, e):
+                    _record(request, None, attempt + 1, type(e).__name__)
+                    raise
+                time.sleep(_retry_wait(None, attempt))
+                attempt += 1
+                continue
+            if attempt >= self.retries or not _retryable_status(request, response.status_code):
+                response.extensions[ATTEMPTS_EXTENSION] = attempt + 1
+                return response
+            wait = _retry_wait(response, attempt)
+            if limiter and response.status_code == 429:
+                limiter.pause(wait)
+            response.close()
+            time.sleep(wait)
+            attempt += 1
+
+
+class AsyncPooledTransport(httpx.AsyncBaseTransport):
+    """Async counterpart of ``PooledTransport``; pools are kept per event loop."""
+
+    def __init__(self, retries: int = DEFAULT_RETRIES):
+        self.retries = retries
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        limiter = _limiter(request.url.host)
+        attempt = 0
+        while True:
+            if limiter:
+                await limiter.acquire_async()
+            try:
+                response = await _async_pool(request.url).handle_async_request(request)
+            except httpx.TransportError as e:
+                if attempt >= self.retries or not _retryable_error(request, e):
+                    _record(request, None, attempt + 1, type(e).__name__)
+                    raise
+                await asyncio.sleep(_retry_wait(None, attempt))
+                attempt += 1
+                continue
+            if attempt >= self.retries or not _retryable_status(request, response.status_code):
+                response.extensions[ATTEMPTS_EXTENSION] = attempt + 1
+                return response
+            wait = _retry_wait(response, attempt)
+            if limiter and response.status_code == 429:
+                limiter.pause(wait)
+            await response.aclose()
+            await asyncio.sleep(wait)
+            attempt += 1
+
+
+def _stamp(request: httpx.Request) -> None:
+    request.extensions[_STARTED] = time.perf_counter()
+
+
+def _observe(response: httpx.Response) -> None:
+    _record(response.request, response.status_code, response.extensions.get(ATTEMPTS_EXTENSION, 1))
+
+
+async def _stamp_async(request: httpx.Request) -> None:
+    _stamp(request)
+
+
+async def _observe_async(response: httpx.Response) -> None:
+    _observe(response)
+
+
+def client(retries: int = DEFAULT_RETRIES, **options) -> httpx.Client:
+    """An ``httpx.Client`` on the shared pools. ``options`` are passed to httpx (base_url, headers, ...).
+
+    Pass ``retries=0`` when the caller already retries, so attempts do not multiply.
+    """
+    options.setdefault("timeout", DEFAULT_TIMEOUT)
+    hooks = options.pop("event_hooks", {})
+    return httpx.Client(
+        transport=PooledTransport(retries),
+        event_hooks={
+            "request": [_stamp, *hooks.get("request", [])],
+            "response": [_observe, *hooks.get("response", [])],
+        },
+        **options,
+    )
+
+
+def async_client(retries: int = DEFAULT_RETRIES, **options) -> httpx.AsyncClient:
+    """An ``httpx.AsyncClient`` on the shared pools of the running event loop."""
+    options.setdefault("timeout", DEFAULT_TIMEOUT)
+    hooks = options.pop("event_hooks", {})
+    return httpx.AsyncClient(
+        transport=AsyncPooledTransport(retries),
+        event_hooks={
+            "request": [_stamp_async, *hooks.get("request", [])],
+            "response": [_observe_async, *hooks.get("response", [])],
+        },
+        **options,
+    )
@@ -0,0 +1,271 @@
+"""LangFuse tracing for PREAA template components.
+
+A component wraps its entry point in ``span()``::
+
+    with preaa_tracing.span("perplexity.process_message", kind="generation", model=model) as span:
+        ...
+        if span:
+            span.set(retries=2, cache_hit=False)
+            span.set_usage(input_tokens=120, output_tokens=480)
+
+Each span becomes one LangFuse trace holding one span (or generation) with its timing,
+metadata, token usage and error state. The caller only takes two timestamps and puts a tuple
+on a queue; IDs, timestamps and JSON are built on a background thread that sends batches to
+the LangFuse ingestion API. Sampling is decided when the span starts (head sampling). An
+unsampled span, or any span when LangFuse is not configured, is a shared no-op object that
+is falsy, so callers can skip collecting metadata for it.
+
+Configuration comes from the standard LangFuse variables (LANGFUSE_PUBLIC_KEY,
+LANGFUSE_SECRET_KEY, LANGFUSE_HOST) plus PREAA_TRACE_SAMPLE_RATE, or from ``configure()``.
+"""
+
+from datetime import datetime, timezone
+import atexit
+import logging
+import os
+import queue
+import random
+import threading
+import time
+import uuid
+
+import httpx
+
+logger = logging.getLogger("preaa_tracing")
+
+DEFAULT_HOST = "https://cloud.langfuse.com"
+DEFAULT_SAMPLE_RATE = 1.0
+# Spans waiting to be sent. When LangFuse is down the queue fills and new spans are dropped;
+# callers never block on tracing.
+MAX_QUEUED_SPANS = 10_000
+MAX_BATCH_SPANS = 100
+FLUSH_INTERVAL_SECONDS = 2.0
+EXPORT_TIMEOUT = httpx.Timeout(10.0, connect=3.0)
+
+
+class _NoSpan:
+    """Returned for unsampled calls and when tracing is off; every method does nothing."""
+
+    __slots__ = ()
+
+    def __bool__(self) -> bool:
+        return False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc) -> bool:
+        return False
+
+    def set(self, **metadata) -> None:
+        pass
+
+    def set_usage(self, input_tokens: int | None = None, output_tokens: int | None = None) -> None:
+        pass
+
+
+NO_SPAN = _NoSpan()
+
+
+class Span:
+    __slots__ = ("name", "kind", "model", "metadata", "usage", "_start", "_started")
+
+    def __init__(self, name: str, kind: str, model: str | None, metadata: dict):
+        self.name = name
+        self.kind = kind
+        self.model = model
+        self.metadata = metadata
+        self.usage = None
+
+    def __bool__(self) -> bool:
+        return True
+
+    def __enter__(self):
+        self._start = time.time()
+        self._started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        duration = time.perf_counter() - self._started
+        error = f"{exc_type.__name__}: {exc}" if exc_type else None
+        _enqueue((self.name, self.kind, self.model, self.metadata, self.usage, self._start, duration, error))
+        return False
+
+    def set(self, **metadata) -> None:
+        self.metadata.update(metadata)
+
+    def set_usage(self, input_tokens: int | None = None, output_tokens: int | None = None) -> None:
+        self.usage = (input_tokens, output_tokens)
+
+
+class _Config:
+    public_key: str | None = os.environ.get("LANGFUSE_PUBLIC_KEY")
+    secret_key: str | None = os.environ.get("LANGFUSE_SECRET_KEY")
+    host: str = os.environ.get("LANGFUSE_HOST") or DEFAULT_HOST
+    sample_rate: float = float(os.environ.get("PREAA_TRACE_SAMPLE_RATE") or DEFAULT_SAMPLE_RATE)
+    release: str | None = os.environ.get("LANGFUSE_RELEASE")
+
+
+_queue: queue.Queue = queue.Queue(maxsize=MAX_QUEUED_SPANS)
+_stats = {"sampled": 0, "sent": 0, "dropped": 0, "failed": 0}
+_stats_lock = threading.Lock()  # spans finish on many threads; += on a dict entry is not atomic
+_exporter: threading.Thread | None = None
+_lock = threading.Lock()
+
+
+def configure(
+    public_key: str | None = None,
+    secret_key: str | None = None,
+    host: str | None = None,
+    sample_rate: float | None = None,
+) -> None:
+    """Override the environment configuration; arguments left as None keep their current value."""
+    if public_key is not None:
+        _Config.public_key = public_key
+    if secret_key is not None:
+        _Config.secret_key = secret_key
+    if host is not None:
+        _Config.host = host
+    if sample_rate is not None:
+        _Config.sample_rate = min(max(float(sample_rate), 0.0), 1.0)
+
+
+def span(name: str, kind: str = "span", model: str | None = None, **metadata):
+    """Start a span; ``kind`` is "span" or "generation" (LLM calls, which carry model and usage)."""
+    if not (_Config.public_key and _Config.secret_key) or random.random() >= _Config.sample_rate:
+        return NO_SPAN
+    return Span(name, kind, model, metadata)
+
+
+def stats() -> dict:
+    """Counts of spans sampled, sent, dropped because the queue was full, and lost to failed exports."""
+    with _stats_lock:
+        return dict(_stats)
+
+
+def _count(key: str, n: int = 1) -> None:
+    with _stats_lock:
+        _stats[key] += n
+
+
+def _enqueue(item: tuple) -> None:
+    _count("sampled")
+    try:
+        _queue.put_nowait(item)
+    except queue.Full:
+        _count("dropped")
+        return
+    if _exporter is None:
+        _start_exporter()
+
+
+def _start_exporter() -> None:
+    global _exporter
+    with _lock:
+        if _exporter is None:
+            _exporter = threading.Thread(target=_export_loop, name="langfuse-exporter", daemon=True)
+            _exporter.start()
+
+
+def _iso(timestamp: float) -> str:
+    return datetime.fromtimestamp(timestamp, timezone.utc).isoformat(timespec="milliseconds").replace("+00:00", "Z")
+
+
+def _events(item: tuple) -> list[dict]:
+    """Build the trace-create and span/generation-create ingestion events for one span."""
+    name, kind, model, metadata, usage, start, duration, error = item
+    trace_id, observation_id = uuid.uuid4().hex, uuid.uuid4().hex
+    started, ended = _iso(start), _iso(start + duration)
+    observation = {
+        "id": observation_id,
+        "traceId": trace_id,
+        "name": name,
+        "startTime": started,
+        "endTime": ended,
+        "metadata": {**metadata, "duration_ms": round(duration * 1000, 3)},
+        "level": "ERROR" if error else "DEFAULT",
+    }
+    if error:
+        observation["statusMessage"] = error
+    if kind == "generation":
+        observation["model"] = model
+        if usage:
+            input_tokens, output_tokens = usage
+            observation["usage"] = {
+                "input": input_tokens,
+                "output": output_tokens,
+                "total": (input_tokens or 0) + (output_tokens or 0),
+                "unit": "TOKENS",
+            }
+    trace = {"id": trace_id, "name": name, "timestamp": started, "metadata": {"component": name.split(".")[0]}}
+    if _Config.release:
+        trace["release"] = _Config.release
+    return [
+        {"id": uuid.uuid4().hex, "type": "trace-create", "timestamp": started, "body": trace},
+        {"id": uuid.uuid4().hex, "type": f"{kind}-create", "timestamp": started, "body": observation},
+    ]
+
+
+def _send(client: httpx.Client, batch: list[tuple]) -> None:
+    try:
+        events = [event for item in batch for event in _events(item)]
+        response = client.post(
+            f"{_Config.host.rstrip('/')}/api/public/ingestion",
+            json={"batch": events},
+            auth=(_Config.public_key, _Config.secret_key),
+        )
+        response.raise_for_status()
+        _count("sent", len(batch))
+    except Exception as e:
+        # Traces are best effort: report and drop the batch rather than retrying into a backlog.
+        # Anything else (e.g. metadata that is not JSON serializable) must not kill the exporter
+        # thread, or every later span would sit in the queue until it fills.
+        _count("failed", len(batch))
+        if isinstance(e, httpx.HTTPStatusError):
+            reason = f"HTTP {e.response.status_code}"
+        elif isinstance(e, httpx.HTTPError):
+            reason = type(e).__name__
+        else:
+            reason = f"{type(e).__name__}: {e}"
+        logger.warning(f"LangFuse export of {len(batch)} spans failed: {reason}")
+
+
+def _export_loop() -> None:
+    with httpx.Client(timeout=EXPORT_TIMEOUT) as client:
+        while True:
+            try:
+                first = _queue.get(timeout=FLUSH_INTERVAL_SECONDS)
+            except queue.Empty:
+                continue
+            batch, flushed = [], []
+            for item in [first, *_drain(MAX_BATCH_SPANS - 1)]:
+                (flushed if isinstance(item, threading.Event) else batch).append(item)
+            if batch:
+                _send(client, batch)
+            for event in flushed:
+                event.set()
+
+
+def _drain(limit: int) -> list:
+    items = []
+    while len(items) < limit:
+        try:
+            items.append(_queue.get_nowait())
+        except queue.Empty:
+            break
+    return items
+
+
+def flush(timeout: float = 5.0) -> bool:
+    """Wait until spans queued so far have been sent; returns False on timeout."""
+    if _exporter is None:
+        return True
+    done = threading.Event()
+    try:
+        _queue.put(done, timeout=timeout)
+    except queue.Full:
+        return False
+    return done.wait(timeout)
+
+
+atexit.register(flush, 2.0)
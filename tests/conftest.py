@@ -0,0 +1,185 @@
+"""Load template components by path for unit tests.
+
+Components are single files that LangFlow loads from source, so they are imported here the same
+way. When LangFlow or Composio is not installed, minimal stand-ins for the names the components
+import are registered first; the tests only exercise module-level helpers and plain methods.
+"""
+
+import importlib.util
+import logging
+import sys
+import types
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+class _Options:
+    """Stand-in for LangFlow inputs and outputs: keeps the keyword arguments as attributes."""
+
+    def __init__(self, **kwargs):
+        self.__dict__.update(kwargs)
+
+
+class _Component:
+    def __init__(self, **kwargs):
+        self.__dict__.update(kwargs)
+        self.logs = []
+
+    def log(self, message, *args, **kwargs):
+        self.logs.append(message)
+
+
+class _Data:
+    def __init__(self, data=None, **kwargs):
+        self.data = data if data is not None else kwargs
+
+    def __getattr__(self, name):
+        try:
+            return self.__dict__["data"][name]
+        except KeyError:
+            raise AttributeError(name) from None
+
+
+class _Message:
+    def __init__(self, text="", **kwargs):
+        self.text = text
+        self.__dict__.update(kwargs)
+
+
+def _install_langflow_stand_ins() -> None:
+    modules = {
+        name: types.ModuleType(name)
+        for name in (
+            "langflow",
+            "langflow.custom",
+            "langflow.io",
+            "langflow.inputs",
+            "langflow.logging",
+            "langflow.schema",
+            "langflow.schema.message",
+            "langflow.base",
+            "langflow.base.models",
+            "langflow.base.models.model",
+            "langflow.base.composio",
+            "langflow.base.composio.composio_base",
+            "langflow.field_typing",
+            "langflow.field_typing.range_spec",
+        )
+    }
+    for name in ("langflow.io", "langflow.inputs"):
+        modules[name].__getattr__ = lambda attr: _Options
+    modules["langflow.custom"].Component = _Component
+    modules["langflow.logging"].logger = logging.getLogger("langflow")
+    modules["langflow.schema"].Data = _Data
+    modules["langflow.schema"].Message = _Message
+    modules["langflow.schema.message"].Message = _Message
+    modules["langflow.base.models.model"].LCModelComponent = _Component
+    modules["langflow.base.composio.composio_base"].ComposioBaseComponent = type(
+        "ComposioBaseComponent", (_Component,), {"_base_inputs": []}
+    )
+    modules["langflow.field_typing"].Text = str
+    modules["langflow.field_typing.range_spec"].RangeSpec = _Options
+    sys.modules.update(modules)
+
+
+def _install_composio_stand_in() -> None:
+    composio = types.ModuleType("composio")
+    composio.Action = type("Action", (), {"__getattr__": lambda self, name: name})()
+    sys.modules["composio"] = composio
+
+
+try:
+    import langflow  # noqa: F401
+except ImportError:
+    _install_langflow_stand_ins()
+
+try:
+    import composio  # noqa: F401
+except ImportError:
+    _install_composio_stand_in()
+
+
+def load_component(relative_path: str) -> types.ModuleType:
+    """Import a component file, e.g. ``templates/sample-literature-review/Relevance-Ranker.py``."""
+    path = ROOT / relative_path
+    name = "component_" + path.stem.replace("-", "_").lower()
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+@pytest.fixture(scope="session")
+def ranker():
+    return load_component("templates/sample-literature-review/Relevance-Ranker.py")
+
+
+@pytest.fixture(scope="session")
+def composio_connect():
+    return load_component("templates/composio-connect/composio-connect-component.py")
+
+
+@pytest.fixture(scope="session")
+def slack_sender():
+    return load_component("templates/notion-slack-sprint-summary/Slack-Sender.py")
+
+
+@pytest.fixture(scope="session")
+def notion_reader():
+    return load_component("templates/notion-slack-sprint-summary/Notion-Task-Reader.py")
+
+
+@pytest.fixture(scope="session")
+def summarizer():
+    return load_component("templates/notion-slack-sprint-summary/Task-Group-Summarizer.py")
+
+
+@pytest.fixture(scope="session")
+def serializer():
+    return load_component("templates/notion-slack-sprint-summary/Task-Table-Serializer.py")
+
+
+@pytest.fixture(scope="session")
+def literature_search():
+    return load_component("templates/sample-literature-review/Literature-Search.py")
+
+
+@pytest.fixture(scope="session")
+def deduplicator():
+    return load_component("templates/sample-literature-review/Paper-Deduplicator.py")
+
+
+@pytest.fixture(scope="session")
+def analyzer():
+    return load_component("templates/sample-literature-review/Paper-Analyzer.py")
+
+
+@pytest.fixture(scope="session")
+def pdf_extractor():
+    return load_component("templates/sample-literature-review/PDF-Text-Extractor.py")
+
+
+@pytest.fixture(scope="session")
+def aggregator():
+    return load_component("templates/sample-literature-review/Theme-Trend-Aggregator.py")
+
+
+@pytest.fixture
+def preaa_http():
+    """A fresh copy of the shared transport module, so pools and observers do not leak between tests."""
+    return load_component("templates/shared-http-transport/preaa_http.py")
+
+
+@pytest.fixture
+def preaa_tracing():
+    """A fresh copy of the tracing module, with its own queue, stats and exporter thread."""
+    return load_component("templates/shared-langfuse-tracing/preaa_tracing.py")
+
+
+@pytest.fixture(scope="session")
+def perplexity():
+    return load_component("templates/perplexity-academic-model/perplexity-model-langflow-component.py")
@@ -0,0 +1,65 @@
+import json
+
+import pytest
+
+
+def _result(status_code, message="failed", **data):
+    return {"successful": False, "data": {"status_code": status_code, "message": message, **data}}
+
+
+def test_throttling_is_a_retryable_rate_limit_error(composio_connect):
+    error = composio_connect.classify_action_error(_result(429, headers={"Retry-After": "7"}))
+    assert isinstance(error, composio_connect.ComposioRateLimitError)
+    assert error.retryable
+    assert error.retry_after == 7.0
+
+
+def test_graph_throttle_code_counts_as_rate_limit_on_any_status(composio_connect):
+    message = json.dumps({"error": {"code": "ApplicationThrottled", "message": "Slow down"}})
+    error = composio_connect.classify_action_error(_result(400, message))
+    assert isinstance(error, composio_connect.ComposioRateLimitError)
+    assert str(error) == "Slow down"
+    assert error.to_dict()["code"] == "ApplicationThrottled"
+
+
+@pytest.mark.parametrize(
+    ("status_code", "error_type", "retryable"),
+    [
+        (503, "ComposioTransientError", True),
+        (401, "ComposioAuthError", False),
+        (404, "ComposioActionError", False),
+        ("not a number", "ComposioActionError", False),
+    ],
+)
+def test_status_codes_map_to_error_types(composio_connect, status_code, error_type, retryable):
+    error = composio_connect.classify_action_error(_result(status_code))
+    assert type(error).__name__ == error_type
+    assert error.retryable is retryable
+    assert error.to_dict()["error_type"] == error_type
+
+
+def test_circuit_opens_after_consecutive_failures(composio_connect):
+    breaker = composio_connect._CircuitBreaker(failure_threshold=3, reset_timeout=60.0)
+    for _ in range(2):
+        breaker.before_call()
+        breaker.record_failure()
+    breaker.record_success()  # a success resets the count
+    for _ in range(3):
+        breaker.before_call()
+        breaker.record_failure()
+    with pytest.raises(composio_connect.ComposioCircuitOpenError) as raised:
+        breaker.before_call()
+    assert 0 < raised.value.retry_after <= 60.0
+
+
+def test_half_open_circuit_lets_one_probe_through(composio_connect):
+    breaker = composio_connect._CircuitBreaker(failure_threshold=1, reset_timeout=0.0)
+    breaker.record_failure()
+    breaker.before_call()  # the probe
+    with pytest.raises(composio_connect.ComposioCircuitOpenError):
+        breaker.before_call()  # others wait for the probe's outcome
+    breaker.record_failure()  # a failed probe re-opens the circuit
+    breaker.before_call()  # the next probe
+    breaker.record_success()
+    breaker.before_call()
+    breaker.before_call()
@@ -0,0 +1,108 @@
+import asyncio
+import json
+
+import httpx
+import pytest
+
+ARXIV_FEED = """<?xml version="1.0" encoding="UTF-8"?>
+<feed xmlns="http://www.w3.org/2005/Atom" xmlns:arxiv="http://arxiv.org/schemas/atom">
+  <entry>
+    <id>http://arxiv.org/abs/2401.00001v2</id>
+    <published>2024-01-02T00:00:00Z</published>
+    <title>Deep learning for
+      medical diagnosis</title>
+    <summary>We train deep models.</summary>
+    <author><name>Ana Lopez</name></author>
+    <link title="pdf" href="http://arxiv.org/pdf/2401.00001v2"/>
+  </entry>
+</feed>"""
+
+
+@pytest.fixture
+def http(literature_search, monkeypatch):
+    """Route the component's HTTP client to ``http.handler`` and record each request."""
+
+    class Fake:
+        requests = []
+        handler = None
+
+        def __call__(self, request):
+            self.requests.append(request)
+            return self.handler(request)
+
+    fake = Fake()
+    client = httpx.AsyncClient
+    monkeypatch.setattr(
+        literature_search.httpx, "AsyncClient", lambda **options: client(transport=httpx.MockTransport(fake), **options)
+    )
+    return fake
+
+
+def _search(literature_search, tmp_path, **inputs):
+    values = dict(
+        search_request=json.dumps({"query": 'deep learning "medical diagnosis"'}),
+        max_results_per_database=10,
+        pubmed_api_key="",
+        ieee_api_key="",
+        pubmed_rate_limit=100.0,
+        arxiv_rate_limit=100.0,
+        ieee_rate_limit=100.0,
+        databases=["pubmed", "arxiv"],
+        checkpoint_path=str(tmp_path / "checkpoints.sqlite3"),
+        checkpoint_max_age_hours=24,
+    )
+    values.update(inputs)
+    return literature_search.LiteratureSearchComponent(**values)
+
+
+def test_arxiv_query_requires_every_term_and_keeps_phrases(literature_search):
+    query = literature_search.arxiv_search_query('deep AND learning "medical diagnosis" (survey)')
+    assert query == 'all:deep AND all:learning AND all:"medical diagnosis" AND all:survey'
+
+
+def test_one_failing_database_does_not_stop_the_others(literature_search, http, tmp_path):
+    def handler(request):
+        if "arxiv" in request.url.host:
+            return httpx.Response(200, text=ARXIV_FEED)
+        return httpx.Response(400, text="bad request")
+
+    http.handler = handler
+    component = _search(literature_search, tmp_path)
+    papers = asyncio.run(component.search_papers())
+    assert [paper.data["id"] for paper in papers] == ["arxiv:2401.00001"]
+    assert papers[0].data["title"] == "Deep learning for medical diagnosis"
+    assert "pubmed failed (HTTP 400)" in component.status
+
+
+def test_all_databases_failing_raises(literature_search, http, tmp_path):
+    http.handler = lambda request: httpx.Response(400)
+    with pytest.raises(ValueError, match="All database searches failed"):
+        asyncio.run(_search(literature_search, tmp_path).search_papers())
+
+
+@pytest.mark.parametrize(
+    ("value", "seconds"),
+    [(None, 4.0), ("7", 7.0), ("-3", 0.0), ("Wed, 21 Oct 2015 07:28:00 GMT", 0.0), ("soon", 4.0)],
+)
+def test_retry_after_accepts_seconds_or_a_date_and_falls_back(literature_search, value, seconds):
+    assert literature_search.retry_after_seconds(value, 4.0) == seconds
+
+
+def test_throttled_request_with_a_date_retry_after_is_retried(literature_search, http, tmp_path):
+    responses = iter([httpx.Response(429, headers={"Retry-After": "Wed, 21 Oct 2015 07:28:00 GMT"})])
+    http.handler = lambda request: next(responses, None) or httpx.Response(200, text=ARXIV_FEED)
+    papers = asyncio.run(_search(literature_search, tmp_path, databases=["arxiv"]).search_papers())
+    assert len(papers) == 1
+    assert len(http.requests) == 2
+
+
+def test_finished_requests_are_resumed_from_checkpoints(literature_search, http, tmp_path):
+    http.handler = lambda request: httpx.Response(200, text=ARXIV_FEED)
+    asyncio.run(_search(literature_search, tmp_path, databases=["arxiv"]).search_papers())
+    assert len(http.requests) == 1
+
+    component = _search(literature_search, tmp_path, databases=["arxiv"])
+    papers = asyncio.run(component.search_papers())
+    assert len(http.requests) == 1
+    assert [paper.data["id"] for paper in papers] == ["arxiv:2401.00001"]
+    assert "1 checkpointed requests reused" in component.status
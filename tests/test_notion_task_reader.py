@@ -0,0 +1,84 @@
+import json
+
+import httpx
+
+
+def _page(number, edited):
+    return {
+        "id": f"page-{number}",
+        "url": f"https://notion.so/page-{number}",
+        "last_edited_time": edited,
+        "properties": {
+            "Name": {"type": "title", "title": [{"plain_text": f"Task {number}"}]},
+            "Status": {"type": "status", "status": {"name": "In Progress"}},
+        },
+    }
+
+
+PAGES = [
+    _page(1, "2025-10-01T10:00:00.000Z"),
+    _page(2, "2025-10-03T09:00:00.000Z"),
+    _page(3, "2025-10-02T08:00:00.000Z"),
+]
+
+
+class FakeNotion:
+    """Serves PAGES two per batch, following start_cursor, and records each query body."""
+
+    def __init__(self):
+        self.queries = []
+
+    def __call__(self, request):
+        body = json.loads(request.content)
+        self.queries.append(body)
+        start = int(body.get("start_cursor") or 0)
+        end = start + 2
+        has_more = end < len(PAGES)
+        return httpx.Response(
+            200,
+            json={"results": PAGES[start:end], "has_more": has_more, "next_cursor": str(end) if has_more else None},
+        )
+
+
+def _reader(notion_reader, fake, tmp_path, **inputs):
+    values = dict(
+        notion_secret="secret",
+        database_id="db",
+        query_json="",
+        properties=[],
+        incremental=True,
+        page_size=100,
+        max_pages=0,
+        watermark_path=str(tmp_path / "watermarks.sqlite3"),
+    )
+    values.update(inputs)
+    component = notion_reader.NotionTaskReader(**values)
+    component._client = lambda: httpx.Client(base_url="https://api.notion.com/v1/", transport=httpx.MockTransport(fake))
+    return component
+
+
+def test_reads_every_batch_and_flattens_properties(notion_reader, tmp_path):
+    fake = FakeNotion()
+    rows = _reader(notion_reader, fake, tmp_path).read_pages()
+    assert [row.data["id"] for row in rows] == ["page-1", "page-2", "page-3"]
+    assert rows[0].data["text"] == "Name: Task 1; Status: In Progress"
+    assert [query.get("start_cursor") for query in fake.queries] == [None, "2"]
+
+
+def test_watermark_moves_only_after_a_complete_read(notion_reader, tmp_path):
+    fake = FakeNotion()
+    _reader(notion_reader, fake, tmp_path, max_pages=2).read_pages()
+    _reader(notion_reader, fake, tmp_path).read_pages()
+    assert "filter" not in fake.queries[-1]  # the partial read left no watermark
+
+    _reader(notion_reader, fake, tmp_path).read_pages()
+    edited = {"timestamp": "last_edited_time", "last_edited_time": {"on_or_after": "2025-10-03T09:00:00.000Z"}}
+    assert fake.queries[-1]["filter"] == edited
+
+
+def test_since_filter_is_pushed_into_each_or_branch(notion_reader):
+    status = {"property": "Status", "status": {"equals": "Done"}}
+    nested = {"or": [{"property": "Priority", "select": {"equals": "High"}}]}
+    merged = notion_reader.NotionTaskReader._since_filter({"or": [status, nested]}, "2025-10-01")
+    assert [len(branch["and"]) for branch in merged["or"]] == [2, 2]
+    assert all("or" not in branch["and"][0] for branch in merged["or"])
@@ -0,0 +1,94 @@
+import asyncio
+import json
+import threading
+
+ANALYSIS = {"summary": "A CNN screens fundus images.", "methods": ["CNN"], "keywords": ["Retinopathy"]}
+
+PAPERS = [
+    {"id": "arxiv:1", "title": "Retinopathy screening", "year": 2023, "abstract": "We train a CNN."},
+    {"id": "pubmed:2", "title": "Surface codes", "abstract": "Quantum error correction."},
+]
+
+
+class FakeModel:
+    model_name = "fake-model"
+
+    def __init__(self):
+        self.prompts = []
+
+    async def ainvoke(self, prompt):
+        self.prompts.append(prompt)
+        return type("Response", (), {"content": json.dumps(ANALYSIS)})()
+
+
+def _analyzer(analyzer, llm, tmp_path, **inputs):
+    values = dict(
+        llm=llm,
+        embedding_model=None,
+        papers=[analyzer.Data(data=paper) for paper in PAPERS],
+        prompt=analyzer.DEFAULT_PROMPT,
+        prompt_version=analyzer.PROMPT_VERSION,
+        max_content_chars=24000,
+        max_concurrency=4,
+        cache_path=str(tmp_path / "analysis.sqlite3"),
+        stream_path="",
+        paper_index_path="",
+    )
+    values.update(inputs)
+    return analyzer.PaperAnalyzer(**values)
+
+
+def test_prompt_keeps_literal_json_braces(analyzer, tmp_path):
+    prompt = 'Paper: {title} ({year})\n{content}\nAnswer as {"summary": "...", "methods": [...]}'
+    llm = FakeModel()
+    asyncio.run(_analyzer(analyzer, llm, tmp_path, prompt=prompt, cache_path="").analyze_papers())
+    assert llm.prompts[0].startswith("Paper: Retinopathy screening (2023)\nRetinopathy screening\n\nWe train a CNN.")
+    assert llm.prompts[0].endswith('Answer as {"summary": "...", "methods": [...]}')
+    assert "(n.d.)" in llm.prompts[1]
+
+
+def test_cached_analyses_are_reused_and_streamed(analyzer, tmp_path):
+    asyncio.run(_analyzer(analyzer, FakeModel(), tmp_path).analyze_papers())
+
+    llm = FakeModel()
+    stream = tmp_path / "results.ndjson"
+    component = _analyzer(analyzer, llm, tmp_path, stream_path=str(stream))
+    papers = asyncio.run(component.analyze_papers())
+    assert llm.prompts == []
+    assert [paper.data["analysis_cached"] for paper in papers] == [True, True]
+    assert papers[0].data["keywords"] == ["retinopathy"]
+    assert "2 from cache" in component.status
+
+    lines = [json.loads(line) for line in stream.read_text().splitlines()]
+    assert [line["type"] for line in lines] == ["review_started", "paper", "paper"]
+    assert all("content_hash" not in line["paper"] for line in lines[1:])
+
+
+def test_cache_and_stream_io_run_off_the_event_loop(analyzer, tmp_path, monkeypatch):
+    threads = []
+    for name in ("get", "put"):
+        method = getattr(analyzer.AnalysisCache, name)
+
+        def record(self, *args, _method=method):
+            threads.append(threading.get_ident())
+            return _method(self, *args)
+
+        monkeypatch.setattr(analyzer.AnalysisCache, name, record)
+
+    class FailingModel(FakeModel):
+        async def ainvoke(self, prompt):
+            if "Surface codes" in prompt:
+                raise RuntimeError("model unavailable")
+            return await super().ainvoke(prompt)
+
+    async def run():
+        component = _analyzer(analyzer, FailingModel(), tmp_path, stream_path=str(tmp_path / "results.ndjson"))
+        return threading.get_ident(), await component.analyze_papers()
+
+    loop_thread, papers = asyncio.run(run())
+    assert len(papers) == 1
+    assert len(threads) == 3  # two lookups, one store
+    assert loop_thread not in threads
+
+    lines = [json.loads(line) for line in (tmp_path / "results.ndjson").read_text().splitlines()]
+    assert sorted(line["type"] for line in lines) == ["paper", "paper_failed", "review_started"]
@@ -0,0 +1,66 @@
+import random
+
+TITLE = "Attention-based deep learning models for early diagnosis of diabetic retinopathy in fundus images"
+NEAR_TITLE = "Attention-based deep learning models for the early diagnosis of diabetic retinopathy in fundus images"
+
+
+def _distance(a, b):
+    return bin(a ^ b).count("1")
+
+
+def test_small_title_edits_flip_few_simhash_bits(deduplicator):
+    title = deduplicator.simhash(deduplicator.normalize_title(TITLE))
+    near = deduplicator.simhash(deduplicator.normalize_title(NEAR_TITLE))
+    other = deduplicator.simhash(deduplicator.normalize_title("Quantum error correction with surface codes"))
+    assert _distance(title, near) <= deduplicator.DEFAULT_MAX_HAMMING
+    assert _distance(title, other) > deduplicator.MAX_HAMMING
+
+
+def test_hashes_within_the_band_limit_share_a_band(deduplicator):
+    rng = random.Random(7)
+    for _ in range(500):
+        value = rng.getrandbits(64)
+        flipped = value
+        for bit in rng.sample(range(64), deduplicator.MAX_HAMMING):
+            flipped ^= 1 << bit
+        assert set(deduplicator.bands(value)) & set(deduplicator.bands(flipped))
+
+
+def _papers(deduplicator):
+    return [
+        deduplicator.Data(
+            id="arxiv-1", title=TITLE, authors=["Ana Lopez"], arxiv_id="2401.00001v2", database="arxiv", abstract=""
+        ),
+        deduplicator.Data(
+            id="pubmed-1", title=NEAR_TITLE, authors=["Lopez, Ana"], pmid="123", database="pubmed", abstract="Long."
+        ),
+        deduplicator.Data(id="arxiv-2", title="Quantum error correction", authors=["Bo Chen"], database="arxiv"),
+    ]
+
+
+def test_near_duplicate_titles_by_the_same_author_are_merged(deduplicator):
+    component = deduplicator.PaperDeduplicator(
+        papers=_papers(deduplicator), max_title_distance=6, new_papers_only=False, index_path=""
+    )
+    papers = [row.data for row in component.deduplicate()]
+    assert len(papers) == 2
+    merged = next(paper for paper in papers if paper.get("pmid"))
+    assert merged["database"] == "pubmed"
+    assert merged["sources"] == ["arxiv-1", "pubmed-1"]
+
+
+def test_title_distance_above_the_band_limit_is_capped(deduplicator):
+    component = deduplicator.PaperDeduplicator(max_title_distance=64)
+    record = {"authors": ["Ana Lopez"]}
+    far = {"k": (0b1111_1111, {"authors": ["Ana Lopez"]})}  # 8 bits apart
+    assert component._near_match(record, 0, far) is None
+
+
+def test_index_remembers_papers_across_reviews(deduplicator, tmp_path):
+    index_path = str(tmp_path / "papers.sqlite3")
+    for run in range(2):
+        component = deduplicator.PaperDeduplicator(
+            papers=_papers(deduplicator), max_title_distance=6, new_papers_only=False, index_path=index_path
+        )
+        assert len(component.deduplicate()) == 2
+    assert "2 seen in earlier reviews" in component.status
@@ -0,0 +1,84 @@
+import asyncio
+import hashlib
+
+import httpx
+import pytest
+
+
+def _extractor(pdf_extractor, tmp_path, **inputs):
+    values = dict(
+        papers=[],
+        max_workers=2,
+        max_pages=40,
+        max_chars=200_000,
+        memory_limit_mb=0,
+        timeout_seconds=60,
+        cache_dir=str(tmp_path / "cache"),
+    )
+    values.update(inputs)
+    return pdf_extractor.PDFTextExtractor(**values)
+
+
+def _process(component, paper, tmp_path, handler=None):
+    pdf_dir, text_dir = tmp_path / "cache" / "pdf", tmp_path / "cache" / "text"
+    pdf_dir.mkdir(parents=True, exist_ok=True)
+    text_dir.mkdir(parents=True, exist_ok=True)
+    component._file_locks = {}
+
+    async def run():
+        transport = httpx.MockTransport(handler or (lambda request: httpx.Response(404)))
+        async with httpx.AsyncClient(transport=transport) as client:
+            semaphore = asyncio.Semaphore(1)
+            return await component._process(paper, client, pdf_dir, text_dir, semaphore, semaphore)
+
+    return asyncio.run(run()), pdf_dir, text_dir
+
+
+def test_papers_without_a_pdf_are_passed_through(pdf_extractor, tmp_path):
+    record, _, _ = _process(_extractor(pdf_extractor, tmp_path), {"id": "a"}, tmp_path)
+    assert record == {"id": "a", "full_text_status": "no_pdf"}
+
+
+def test_cached_text_is_keyed_on_the_extraction_limits(pdf_extractor, tmp_path):
+    pdf = tmp_path / "paper.pdf"
+    pdf.write_bytes(b"%PDF-1.4 not really")
+    file_hash = hashlib.sha256(pdf.read_bytes()).hexdigest()
+    component = _extractor(pdf_extractor, tmp_path, max_pages=2, max_chars=10)
+    text_dir = tmp_path / "cache" / "text"
+    text_dir.mkdir(parents=True)
+    component._text_file(text_dir, file_hash).write_text("page one\n\f\npage two\n\f\n", encoding="utf-8")
+
+    record, _, _ = _process(component, {"pdf_path": str(pdf)}, tmp_path)
+    assert record["full_text_status"] == "cached"
+    assert record["full_text"] == "page one\n\f"
+
+    # Other limits need their own extraction; this file is not a real PDF, so that fails.
+    record, _, _ = _process(_extractor(pdf_extractor, tmp_path, max_pages=0), {"pdf_path": str(pdf)}, tmp_path)
+    assert record["full_text_status"].startswith("failed:")
+
+
+def test_a_download_that_is_not_a_pdf_fails_and_leaves_nothing_behind(pdf_extractor, tmp_path):
+    def sign_in_page(request):
+        return httpx.Response(200, content=b"<html>Sign in</html>")
+
+    paper = {"pdf_url": "https://example.org/paper.pdf"}
+    record, pdf_dir, _ = _process(_extractor(pdf_extractor, tmp_path), paper, tmp_path, sign_in_page)
+    assert record["full_text_status"] == "failed: response is not a PDF"
+    assert list(pdf_dir.iterdir()) == []
+
+
+def test_pages_are_extracted_in_a_worker_process(pdf_extractor, tmp_path):
+    pypdf = pytest.importorskip("pypdf")
+    writer = pypdf.PdfWriter()
+    for _ in range(3):
+        writer.add_blank_page(width=200, height=200)
+    pdf = tmp_path / "blank.pdf"
+    with pdf.open("wb") as f:
+        writer.write(f)
+
+    component = _extractor(pdf_extractor, tmp_path, max_pages=2)
+    record, _, _ = _process(component, {"pdf_path": str(pdf)}, tmp_path)
+    assert record["full_text_status"] == "extracted"
+    assert record["full_text_pages"] == 2
+    record, _, _ = _process(component, {"pdf_path": str(pdf)}, tmp_path)
+    assert record["full_text_status"] == "cached"
@@ -0,0 +1,202 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import httpx
+import pytest
+
+ANSWER = {"id": "r1", "model": "sonar", "choices": [{"message": {"content": "Screening now uses CNNs [1]."}}]}
+
+
+def _payload(content, **settings):
+    return {"model": "sonar", "messages": [{"role": "user", "content": content}], **settings}
+
+
+def _component(perplexity, **inputs):
+    return perplexity.PerplexityComponent(**{"api_key": "key", "coalesce_requests": True, "budget_path": "", **inputs})
+
+
+def _wait_for(condition):
+    deadline = time.monotonic() + 5
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.01)
+
+
+def test_flight_key_ignores_key_order_and_whitespace_runs(perplexity):
+    first = perplexity.flight_key("key", _payload("hello   world", temperature=0.2, top_p=0.9))
+    second = perplexity.flight_key("key", {"top_p": 0.9, **_payload("hello world"), "temperature": 0.2})
+    assert first == second
+
+
+@pytest.mark.parametrize(
+    ("api_key", "payload"),
+    [
+        ("other-key", _payload("hello world")),
+        ("key", {**_payload("hello world"), "model": "sonar-pro"}),
+        ("key", _payload("hello there")),
+    ],
+)
+def test_flight_key_separates_different_requests(perplexity, api_key, payload):
+    assert perplexity.flight_key("key", _payload("hello world")) != perplexity.flight_key(api_key, payload)
+
+
+@pytest.mark.parametrize(
+    "inputs",
+    [
+        {"budget_name": "other-flow"},
+        {"flow_token_budget": 5000},
+        {"budget_action": "reject"},
+        {"budget_window_hours": 1},
+        {"max_prompt_tokens": 100},
+    ],
+)
+def test_flight_key_separates_calls_admitted_differently(perplexity, tmp_path, inputs):
+    budgets = {"budget_path": str(tmp_path / "budget.sqlite3"), "budget_name": "flow", "flow_token_budget": 1000}
+    payload = _payload("hello world")
+    same = _component(perplexity, **budgets)._admission()
+    assert perplexity.flight_key("key", payload, same) == perplexity.flight_key("key", payload, dict(same))
+    other = _component(perplexity, **{**budgets, **inputs})._admission()
+    assert perplexity.flight_key("key", payload, same) != perplexity.flight_key("key", payload, other)
+
+
+def _coalesce(perplexity, monkeypatch, response):
+    """Send one call, then an identical one while the first is in flight; return both outcomes."""
+    release = threading.Event()
+    requests = []
+
+    def handler(request):
+        requests.append(request)
+        release.wait(5)
+        return response
+
+    monkeypatch.setattr(perplexity, "_client", httpx.Client(transport=httpx.MockTransport(handler)))
+    coalesced = perplexity.coalescing_stats()["coalesced"]
+    leader, follower = _component(perplexity), _component(perplexity)
+    payload = _payload("What is new in retinopathy screening?")
+    with ThreadPoolExecutor(2) as pool:
+        first = pool.submit(leader._send, dict(payload))
+        _wait_for(lambda: requests)
+        second = pool.submit(follower._send, dict(payload))
+        _wait_for(lambda: perplexity.coalescing_stats()["coalesced"] == coalesced + 1)
+        release.set()
+    assert len(requests) == 1
+    return first, second, follower
+
+
+def test_concurrent_identical_calls_share_one_request(perplexity, monkeypatch):
+    first, second, follower = _coalesce(perplexity, monkeypatch, httpx.Response(200, json=ANSWER))
+    assert first.result() == second.result() == ANSWER
+    assert first.result() is not second.result()
+    assert follower._coalesced
+
+
+def test_a_failed_shared_request_fails_every_call(perplexity, monkeypatch):
+    first, second, _ = _coalesce(perplexity, monkeypatch, httpx.Response(500, text="upstream down"))
+    with pytest.raises(ValueError, match="upstream down"):
+        first.result()
+    with pytest.raises(ValueError, match="upstream down"):
+        second.result()
+
+
+@pytest.fixture
+def store(perplexity, tmp_path):
+    return perplexity.BudgetStore(str(tmp_path / "budget.sqlite3"))
+
+
+def test_reservation_is_replaced_by_actual_usage(perplexity, store):
+    budget = perplexity.Budget("flow:test", "flow 'test'", tokens=1000)
+    model, ids = store.reserve([budget], 600, [("sonar", 0.01)], 3600)
+    assert model == "sonar"
+    assert store.used("flow:test", 3600) == (600, 0.01)
+    store.settle(ids, 150, 0.002)
+    assert store.used("flow:test", 3600) == (150, 0.002)
+
+
+def test_exhausted_token_budget_rejects_the_call(perplexity, store):
+    budget = perplexity.Budget("flow:test", "flow 'test'", tokens=1000)
+    store.reserve([budget], 600, [("sonar", 0.01)], 3600)
+    with pytest.raises(ValueError, match="token budget for flow 'test' is exhausted"):
+        store.reserve([budget], 600, [("sonar", 0.01)], 3600)
+
+
+def test_short_cost_budget_falls_back_to_the_next_model(perplexity, store):
+    budgets = [perplexity.Budget("flow:test", "flow 'test'", cost=0.05), perplexity.Budget("key:abc", "this API key")]
+    model, ids = store.reserve(budgets, 100, [("sonar-pro", 0.08), ("sonar", 0.03)], 3600)
+    assert model == "sonar"
+    assert len(ids) == 2
+    with pytest.raises(ValueError, match="cost budget for flow 'test' is exhausted"):
+        store.reserve(budgets, 100, [("sonar-pro", 0.08), ("sonar", 0.03)], 3600)
+
+
+def test_released_reservation_frees_the_budget(perplexity, store):
+    budget = perplexity.Budget("flow:test", "flow 'test'", tokens=1000)
+    _, ids = store.reserve([budget], 900, [("sonar", 0.01)], 3600)
+    store.release(ids)
+    assert store.used("flow:test", 3600) == (0, 0)
+    store.reserve([budget], 900, [("sonar", 0.01)], 3600)
+
+
+def test_spend_older_than_the_retention_is_pruned(perplexity, store):
+    budget = perplexity.Budget("flow:test", "flow 'test'", tokens=1000)
+    with store._connect() as conn:
+        conn.execute(
+            "INSERT INTO spend (scope, created, tokens, cost) VALUES (?, ?, ?, ?)",
+            ("flow:test", time.time() - perplexity.BUDGET_RETENTION_SECONDS - 60, 900, 0.01),
+        )
+    store.reserve([budget], 100, [("sonar", 0.01)], perplexity.BUDGET_RETENTION_SECONDS)
+    with store._connect() as conn:
+        assert conn.execute("SELECT COUNT(*) FROM spend").fetchone() == (1,)
+
+
+def test_budget_windows_longer_than_the_retention_are_rejected(perplexity, tmp_path):
+    component = _component(
+        perplexity,
+        budget_path=str(tmp_path / "budget.sqlite3"),
+        budget_name="flow",
+        flow_token_budget=1000,
+        budget_window_hours=perplexity.MAX_BUDGET_WINDOW_HOURS + 1,
+    )
+    with pytest.raises(ValueError, match="longer than the 744 hours"):
+        component._admit(_payload("hello world"))
+
+
+@pytest.mark.parametrize(
+    ("raw", "url", "title"),
+    [
+        ("https://arxiv.org/abs/2401.00001", "https://arxiv.org/abs/2401.00001", None),
+        ({"url": "https://a.org", "title": "A paper"}, "https://a.org", "A paper"),
+        ({"link": "https://b.org", "snippet": "A snippet"}, "https://b.org", "A snippet"),
+        ({"title": ""}, "", None),
+        (42, "", "42"),
+    ],
+)
+def test_citation_from_api(perplexity, raw, url, title):
+    citation = perplexity.Citation.from_api(3, raw)
+    assert (citation.index, citation.url, citation.title) == (3, url, title)
+
+
+def test_citation_urls_are_interned(perplexity):
+    url = "".join(["https://arxiv.org/abs/", "2401.00001"])
+    first = perplexity.Citation.from_api(1, url)
+    second = perplexity.Citation.from_api(2, {"url": "".join(["https://arxiv.org/abs/", "2401.00001"])})
+    assert first.url is second.url
+
+
+def test_compact_metadata_keeps_only_what_chat_history_needs(perplexity):
+    component = _component(perplexity, model_name="sonar-pro")
+    component._model_used, component._downgraded_from = "sonar", "sonar-pro"
+    response = {
+        **ANSWER,
+        "usage": {"prompt_tokens": 12, "completion_tokens": 30, "total_tokens": 42, "cost": {"total_cost": 0.01}},
+        "images": [{"image_url": "https://img.org/1.png"}],
+        "related_questions": ["What about OCT?"],
+    }
+    citations = [perplexity.Citation.from_api(1, "https://a.org"), perplexity.Citation(2, "https://b.org", "B")]
+    assert component.compact_message_metadata(response, citations) == {
+        "model": "sonar",
+        "citations": ["https://a.org", "https://b.org"],
+        "usage": {"prompt_tokens": 12, "completion_tokens": 30, "total_tokens": 42},
+        "id": "r1",
+        "downgraded_from": "sonar-pro",
+    }
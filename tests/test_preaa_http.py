@@ -0,0 +1,83 @@
+import asyncio
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import httpx
+import pytest
+
+
+@pytest.fixture
+def server():
+    """A local keep-alive HTTP server that records the client port of each request."""
+    ports = []
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self):
+            ports.append(self.client_address[1])
+            self.send_response(200)
+            self.send_header("Content-Length", "2")
+            self.end_headers()
+            self.wfile.write(b"ok")
+
+        def log_message(self, *args):
+            pass
+
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}", ports
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def test_clients_share_one_pool_per_origin(preaa_http):
+    first = preaa_http._pool(httpx.URL("https://api.notion.com/v1/pages"))
+    assert preaa_http._pool(httpx.URL("https://api.notion.com/v1/databases")) is first
+    assert preaa_http._pool(httpx.URL("https://slack.com/api/chat.postMessage")) is not first
+    assert preaa_http._pool(httpx.URL("http://api.notion.com/v1/pages")) is not first
+
+
+def test_closing_a_client_keeps_its_connection_for_the_next_one(preaa_http, server):
+    url, ports = server
+    for _ in range(3):
+        with preaa_http.client(base_url=url) as client:
+            assert client.get("/").text == "ok"
+    assert len(ports) == 3
+    assert len(set(ports)) == 1
+
+
+def test_async_clients_reuse_connections_within_a_loop(preaa_http, server):
+    url, ports = server
+
+    async def run():
+        for _ in range(2):
+            async with preaa_http.async_client(base_url=url) as client:
+                assert (await client.get("/")).text == "ok"
+
+    asyncio.run(run())
+    assert len(set(ports)) == 1
+    # A new event loop cannot use the old loop's connections; its pool replaces the stale one.
+    asyncio.run(run())
+    assert len(set(ports)) == 2
+    assert len(preaa_http._async_pools) == 1
+
+
+def test_retries_and_observers_run_on_an_injected_transport(preaa_http):
+    preaa_http.BACKOFF_SECONDS = 0
+    statuses = iter([503, 503, 200])
+    records = []
+    preaa_http.add_observer(records.append)
+    with preaa_http.use_transport(lambda request: httpx.Response(next(statuses))):
+        with preaa_http.client() as client:
+            assert client.get("https://example.org/items?api_key=secret").status_code == 200
+        with preaa_http.client() as client:
+            # A POST may have reached the server, so a 503 is not re-sent.
+            statuses = iter([503, 200])
+            assert client.post("https://example.org/items").status_code == 503
+    assert [(record["method"], record["status"], record["attempts"]) for record in records] == [
+        ("GET", 200, 3),
+        ("POST", 503, 1),
+    ]
+    assert records[0]["path"] == "/items"
@@ -0,0 +1,66 @@
+import json
+
+import httpx
+import pytest
+
+
+@pytest.fixture
+def ingestion(preaa_tracing, monkeypatch):
+    """Send the exporter's batches to a mock LangFuse that fails with ``ingestion.status`` when set."""
+
+    class Fake:
+        batches = []
+        status = 207
+
+        def __call__(self, request):
+            self.batches.append(json.loads(request.content)["batch"])
+            return httpx.Response(self.status, json={})
+
+    fake = Fake()
+    client = httpx.Client
+    monkeypatch.setattr(
+        preaa_tracing.httpx, "Client", lambda **options: client(transport=httpx.MockTransport(fake), **options)
+    )
+    preaa_tracing.configure(public_key="pk", secret_key="sk", host="https://langfuse.test", sample_rate=1.0)
+    return fake
+
+
+def test_spans_are_exported_as_trace_and_generation_events(preaa_tracing, ingestion):
+    with preaa_tracing.span("perplexity.process_message", kind="generation", model="sonar") as span:
+        span.set(retries=1)
+        span.set_usage(input_tokens=10, output_tokens=5)
+    assert preaa_tracing.flush()
+
+    [batch] = ingestion.batches
+    assert [event["type"] for event in batch] == ["trace-create", "generation-create"]
+    generation = batch[1]["body"]
+    assert generation["traceId"] == batch[0]["body"]["id"]
+    assert generation["model"] == "sonar"
+    assert generation["usage"]["total"] == 15
+    assert generation["metadata"]["retries"] == 1
+
+
+def test_a_failed_batch_is_dropped_and_the_exporter_keeps_running(preaa_tracing, ingestion):
+    with preaa_tracing.span("slack.send", payload=object()):  # not JSON serializable
+        pass
+    assert preaa_tracing.flush()
+    ingestion.status = 503
+    with pytest.raises(RuntimeError), preaa_tracing.span("slack.send"):
+        raise RuntimeError("boom")
+    assert preaa_tracing.flush()
+    ingestion.status = 207
+    with preaa_tracing.span("slack.send"):
+        pass
+    assert preaa_tracing.flush()
+
+    assert preaa_tracing._exporter.is_alive()
+    assert preaa_tracing.stats() == {"sampled": 3, "sent": 1, "dropped": 0, "failed": 2}
+    assert len(ingestion.batches) == 2  # the unserializable batch never reached the server
+    assert ingestion.batches[0][1]["body"]["level"] == "ERROR"
+
+
+def test_unconfigured_tracing_returns_the_falsy_no_op_span(preaa_tracing):
+    preaa_tracing._Config.public_key = None
+    with preaa_tracing.span("notion.read") as span:
+        assert not span
+    assert preaa_tracing.stats()["sampled"] == 0
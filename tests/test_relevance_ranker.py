@@ -0,0 +1,61 @@
+import asyncio
+import json
+
+import numpy as np
+
+
+def _paper(ranker, paper_id, title, abstract):
+    return ranker.Data(id=paper_id, title=title, abstract=abstract)
+
+
+def _rank(ranker, papers, query, min_score=0.7, embedding_model=None):
+    component = ranker.RelevanceRanker(
+        papers=papers,
+        search_request=json.dumps({"query": query}),
+        min_relevance_score=min_score,
+        max_papers=50,
+        embedding_model=embedding_model,
+        embedding_weight=0.5,
+    )
+    return [row.data["id"] for row in asyncio.run(component.rank_papers())]
+
+
+WEAK = [
+    ("w1", "Graph theory for robot control", "Robots follow graphs. A deep model is mentioned in passing."),
+    ("w2", "Quantum error correction", "Surface codes and decoders; learning is not studied here."),
+    ("w3", "Hospital staffing policy", "Rosters, shifts and budgets for clinicians."),
+]
+STRONG = ("s1", "Deep learning for medical diagnosis", "We train deep learning models for medical image diagnosis.")
+
+
+def test_bm25_scores_prefer_documents_with_query_terms(ranker):
+    documents = [ranker.tokenize("deep learning diagnosis"), ranker.tokenize("graph theory")]
+    scores = ranker.bm25_scores(documents, {"deep": 1.0, "learning": 1.0, "diagnosis": 1.0})
+    assert scores[0] > 0
+    assert scores[1] == 0
+
+
+def test_threshold_is_absolute_when_every_candidate_is_weak(ranker):
+    # The best of a weak batch must not be lifted to 1.0 and pass the default 0.7 bar.
+    papers = [_paper(ranker, *paper) for paper in WEAK]
+    assert _rank(ranker, papers, "deep learning for medical diagnosis") == []
+
+
+def test_threshold_keeps_strong_papers(ranker):
+    papers = [_paper(ranker, *paper) for paper in [*WEAK, STRONG]]
+    assert _rank(ranker, papers, "deep learning for medical diagnosis") == ["s1"]
+
+
+def test_paper_with_every_query_term_in_its_title_scores_one(ranker):
+    documents = [
+        ranker.tokenize(title) * ranker.TITLE_WEIGHT + ranker.tokenize(abstract)
+        for _, title, abstract in [*WEAK, STRONG]
+    ]
+    _, scores = ranker.relevance_scores(documents, ranker.RelevanceRanker.query_weights({"query": "medical diagnosis"}))
+    assert scores[-1] == 1.0
+    assert scores[:-1].max() < 0.7
+
+
+def test_cosine_similarity_is_calibrated_before_blending(ranker):
+    similarity = np.array([ranker.EMBEDDING_FLOOR, ranker.EMBEDDING_CEILING, 0.95])
+    assert ranker.calibrate_cosine(similarity).tolist() == [0.0, 1.0, 1.0]
@@ -0,0 +1,151 @@
+import asyncio
+import json
+
+import httpx
+import pytest
+
+
+class FakeSlack:
+    """Answers auth.test and chat.postMessage, recording every post."""
+
+    def __init__(self):
+        self.posts = []
+
+    def __call__(self, request):
+        if request.url.path.endswith("auth.test"):
+            return httpx.Response(200, json={"ok": True, "user_id": "U1"})
+        payload = json.loads(request.content)
+        self.posts.append(payload)
+        return httpx.Response(200, json={"ok": True, "channel": payload["channel"], "ts": f"{len(self.posts)}.0"})
+
+
+@pytest.fixture
+def slack(slack_sender, request):
+    """A fake Slack API behind a token unique to the test, so pools and rate limits are not shared."""
+    fake = FakeSlack()
+    token = f"xoxp-{request.node.name}"
+    slack_sender._clients[token] = httpx.AsyncClient(
+        base_url=f"{slack_sender.SLACK_API_URL}/", transport=httpx.MockTransport(fake)
+    )
+    fake.token = token
+    return fake
+
+
+def _sender(slack_sender, token, tmp_path, **inputs):
+    """The component with every input at its default, plus the required ones."""
+    values = {option.name: getattr(option, "value", None) for option in slack_sender.SlackUserSender.inputs}
+    values.update(user_token=token, channel="C0123456789", message="Sprint summary", spool_path=str(tmp_path / "s.db"))
+    values.update(inputs)
+    return slack_sender.SlackUserSender(**values)
+
+
+def test_every_output_runs_with_default_inputs(slack_sender, slack, tmp_path):
+    component = _sender(slack_sender, slack.token, tmp_path)
+    results = [asyncio.run(getattr(component, output.method)()) for output in component.outputs]
+    assert all(result["ok"] for result in results)
+    assert [post["channel"] for post in slack.posts] == ["C0123456789"] * len(component.outputs)
+
+
+def test_fan_out_channels_replace_the_single_channel(slack_sender, slack, tmp_path):
+    component = _sender(slack_sender, slack.token, tmp_path, channels=["C0000000001", "C0000000002"])
+    result = asyncio.run(component.send_message())
+    assert result["ok"]
+    assert [row["channel"] for row in result["results"]] == ["C0000000001", "C0000000002"]
+    assert sorted(post["channel"] for post in slack.posts) == ["C0000000001", "C0000000002"]
+
+
+def test_token_bucket_allows_a_burst_then_waits(slack_sender):
+    bucket = slack_sender.TokenBucket(rate=1.0, capacity=2)
+    assert bucket._take() == 0
+    assert bucket._take() == 0
+    assert 0 < bucket._take() <= 1.0
+
+
+def test_token_bucket_pause_holds_every_waiter(slack_sender):
+    bucket = slack_sender.TokenBucket(rate=100.0, capacity=5)
+    bucket.pause(0.2)
+    assert bucket._take() > 0.1
+
+
+@pytest.mark.parametrize(("status", "retried"), [(429, True), (503, False)])
+def test_only_throttled_posts_are_retried(slack_sender, slack, tmp_path, status, retried):
+    calls = []
+
+    def flaky(request):
+        if request.url.path.endswith("chat.postMessage") and not calls:
+            calls.append(status)
+            return httpx.Response(status, headers={"Retry-After": "0"})
+        return slack(request)
+
+    slack_sender._clients[slack.token]._transport = httpx.MockTransport(flaky)
+    component = _sender(slack_sender, slack.token, tmp_path)
+    if retried:
+        assert asyncio.run(component.send_message())["ok"]
+        assert len(slack.posts) == 1
+    else:
+        with pytest.raises(ValueError, match="service_unavailable"):
+            asyncio.run(component.send_message())
+        assert slack.posts == []
+        assert slack_sender.get_spool(str(tmp_path / "s.db")).claim_next(component._token_key) is not None
+
+
+def test_revoked_token_is_not_spooled(slack_sender, slack, tmp_path):
+    def revoked(request):
+        return httpx.Response(200, json={"ok": False, "error": "token_revoked"})
+
+    component = _sender(slack_sender, slack.token, tmp_path)
+    asyncio.run(component.verify_token())  # cached while the token was still valid
+    slack_sender._clients[slack.token]._transport = httpx.MockTransport(revoked)
+    with pytest.raises(ValueError, match="token_revoked"):
+        asyncio.run(component.send_message())
+    assert slack_sender.get_spool(str(tmp_path / "s.db")).claim_next(component._token_key) is None
+
+
+def test_failed_connection_is_retried(slack_sender, slack, tmp_path, monkeypatch):
+    monkeypatch.setattr(slack_sender, "CONNECT_RETRY_SECONDS", 0.0)
+    failures = []
+
+    def unreachable_once(request):
+        if request.url.path.endswith("chat.postMessage") and not failures:
+            failures.append(request)
+            raise httpx.ConnectError("connection refused", request=request)
+        return slack(request)
+
+    slack_sender._clients[slack.token]._transport = httpx.MockTransport(unreachable_once)
+    assert asyncio.run(_sender(slack_sender, slack.token, tmp_path).send_message())["ok"]
+    assert len(slack.posts) == 1
+
+
+def test_code_block_lines_are_escaped(slack_sender):
+    blocks = slack_sender.markdown_to_blocks("```\nif a < b && c > d:\n```")
+    assert blocks[0]["text"]["text"] == "```\nif a &lt; b &amp;&amp; c &gt; d:\n```"
+
+
+def test_markdown_becomes_headers_dividers_and_mrkdwn_sections(slack_sender):
+    blocks = slack_sender.markdown_to_blocks(
+        "# Sprint **42**\n- **Done**: [PR](https://example.com/pr/1)\n---\nPlain & simple"
+    )
+    assert [block["type"] for block in blocks] == ["header", "section", "divider", "section"]
+    assert blocks[0]["text"]["text"] == "Sprint 42"
+    assert blocks[1]["text"]["text"] == "• *Done*: <https://example.com/pr/1|PR>"
+    assert blocks[3]["text"]["text"] == "Plain &amp; simple"
+
+
+def test_long_code_block_is_split_into_self_contained_sections(slack_sender):
+    code = "\n".join(f"line {i:04d} " + "x" * 60 for i in range(200))
+    blocks = slack_sender.markdown_to_blocks(f"```\n{code}\n```")
+    assert len(blocks) > 1
+    for block in blocks:
+        text = block["text"]["text"]
+        assert len(text) <= slack_sender.SECTION_CHAR_LIMIT
+        assert text.startswith("```") and text.endswith("```")
+    lines = [line for block in blocks for line in block["text"]["text"].splitlines() if line != "```"]
+    assert lines == code.splitlines()
+
+
+def test_long_output_is_threaded_under_the_first_message(slack_sender, slack, tmp_path):
+    text = "\n".join(f"- item {i} " + "y" * 100 for i in range(400))
+    result = asyncio.run(_sender(slack_sender, slack.token, tmp_path, message=text).send_message())
+    assert result["ok"] and result["replies"]
+    assert all(post["thread_ts"] == result["ts"] for post in slack.posts[1:])
+    assert all(len(post["text"]) <= slack_sender.TEXT_CHAR_LIMIT for post in slack.posts)
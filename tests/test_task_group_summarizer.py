@@ -0,0 +1,62 @@
+import asyncio
+
+
+class FakeModel:
+    model_name = "fake-model"
+
+    def __init__(self):
+        self.prompts = []
+
+    async def ainvoke(self, prompt):
+        self.prompts.append(prompt)
+        return type("Response", (), {"content": f"summary {len(self.prompts)}"})()
+
+
+def _summarizer(summarizer, llm, tasks, tmp_path, **inputs):
+    values = dict(
+        llm=llm,
+        tasks=[summarizer.Data(data=task) for task in tasks],
+        group_by="Assignee",
+        request="Sprint status",
+        max_concurrency=4,
+        max_tasks_per_group=40,
+        map_prompt=summarizer.DEFAULT_MAP_PROMPT,
+        reduce_prompt=summarizer.DEFAULT_REDUCE_PROMPT,
+        cache_path=str(tmp_path / "cache.sqlite3"),
+    )
+    values.update(inputs)
+    return summarizer.TaskGroupSummarizer(**values)
+
+
+TASKS = [
+    {"text": "Name: Schema; Assignee: Ana", "Assignee": "Ana"},
+    {"text": "Name: API; Assignee: Bo", "Assignee": "Bo"},
+    {"text": "Name: Docs", "Assignee": None},
+]
+
+
+def test_groups_are_summarized_then_reduced_and_cached(summarizer, tmp_path):
+    llm = FakeModel()
+    asyncio.run(_summarizer(summarizer, llm, TASKS, tmp_path).summarize())
+    assert len(llm.prompts) == 4  # three groups, one report
+    assert any("Unassigned" in prompt for prompt in llm.prompts)
+
+    again = FakeModel()
+    component = _summarizer(summarizer, again, TASKS, tmp_path)
+    report = asyncio.run(component.summarize())
+    assert again.prompts == []
+    assert report.text == "summary 4"
+    assert "4 cached" in component.status
+
+
+def test_many_groups_are_reduced_in_rounds(summarizer, tmp_path):
+    tasks = [{"text": f"Task {i}", "Assignee": f"person {i}"} for i in range(summarizer.REDUCE_FAN_IN + 1)]
+    llm = FakeModel()
+    asyncio.run(_summarizer(summarizer, llm, tasks, tmp_path, cache_path="").summarize())
+    # 13 group calls, two first-round reductions, then one final reduction.
+    assert len(llm.prompts) == len(tasks) + 3
+
+
+def test_fill_prompt_leaves_other_braces_alone(summarizer):
+    template = 'Group {group}: {tasks}\nReply as {"bullets": [...]}'
+    assert summarizer.fill_prompt(template, group="Ana", tasks="- x") == 'Group Ana: - x\nReply as {"bullets": [...]}'
@@ -0,0 +1,61 @@
+import pytest
+
+
+def _table(serializer, tasks, **inputs):
+    values = dict(
+        tasks=[serializer.Data(data=task) for task in tasks],
+        columns=[],
+        max_field_chars=80,
+        max_enum_values=12,
+        encoding_name=serializer.DEFAULT_ENCODING,
+    )
+    values.update(inputs)
+    component = serializer.TaskTableSerializer(**values)
+    return component, component.build_table().text
+
+
+TASKS = [
+    {
+        "id": "page-1",
+        "url": "https://notion.so/page-1",
+        "properties": {"Name": f"Task {i}", "Status": status, "Stage": stage},
+    }
+    for i, (status, stage) in enumerate(
+        [("In progress", "Implementation review"), ("Not started", "Requirements gathering")] * 6
+    )
+]
+
+
+def test_table_lists_columns_once_and_leaves_page_metadata_out(serializer):
+    _, table = _table(serializer, [{"id": "page-1", "url": "https://x", "Name": "Schema", "Owner": "Ana"}])
+    assert table.splitlines() == ["1 tasks", "Name | Owner", "Schema | Ana"]
+
+
+def test_codes_are_unique_across_columns(serializer):
+    _, table = _table(serializer, TASKS)
+    legend = table.splitlines()[1]
+    assert legend.startswith("Codes: ")
+    codes = [entry.split("=")[0] for part in legend[7:].split("; ") for entry in part.split(": ", 1)[1].split(", ")]
+    assert len(codes) == len(set(codes)) == 4
+    assert {code.rstrip("0123456789") for code in codes} == {"S", "ST"}
+
+
+def test_failed_encoding_load_is_reported_as_an_estimate(serializer, monkeypatch):
+    class BrokenTiktoken:
+        @staticmethod
+        def get_encoding(name):
+            raise ConnectionError("cannot download encoding")
+
+    monkeypatch.setattr(serializer, "tiktoken", BrokenTiktoken)
+    count, exact = serializer.make_token_counter("o200k_base")
+    assert not exact
+    assert count("abcdefgh") == 2
+    component, _ = _table(serializer, TASKS)
+    assert "(estimated)" in component.status
+
+
+@pytest.mark.parametrize(
+    ("column", "used", "prefix"), [("Status", set(), "S"), ("Stage", {"S"}, "ST"), ("42", set(), "V")]
+)
+def test_code_prefix_skips_prefixes_in_use(serializer, column, used, prefix):
+    assert serializer.code_prefix(column, used) == prefix
@@ -0,0 +1,53 @@
+import json
+
+import pytest
+
+
+@pytest.mark.parametrize(
+    ("value", "year"),
+    [(2021, 2021), ("2021", 2021), ("2021-05-01", 2021), ("n.d.", 0), (None, 0), ("", 0), (-5, 0)],
+)
+def test_paper_year(aggregator, value, year):
+    assert aggregator.paper_year(value) == year
+
+
+def _aggregator(aggregator, papers, **inputs):
+    values = dict(
+        papers=[aggregator.Data(data=paper) for paper in papers],
+        min_occurrence=3,
+        max_themes=10,
+        identify_gaps=True,
+        min_papers_for_gap=5,
+        track_trends=True,
+    )
+    values.update(inputs)
+    return aggregator.ThemeTrendAggregator(**values)
+
+
+def test_themes_trends_and_gaps(aggregator):
+    papers = []
+    for i in range(10):
+        keywords = ["Imaging", "CNN"] if i < 5 else ["imaging", "Survey"] + (["llm"] if i % 2 else [])
+        papers.append({"id": f"p{i}", "year": 2020 if i < 5 else 2024, "keywords": keywords, "database": "arxiv"})
+    result = _aggregator(aggregator, papers).aggregate()
+
+    themes = {theme["name"]: theme for theme in result["themes"]}
+    assert [theme["name"] for theme in result["themes"]] == ["imaging", "cnn", "survey", "llm"]
+    assert themes["imaging"]["co_occurs_with"] == {"cnn": 5, "survey": 5, "llm": 3}
+    assert [themes[name]["trend"] for name in ("imaging", "cnn", "survey", "llm")] == [
+        "stable", "declining", "emerging", "emerging"
+    ]
+    # llm appears in too few papers to be half of a gap.
+    assert [gap["themes"] for gap in result["gap_candidates"]] == [["cnn", "survey"]]
+    assert result["statistics"]["publication_trends"] == {"2020": 5, "2024": 5}
+
+
+def test_prompt_context_caps_methods_per_year(aggregator):
+    papers = [{"year": 2020 + i % 2, "keywords": [], "methods": ["CNN", f"method {i:02d}"]} for i in range(12)]
+    context = _aggregator(aggregator, papers).build_prompt_context().text
+
+    line = next(line for line in context.splitlines() if line.startswith("Methods per year"))
+    assert line.startswith(f"Methods per year (top {aggregator.MAX_PROMPT_METHODS} of 13): ")
+    by_year = json.loads(line.split(": ", 1)[1])
+    assert {name for counts in by_year.values() for name in counts} == {"cnn"} | {f"method {i:02d}" for i in range(9)}
+    assert by_year["2020"]["cnn"] == 6